@@ -0,0 +1,124 @@
+"""
+Adversarial ("Absurdle") answers: instead of fixing a secret word up front, the adversary answers
+each guess with the feedback pattern shared by the most words still possible, and keeps only those
+words. The game can only be won once a single word is left.
+
+The words still possible are an array of record indexes into the compiled dictionary, whose
+records are already one alphabet index per letter (Dictionary.encoded). Answering a guess is one
+vectorised scoring pass of the guess against them (feedback.compute_patterns) and a bincount over
+the pattern codes, which takes about a millisecond even for the full Norwegian list.
+
+To time it over random games:
+
+    python adversary.py [--length N] [--games N] [language ...]
+"""
+import argparse
+import random
+import sys
+import time
+
+import numpy as np
+
+from dictionary import load_dictionary
+from engine import COLS, ROWS, lang_files
+from feedback import compute_patterns
+
+
+def hint_ranks(length):
+    """
+    Ranks every pattern code by how much it gives away: the number of correct letters first, then
+    the number of misplaced ones.
+
+    Parameters:
+    - length: Word length.
+
+    Returns:
+    - int64 array with one rank per pattern code, all below 3 ** length.
+    """
+    digits = (np.arange(3 ** length)[:, None] // 3 ** np.arange(length)) % 3
+    return (digits == 2).sum(axis=1) * (length + 1) + (digits == 1).sum(axis=1)
+
+
+class Adversary:
+    """
+    Picks the feedback for each guess of a game so that as many words as possible stay possible.
+    """
+    __slots__ = ("dictionary", "encoded", "remaining", "ranks")
+
+    def __init__(self, dictionary):
+        """
+        Parameters:
+        - dictionary: The compiled Dictionary the game is played with.
+        """
+        self.dictionary = dictionary
+        self.encoded = dictionary.encoded()
+        self.remaining = None  # record indexes of the words still possible; None until the first guess
+        self.ranks = hint_ranks(dictionary.length)
+
+    def remaining_count(self):
+        """
+        Returns the number of words still possible.
+        """
+        return len(self.dictionary) if self.remaining is None else len(self.remaining)
+
+    def respond(self, guess):
+        """
+        Chooses the answer to a guess: of all the patterns the guess can get, the one shared by the
+        most remaining words, and among those the one revealing the fewest correct and then misplaced
+        letters. Only the words with that pattern remain.
+
+        Parameters:
+        - guess: A valid guess as an uppercase string.
+
+        Returns:
+        - One of the remaining words. Scoring the guess against it gives the chosen pattern.
+        """
+        answers = self.encoded if self.remaining is None else self.encoded[self.remaining]
+        record = np.frombuffer(self.dictionary.encode(guess), dtype=np.uint8)
+        codes = compute_patterns(record[None, :], answers)[0]
+
+        counts = np.bincount(codes, minlength=len(self.ranks))
+        # larger buckets win; ties go to the lower rank, which is always below len(ranks)
+        best = int(np.argmax(counts * len(self.ranks) - self.ranks))
+        chosen = np.flatnonzero(codes == best).astype(np.int32)
+        self.remaining = chosen if self.remaining is None else self.remaining[chosen]
+        return self.dictionary[int(self.remaining[0])]
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Time adversarial answers over random games")
+    parser.add_argument("languages", nargs="*", default=list(lang_files))
+    parser.add_argument("--length", type=int, default=COLS)
+    parser.add_argument("--games", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    for language in args.languages:
+        dictionary = load_dictionary(language, args.length)
+        if not len(dictionary):
+            print(f"{language}: no {args.length}-letter words")
+            continue
+
+        timings = []
+        won = 0
+        for _ in range(args.games):
+            adversary = Adversary(dictionary)
+            for _ in range(ROWS):
+                guess = dictionary[rng.randrange(len(dictionary))]
+                start = time.perf_counter()
+                answer = adversary.respond(guess)
+                timings.append(time.perf_counter() - start)
+                if answer == guess and adversary.remaining_count() == 1:
+                    won += 1
+                    break
+
+        timings.sort()
+        print(f"{language}: {len(dictionary)} words, {len(timings)} guesses, "
+              f"p50 {timings[len(timings) // 2] * 1000:.2f}ms, p99 {timings[int(len(timings) * 0.99)] * 1000:.2f}ms, "
+              f"max {timings[-1] * 1000:.2f}ms, {won} of {args.games} random games won")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,201 @@
+"""
+Tile animations: the staggered flip that reveals a scored row and the shake of a rejected word.
+
+Every running animation is drawn by one clock driven by after, one tick per FRAME_MS. A tick only
+sets the tiles' desired properties on the renderer, so however many tiles are moving, a frame
+costs one batched flush, and key presses are handled between ticks as usual. Which frame to draw
+is worked out from the time since an animation started rather than counted, so when a tick comes
+late (a slow machine, a long redraw) the frames in between are skipped and the animation still
+ends on time instead of falling behind.
+
+No colour is computed while animating: the flip's colour ramps are built once per theme by
+flip_colors and the frames only index into them.
+"""
+import math
+import time
+from collections import deque
+
+FRAME_MS = 16  # frame budget, about 60 frames per second
+FLIP_MS = 320  # one tile turning over
+FLIP_FRAMES = FLIP_MS // FRAME_MS
+FLIP_STAGGER_MS = 110  # a tile starts turning this long after its left neighbour
+SHAKE_MS = 320
+SHAKE_FRAMES = SHAKE_MS // FRAME_MS
+SHAKE_PX = 5  # widest swing of a shaken row
+INTERVAL_SAMPLES = 4096  # tick intervals kept for the frame time statistics
+
+# horizontal offset of a shaken row per frame: three swings that die down, ending at rest
+SHAKE_OFFSETS = tuple(round(SHAKE_PX * math.sin(6 * math.pi * i / (SHAKE_FRAMES - 1)) * (1 - i / (SHAKE_FRAMES - 1)))
+                      for i in range(SHAKE_FRAMES))
+
+
+def color_ramp(start, end, steps):
+    """
+    Interpolates between two colors.
+
+    Parameters:
+    - start, end: Colors as "#RRGGBB" strings.
+    - steps: Number of colors.
+
+    Returns:
+    - Tuple of steps colors leading from start (not included) to end (included).
+    """
+    a = [int(start[i:i + 2], 16) for i in (1, 3, 5)]
+    b = [int(end[i:i + 2], 16) for i in (1, 3, 5)]
+    return tuple("#" + "".join(f"{round(x + (y - x) * (i + 1) / steps):02X}" for x, y in zip(a, b))
+                 for i in range(steps))
+
+
+def flip_colors(front, edge, back, frames=FLIP_FRAMES):
+    """
+    Returns the fill color of every frame of a flip: the tile fades from its front color into the
+    board's, as if turned edge-on, and then into the color of its back.
+
+    Parameters:
+    - front: Color of the unscored tile.
+    - edge: Color of the board behind the tiles.
+    - back: Color of the scored tile.
+    - frames: Frames of the flip.
+    """
+    half = frames // 2
+    return color_ramp(front, edge, half) + color_ramp(edge, back, frames - half)
+
+
+class Animation:
+    """
+    One running animation.
+    """
+    __slots__ = ("draw", "frames", "start", "drawn", "on_done")
+
+    def __init__(self, draw, frames, start, on_done):
+        self.draw = draw
+        self.frames = frames
+        self.start = start
+        self.drawn = -1  # the last frame drawn
+        self.on_done = on_done
+
+
+class Animator:
+    """
+    Runs animations on a fixed frame clock. Animations are registered under any hashable key.
+    """
+
+    def __init__(self, root, frame_ms=FRAME_MS):
+        """
+        Parameters:
+        - root: The Tk root, used to schedule the ticks with after.
+        - frame_ms: Time between ticks.
+        """
+        self.root = root
+        self.frame_ms = frame_ms
+        self.running = {}
+        self.scheduled = None
+        self.last_tick = None
+        self.clock = time.perf_counter
+
+        # counters to verify that animations hold the frame rate
+        self.ticks = 0
+        self.frames = 0
+        self.skipped = 0
+        self.intervals = deque(maxlen=INTERVAL_SAMPLES)  # seconds between consecutive ticks
+        self.max_tick = 0.0  # longest time spent drawing one tick, in seconds
+
+    def start(self, key, frames, draw, delay_ms=0, on_done=None):
+        """
+        Starts an animation. One already running under the same key is finished first.
+
+        Parameters:
+        - key: Key to refer to the animation by.
+        - frames: Number of frames.
+        - draw: Called with the index of each frame to draw. Frames may be skipped, but the last one
+          is always drawn.
+        - delay_ms: Time before the first frame.
+        - on_done: Called after the last frame, or None.
+        """
+        self.finish(key)
+        self.running[key] = Animation(draw, frames, self.clock() + delay_ms / 1000, on_done)
+        if self.scheduled is None:
+            self.scheduled = self.root.after(self.frame_ms, self.tick)
+
+    def tick(self):
+        """
+        Draws the current frame of every running animation and schedules the next tick.
+        """
+        now = self.clock()
+        if self.last_tick is not None:
+            self.intervals.append(now - self.last_tick)
+        self.last_tick = now
+        self.ticks += 1
+
+        for key, animation in list(self.running.items()):
+            if now < animation.start:
+                continue
+            frame = min(int((now - animation.start) * 1000 / self.frame_ms), animation.frames - 1)
+            if frame == animation.drawn:
+                continue
+            self.skipped += frame - animation.drawn - 1
+            animation.drawn = frame
+            animation.draw(frame)
+            self.frames += 1
+            if frame == animation.frames - 1:
+                del self.running[key]
+                if animation.on_done is not None:
+                    animation.on_done()
+
+        elapsed = self.clock() - now
+        self.max_tick = max(self.max_tick, elapsed)
+        if self.running:
+            # keep to the frame budget: a tick that ran long shortens the wait for the next one
+            self.scheduled = self.root.after(max(1, round(self.frame_ms - elapsed * 1000)), self.tick)
+        else:
+            self.scheduled = None
+            self.last_tick = None
+
+    def finish(self, key=None):
+        """
+        Draws the last frame of an animation, or of every animation, at once.
+
+        Parameters:
+        - key: Key of the animation, or None for all of them.
+        """
+        keys = list(self.running) if key is None else [key] if key in self.running else []
+        for k in keys:
+            animation = self.running.pop(k)
+            if animation.drawn != animation.frames - 1:
+                animation.draw(animation.frames - 1)
+            if animation.on_done is not None:
+                animation.on_done()
+        self.stop_when_idle()
+
+    def cancel(self):
+        """
+        Stops every animation without drawing another frame, e.g. before its widgets are destroyed.
+        """
+        self.running.clear()
+        self.stop_when_idle()
+
+    def stop_when_idle(self):
+        if not self.running and self.scheduled is not None:
+            self.root.after_cancel(self.scheduled)
+            self.scheduled = None
+            self.last_tick = None
+
+    def stats(self):
+        """
+        Returns the frame counters and the time between ticks as a dictionary. Times are in seconds.
+        """
+        intervals = sorted(self.intervals)
+
+        def percentile(q):
+            return intervals[min(len(intervals) - 1, int(q * len(intervals)))] if intervals else 0.0
+
+        return {
+            "ticks": self.ticks,
+            "frames": self.frames,
+            "skipped_frames": self.skipped,
+            "fps": len(intervals) / sum(intervals) if intervals else 0.0,
+            "interval_p50": percentile(0.5),
+            "interval_p99": percentile(0.99),
+            "interval_max": intervals[-1] if intervals else 0.0,
+            "max_tick": self.max_tick,
+        }
@@ -0,0 +1,106 @@
+"""
+Frame times of the tile animations. Plays random valid guesses so that every row is flipped, typing
+the next guess while the last one is still turning over, and reports the animator's frame rate,
+the time between frames, the frames it skipped and how long the keys typed meanwhile took to be
+applied. --load-ms burns that much time on every frame, to see how a slower machine degrades.
+Needs a display.
+
+    python -m benchmarks.animation_frames [--guesses 30] [--load-ms 0] [--seed 0]
+
+Run from the repository root.
+"""
+import argparse
+import random
+import time
+
+from animation import FLIP_STAGGER_MS
+from dictionary import load_dictionary
+
+
+class KeyEvent:
+    def __init__(self, char, keysym):
+        self.char = char
+        self.keysym = keysym
+
+
+def percentile(values, q):
+    return sorted(values)[min(len(values) - 1, int(q * len(values)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the frame rate of the tile animations")
+    parser.add_argument("--guesses", type=int, default=30)
+    parser.add_argument("--load-ms", type=float, default=0.0, help="extra work per frame, in milliseconds")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    import main as wordle  # builds the game window
+
+    app = wordle.app
+    wordle.event_log = None
+    clock = time.perf_counter
+
+    def wait_for_game():
+        while wordle.game is None:
+            app.update()
+            time.sleep(0.005)
+
+    wait_for_game()
+    animator = wordle.animator
+    if args.load_ms:
+        tick = animator.tick
+
+        def loaded_tick():
+            end = clock() + args.load_ms / 1000
+            while clock() < end:
+                pass
+            tick()
+
+        animator.tick = loaded_tick
+
+    # time from each key press to the moment its letter is applied
+    pressed = []
+    latencies = []
+    type_letter = wordle.type_letter
+
+    def timed_type_letter(letter):
+        latencies.append(clock() - pressed.pop(0))
+        type_letter(letter)
+
+    wordle.type_letter = timed_type_letter
+
+    rng = random.Random(args.seed)
+    words = load_dictionary(wordle.game.language, wordle.game.cols).words()
+    for _ in range(args.guesses):
+        if wordle.game.game_over:
+            wordle.start_game()
+            wait_for_game()
+        # the keys of the guess are typed while the previous row is still turning over
+        for letter in rng.choice(words):
+            pressed.append(clock())
+            wordle.on_key(KeyEvent(letter.lower(), letter.lower()))
+        wordle.on_key(KeyEvent("\r", "Return"))
+        app.update()
+        # go on once the last tile of the row starts turning, or wait for the end of a finished game
+        until = clock() + (wordle.game.cols - 1) * FLIP_STAGGER_MS / 1000
+        while animator.running and (wordle.game.game_over or clock() < until):
+            app.update()
+            time.sleep(0.001)
+    while animator.running:
+        app.update()
+        time.sleep(0.001)
+
+    stats = animator.stats()
+    print(f"{args.guesses} guesses, {stats['frames']} tile frames in {stats['ticks']} ticks "
+          f"(+{args.load_ms:g}ms of other work per frame): {stats['fps']:.1f} fps")
+    print(f"  time between frames: p50 {stats['interval_p50'] * 1000:.1f}ms, p99 {stats['interval_p99'] * 1000:.1f}ms, "
+          f"max {stats['interval_max'] * 1000:.1f}ms; longest frame drawn in {stats['max_tick'] * 1000:.2f}ms")
+    print(f"  skipped frames: {stats['skipped_frames']}")
+    if latencies:
+        print(f"  keys typed while animating applied after p50 {percentile(latencies, 0.5) * 1000:.2f}ms, "
+              f"p99 {percentile(latencies, 0.99) * 1000:.2f}ms, max {max(latencies) * 1000:.2f}ms")
+    app.destroy()
+
+
+if __name__ == "__main__":
+    main()
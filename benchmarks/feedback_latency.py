@@ -0,0 +1,93 @@
+"""
+Latency from pressing Enter on a rejected guess to its message being drawn, with the in-window
+toasts the game uses and with a top-level window per message, built the way messages used to be
+(the grab and nested event loop that then blocked all input until the window was closed are left
+out, so the comparison only covers getting the message on screen). Needs a display.
+
+    python -m benchmarks.feedback_latency [--presses 200]
+
+Run from the repository root.
+"""
+import argparse
+import time
+
+import customtkinter as ctk
+
+
+class KeyEvent:
+    def __init__(self, char, keysym):
+        self.char = char
+        self.keysym = keysym
+
+
+def percentile(values, q):
+    return sorted(values)[min(len(values) - 1, int(q * len(values)))]
+
+
+def window_message(wordle, title, message):
+    """
+    Builds and draws a message window like the game's old show_message did, and returns it.
+    """
+    win = ctk.CTkToplevel()
+    win.title(title)
+    win.geometry("280x136")
+    win.resizable(False, False)
+    win.configure(fg_color=wordle.palette.app_bg)
+    ctk.CTkLabel(win, text=message, text_color=wordle.palette.text, font=wordle.font(15), justify="center",
+                 wraplength=230, height=54).pack(pady=(25, 7))
+    fg, hover = wordle.palette.message_buttons["warning"]
+    ctk.CTkButton(win, text=wordle.t("message_buttons")["warning"], width=75, height=30, text_color="#FFFFFF",
+                  fg_color=fg, hover_color=hover, border_color=hover, border_width=2, font=wordle.font(13),
+                  command=win.destroy).pack()
+    win.update_idletasks()
+    return win
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time rejected guesses from Enter to the message on screen")
+    parser.add_argument("--presses", type=int, default=200)
+    args = parser.parse_args()
+
+    import main as wordle  # builds the game window
+
+    app = wordle.app
+    wordle.event_log = None
+    while wordle.game is None:
+        app.update()
+        time.sleep(0.005)
+
+    clock = time.perf_counter
+    # alternate between the two most common mistakes, so every press shows a different message
+    rows = ["Q" * (wordle.game.cols - 1), "Q" * wordle.game.cols]
+    toast_times = []
+    for i in range(args.presses):
+        while wordle.game.current_col:
+            wordle.delete_letter()
+        for letter in rows[i % 2]:
+            wordle.type_letter(letter)
+        app.update()
+
+        start = clock()
+        wordle.on_key(KeyEvent("\r", "Return"))
+        app.update_idletasks()
+        toast_times.append(clock() - start)
+        for toast in list(wordle.toasts.visible):
+            wordle.toasts.dismiss(toast)
+
+    window_times = []
+    for i in range(args.presses):
+        status = "not_enough_letters" if i % 2 == 0 else "invalid_word"
+        start = clock()
+        win = window_message(wordle, wordle.t(status + "_title"), wordle.t(status + "_msg"))
+        window_times.append(clock() - start)
+        win.destroy()
+        app.update()
+
+    for name, times in (("in-window toasts", toast_times), ("window per message", window_times)):
+        print(f"{name}: p50 {percentile(times, 0.5) * 1000:.2f}ms, p90 {percentile(times, 0.9) * 1000:.2f}ms, "
+              f"p99 {percentile(times, 0.99) * 1000:.2f}ms, max {max(times) * 1000:.2f}ms")
+    app.destroy()
+
+
+if __name__ == "__main__":
+    main()
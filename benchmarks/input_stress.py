@@ -0,0 +1,104 @@
+"""
+Stress test for keyboard input. Injects thousands of synthetic key events into the game in bursts,
+as fast typing, key repeat or pasted text would deliver them, lets the Tk loop drain each burst and
+reports events/second, redraws per event and whether any key was dropped or applied out of order.
+The board is also checked against a headless engine.Game fed the same keys. Needs a display.
+
+    python -m benchmarks.input_stress [--events 5000] [--burst 50] [--seed 0]
+
+Run from the repository root.
+"""
+import argparse
+import random
+import time
+
+import engine
+
+
+class KeyEvent:
+    def __init__(self, char, keysym):
+        self.char = char
+        self.keysym = keysym
+
+
+def synthetic_events(rng, alphabet, count):
+    """
+    Returns random key events: mostly letters, some backspaces and the odd Return.
+    """
+    events = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.03:
+            events.append(KeyEvent("\r", "Return"))
+        elif roll < 0.3:
+            events.append(KeyEvent("\b", "BackSpace"))
+        else:
+            letter = rng.choice(alphabet)
+            events.append(KeyEvent(letter.lower(), letter.lower()))
+    return events
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inject bursts of synthetic key events and check every one is applied")
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--burst", type=int, default=50, help="key events delivered per tick of the Tk loop")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    import main as wordle  # builds the game window
+
+    app = wordle.app
+    wordle.event_log = None
+    while wordle.game is None:
+        app.update()
+        time.sleep(0.005)
+
+    game = wordle.game
+    # the reference plays the same keys synchronously, without a view
+    reference = engine.Game(game.language, game.valid_words, game.secret_word, game.rows, game.cols)
+    alphabet = sorted(engine.language_alphabets[game.language])
+    events = synthetic_events(random.Random(args.seed), alphabet, args.events)
+
+    # record the key presses in the order the game receives them
+    applied = []
+    for name in ("type_letter", "delete_letter", "submit_word"):
+        def record(*call_args, _action=getattr(wordle, name), _name=name):
+            applied.append((_name,) + call_args)
+            return _action(*call_args)
+        setattr(wordle, name, record)
+
+    expected = []
+    for event in events:
+        if event.keysym == "Return":
+            expected.append(("submit_word",))
+            reference.submit()
+        elif event.keysym == "BackSpace":
+            expected.append(("delete_letter",))
+            reference.delete_letter()
+        else:
+            expected.append(("type_letter", event.char.upper()))
+            reference.type_letter(event.char.upper())
+
+    frames = wordle.tile_renderer.frames
+    configures = wordle.tile_renderer.configures
+    start = time.perf_counter()
+    for first in range(0, len(events), args.burst):
+        for event in events[first:first + args.burst]:
+            wordle.on_key(event)
+        app.update()
+    elapsed = time.perf_counter() - start
+    frames = wordle.tile_renderer.frames - frames
+    configures = wordle.tile_renderer.configures - configures
+
+    dropped = len(expected) - len(applied)
+    reordered = sum(1 for want, got in zip(expected, applied) if want != got)
+    board_matches = game.letters == reference.letters and game.guesses == reference.guesses
+    print(f"{len(events)} key events in bursts of {args.burst}: {elapsed * 1000:.0f}ms, "
+          f"{len(events) / elapsed:.0f} events/s")
+    print(f"  {frames} redraws ({frames / len(events):.3f} per event), {configures} tile configure calls")
+    print(f"  dropped {dropped}, reordered {reordered}, board matches the headless game: {board_matches}")
+    app.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Load test for the game server. Starts a server in-process on a free local port (or targets a
+running one with --port), opens many keep-alive connections that each play games back to back,
+and reports requests/second and latency percentiles of the guess endpoint.
+
+    python -m benchmarks.loadtest [--connections 200] [--duration 10] [--language English] [--port PORT]
+
+Run from the repository root.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import engine
+from dictionary import load_dictionary
+from server import GameServer
+
+
+async def request(reader, writer, method, path, body=None):
+    """
+    Sends one request on a keep-alive connection and reads the JSON response.
+
+    Returns:
+    - Tuple (HTTP status, parsed body).
+    """
+    payload = json.dumps(body).encode("utf-8") if body is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(payload)}\r\n\r\n".encode("latin-1") + payload)
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def player(port, language, words, deadline, latencies, counts, seed):
+    """
+    Plays random valid guesses until the deadline, starting a new game whenever one ends.
+    """
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    clock = time.perf_counter
+    try:
+        game_id = None
+        while clock() < deadline:
+            if game_id is None:
+                _, state = await request(reader, writer, "POST", "/games", {"language": language})
+                game_id = state["id"]
+                counts["games"] += 1
+
+            start = clock()
+            status, response = await request(reader, writer, "POST", f"/games/{game_id}/guess",
+                                             {"word": words[rng.randrange(len(words))]})
+            latencies.append(clock() - start)
+            counts["guesses"] += 1
+            if status != 200:
+                counts["errors"] += 1
+            elif response["state"]["game_over"]:
+                game_id = None
+    finally:
+        writer.close()
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+async def run(connections, duration, language, port):
+    server = None
+    if port is None:
+        game_server = GameServer()
+        server = await game_server.start("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+
+    words = load_dictionary(language).words()
+    latencies = []
+    counts = {"games": 0, "guesses": 0, "errors": 0}
+
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(player(port, language, words, deadline, latencies, counts, seed)
+                           for seed in range(connections)))
+    elapsed = time.perf_counter() - start
+
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+
+    latencies.sort()
+    requests = counts["guesses"] + counts["games"]
+    print(f"{connections} connections, {elapsed:.1f}s, {counts['games']} games, {counts['errors']} errors")
+    print(f"requests/s: {requests / elapsed:.0f} (guesses/s: {counts['guesses'] / elapsed:.0f})")
+    print("guess latency: " + ", ".join(f"p{int(p * 100)} {percentile(latencies, p) * 1000:.2f}ms"
+                                        for p in (0.5, 0.9, 0.99)) + f", max {latencies[-1] * 1000:.2f}ms"
+          if latencies else "guess latency: no samples")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test for server.py")
+    parser.add_argument("--connections", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--language", default="English", choices=list(engine.lang_files))
+    parser.add_argument("--port", type=int, help="port of a running server; by default one is started in-process")
+    args = parser.parse_args()
+    asyncio.run(run(args.connections, args.duration, args.language, args.port))
+
+
+if __name__ == "__main__":
+    main()
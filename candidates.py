@@ -0,0 +1,122 @@
+"""
+Bitset index of the words still consistent with a game's feedback.
+
+Every dictionary word gets one bit. For each language the index keeps one bitset per
+(position, letter) and one per (letter, minimum count), so applying the feedback of a guess is a
+handful of bitwise ANDs over Python ints instead of a rescan of the word list.
+"""
+from collections import Counter
+
+from dictionary import load_dictionary
+from engine import COLS
+
+_indexes = {}
+
+
+class CandidateIndex:
+    """
+    Bitsets over a fixed word list. A set of candidates is an int whose bit i stands for words[i].
+    """
+
+    def __init__(self, words):
+        """
+        Parameters:
+        - words: List of words of equal length.
+        """
+        self.words = words
+        self.all = (1 << len(words)) - 1
+        self.at = {}  # (position, letter) -> words with that letter there
+        self.at_least = {}  # (letter, k) -> words with at least k copies of the letter
+
+        for bit, word in enumerate(words):
+            mask = 1 << bit
+            for i, ch in enumerate(word):
+                self.at[i, ch] = self.at.get((i, ch), 0) | mask
+            for ch, count in Counter(word).items():
+                for k in range(1, count + 1):
+                    self.at_least[ch, k] = self.at_least.get((ch, k), 0) | mask
+
+    def constrain(self, candidates, guess, states):
+        """
+        Keeps only the candidates that would have produced the given feedback.
+
+        Parameters:
+        - candidates: The current candidate bitset.
+        - guess: The guessed word as an uppercase string.
+        - states: State name ("correct", "misplaced", "wrong") of every letter of the guess.
+
+        Returns:
+        - The narrowed candidate bitset.
+        """
+        found = Counter()
+        capped = set()
+        for i, (ch, state) in enumerate(zip(guess, states)):
+            if state == "correct":
+                candidates &= self.at.get((i, ch), 0)
+                found[ch] += 1
+            else:
+                candidates &= ~self.at.get((i, ch), 0)
+                if state == "misplaced":
+                    found[ch] += 1
+                else:
+                    # a grey copy means the secret has no more of this letter than were matched
+                    capped.add(ch)
+
+        for ch, count in found.items():
+            candidates &= self.at_least.get((ch, count), 0)
+        for ch in capped:
+            candidates &= ~self.at_least.get((ch, found[ch] + 1), 0)
+        return candidates
+
+    def satisfying(self, constraints):
+        """
+        Returns the words that hard mode would accept as the next guess.
+
+        Parameters:
+        - constraints: An engine.Constraints.
+
+        Returns:
+        - Bitset of the words that pass constraints.check.
+        """
+        allowed = self.all
+        for i, ch in enumerate(constraints.fixed):
+            if ch is not None:
+                allowed &= self.at.get((i, ch), 0)
+        for ch, count in constraints.min_counts.items():
+            allowed &= self.at_least.get((ch, count), 0)
+        for ch in constraints.excluded:
+            allowed &= ~self.at_least.get((ch, 1), 0)
+        return allowed
+
+    def count(self, candidates):
+        """
+        Returns the number of words in a candidate bitset.
+        """
+        return candidates.bit_count()
+
+    def words_of(self, candidates):
+        """
+        Returns the words of a candidate bitset, in dictionary order.
+        """
+        # one pass over the binary digits, least significant bit first
+        bits = bin(candidates)[:1:-1]
+        words = []
+        i = bits.find("1")
+        while i >= 0:
+            words.append(self.words[i])
+            i = bits.find("1", i + 1)
+        return words
+
+
+def load_candidate_index(language, length=COLS):
+    """
+    Returns the candidate index of a language's dictionary of one word length, building it once per process.
+
+    Parameters:
+    - language: Language name as a string.
+    - length: Word length.
+    """
+    index = _indexes.get((language, length))
+    if index is None:
+        index = _indexes[language, length] = CandidateIndex(load_dictionary(language, length).words())
+    return index
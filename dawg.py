@@ -0,0 +1,204 @@
+"""
+Directed acyclic word graph (DAWG) of a compiled dictionary, used while a word is being typed to
+check whether its letters so far still lead to any valid word.
+
+The graph is the trie of the dictionary with equal subtrees merged, built bottom-up from the
+sorted records in one pass per letter position. It is stored packed in three flat arrays: every
+node has a bitmask of the letters (alphabet indexes) it has edges for and the offset of its first
+edge in an array of target nodes, so the target for a letter is found by counting the set bits of
+the mask below it. Typing a letter is one step: a lookup of the letter's code, a mask test and a
+popcount.
+
+To print the size of the graph and the time per step for every language:
+
+    python dawg.py [--length N] [language ...]
+"""
+import argparse
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from array import array
+
+from dictionary import load_dictionary
+from engine import COLS, lang_files
+
+DEAD_END = 0  # no word starts with the letters typed so far
+END = 1  # a whole word has been typed
+
+_dawgs = {}
+
+
+class Dawg:
+    """
+    Packed DAWG over the words of one length. Nodes are ints; DEAD_END is falsy and absorbing.
+    """
+    __slots__ = ("alphabet", "codes", "root", "masks", "firsts", "targets")
+
+    def __init__(self, alphabet, root, masks, firsts, targets):
+        """
+        Parameters:
+        - alphabet: The dictionary's alphabet; a letter's code is its index.
+        - root: Node of the empty prefix.
+        - masks: Per node, the bitmask of letter codes it has edges for.
+        - firsts: Per node, the index of its first edge in targets.
+        - targets: Target node of every edge, grouped by node and ordered by letter code.
+        """
+        self.alphabet = alphabet
+        self.codes = {ch: i for i, ch in enumerate(alphabet)}
+        self.root = root
+        self.masks = masks
+        self.firsts = firsts
+        self.targets = targets
+
+    def step(self, node, letter):
+        """
+        Follows the edge of a letter.
+
+        Parameters:
+        - node: The node of the letters typed so far.
+        - letter: The next letter as an uppercase string.
+
+        Returns:
+        - The node of the longer prefix, or DEAD_END if no word starts with it.
+        """
+        code = self.codes.get(letter)
+        if code is None:
+            return DEAD_END
+        bit = 1 << code
+        mask = self.masks[node]
+        if not mask & bit:
+            return DEAD_END
+        return self.targets[self.firsts[node] + (mask & (bit - 1)).bit_count()]
+
+    def walk(self, letters):
+        """
+        Returns the node of a prefix, or DEAD_END if no word starts with it.
+
+        Parameters:
+        - letters: The prefix as an uppercase string.
+        """
+        node = self.root
+        for letter in letters:
+            node = self.step(node, letter)
+        return node
+
+    def node_count(self):
+        """
+        Returns the number of nodes, including DEAD_END and END.
+        """
+        return len(self.masks)
+
+    def nbytes(self):
+        """
+        Returns the size of the packed arrays in bytes.
+        """
+        return sum(len(a) * a.itemsize for a in (self.masks, self.firsts, self.targets))
+
+
+def build_dawg(dictionary):
+    """
+    Builds the DAWG of a compiled dictionary.
+
+    Parameters:
+    - dictionary: A dictionary.Dictionary.
+
+    Returns:
+    - The Dawg.
+    """
+    records = dictionary.records
+    masks = array("Q", [0, 0])  # DEAD_END and END have no edges
+    firsts = array("I", [0, 0])
+    targets = array("I")
+    register = {}  # edges -> node, so that equal subtrees become one node
+
+    # node of every prefix of the current length, in sorted order; all whole words end in END
+    level = dict.fromkeys((records[i] for i in range(len(records))), END)
+    for depth in range(dictionary.length - 1, -1, -1):
+        edges = {}
+        for prefix, node in level.items():
+            edges.setdefault(prefix[:depth], []).append((prefix[depth], node))
+
+        level = {}
+        for prefix, node_edges in edges.items():
+            key = tuple(node_edges)
+            node = register.get(key)
+            if node is None:
+                node = register[key] = len(masks)
+                masks.append(sum(1 << code for code, _ in node_edges))
+                firsts.append(len(targets))
+                targets.extend(target for _, target in node_edges)
+            level[prefix] = node
+
+    if len(masks) <= 1 << 16:
+        targets = array("H", targets)
+    return Dawg(dictionary.alphabet, level.get(b"", DEAD_END), masks, firsts, targets)
+
+
+def load_dawg(language, length=COLS):
+    """
+    Returns the DAWG of a language's dictionary of one word length, building it once per process.
+
+    Parameters:
+    - language: Language name as a string.
+    - length: Word length.
+    """
+    dawg = _dawgs.get((language, length))
+    if dawg is None:
+        dawg = _dawgs[language, length] = build_dawg(load_dictionary(language, length))
+    return dawg
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Report the size of the prefix graphs and the time per step")
+    parser.add_argument("languages", nargs="*", default=list(lang_files))
+    parser.add_argument("--length", type=int, default=COLS)
+    parser.add_argument("--steps", type=int, default=200_000)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    for language in args.languages:
+        dictionary = load_dictionary(language, args.length)
+        words = dictionary.words()
+        if not words:
+            print(f"{language}: no {args.length}-letter words")
+            continue
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        dawg = build_dawg(dictionary)
+        build_time = time.perf_counter() - start
+        gc.collect()
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        tracemalloc.start()
+        word_set = set(words)
+        set_size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del word_set
+
+        # type random words, each with its last letter replaced half the time
+        typed = []
+        while len(typed) < args.steps:
+            word = rng.choice(words)
+            if rng.random() < 0.5:
+                word = word[:-1] + rng.choice(dawg.alphabet)
+            typed.append(word)
+        start = time.perf_counter()
+        for word in typed:
+            node = dawg.root
+            for letter in word:
+                node = dawg.step(node, letter)
+        step_time = (time.perf_counter() - start) / (len(typed) * args.length)
+
+        print(f"{language}: {len(words)} words, {dawg.node_count()} nodes, {len(dawg.targets)} edges, "
+              f"{dawg.nbytes() / 1024:.1f} KiB packed ({retained / 1024:.1f} KiB retained, peak "
+              f"{peak / 1024 / 1024:.1f} MiB while building in {build_time * 1000:.0f}ms); "
+              f"a set of the words takes {set_size / 1024:.1f} KiB; {step_time * 1e9:.0f}ns per letter")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
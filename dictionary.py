@@ -0,0 +1,456 @@
+"""
+Compiled, memory-mapped dictionaries.
+
+The word lists in dictionaries/*.csv are compiled once into one binary file per language and word
+length (WORD_LENGTHS), so a game only maps the words of the length it is played with. A file holds a
+small header, the language's alphabet (the codec), then every word of that length as a fixed-width
+record of one alphabet index per letter, sorted by those indexes. At runtime the file is memory-mapped and
+membership is a binary search over the records, so no word list is rebuilt in Python.
+
+The file ends with the word-of-the-day schedule: a fixed shuffle of the record indexes, one
+little-endian uint32 per day starting at SCHEDULE_EPOCH, so the word for any date is a single
+lookup and no word repeats until the whole dictionary has been used.
+
+A compiled file stores the hash of the CSV it was built from and is rebuilt automatically when
+the CSV changes. To build (or check) every language ahead of time:
+
+    python dictionary.py build [--force] [language ...]
+"""
+import bisect
+import datetime
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from array import array
+
+from engine import COLS, lang_files, language_alphabets, load_words
+
+compiled_folder = "dictionaries/compiled"
+
+MAGIC = b"WDIC"
+VERSION = 2
+# magic, version, word length, alphabet size in bytes, word count, source digest
+HEADER = struct.Struct("<4sHHHI16s")
+
+WORD_LENGTHS = range(4, 9)
+
+SCHEDULE_EPOCH = datetime.date(2025, 1, 1)
+SCHEDULE_ENTRY = struct.Struct("<I")
+
+_dictionaries = {}
+_load_lock = threading.Lock()  # one thread at a time rebuilds stale files and fills _dictionaries
+
+
+def file_digest(file_path):
+    """
+    Hashes a dictionary file so that artifacts built from it can be invalidated when it changes.
+
+    Parameters:
+    - file_path: Path to the file.
+
+    Returns:
+    - The first 16 hex digits of the file's SHA-256.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def language_codec(language):
+    """
+    Returns the alphabet used to encode a language's words; a letter's code is its index.
+
+    Parameters:
+    - language: Language name as a string.
+    """
+    return "".join(sorted(language_alphabets[language]))
+
+
+def compiled_path(language, length=COLS):
+    """
+    Returns the path of a language's compiled dictionary of one word length.
+
+    Parameters:
+    - language: Language name as a string.
+    - length: Word length.
+    """
+    name = os.path.splitext(os.path.basename(lang_files[language]))[0]
+    return os.path.join(compiled_folder, f"{name}-{length}.wdict")
+
+
+def read_header(path):
+    """
+    Reads the header of a compiled dictionary.
+
+    Parameters:
+    - path: Path to the compiled file.
+
+    Returns:
+    - Tuple (word length, alphabet, word count, source digest), or None if the file is missing or
+      was written by another format version.
+    """
+    try:
+        with open(path, "rb") as f:
+            header = f.read(HEADER.size)
+            if len(header) < HEADER.size:
+                return None
+            magic, version, length, alphabet_size, count, digest = HEADER.unpack(header)
+            if magic != MAGIC or version != VERSION:
+                return None
+            alphabet = f.read(alphabet_size).decode("utf-8")
+    except OSError:
+        return None
+    return length, alphabet, count, digest.decode("ascii")
+
+
+def schedule_permutation(count, language):
+    """
+    Shuffles range(count) with a Fisher-Yates shuffle driven by SplitMix64 seeded from the language
+    name, so the schedule does not depend on Python's random module.
+
+    Parameters:
+    - count: Number of words.
+    - language: Language name as a string.
+
+    Returns:
+    - Array of uint32 with every index from 0 to count - 1 once; four bytes per word.
+    """
+    mask = (1 << 64) - 1
+    state = int.from_bytes(hashlib.sha256(language.encode("utf-8")).digest()[:8], "little")
+
+    order = array("I", range(count))
+    for i in range(count - 1, 0, -1):
+        state = (state + 0x9E3779B97F4A7C15) & mask
+        z = state
+        z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & mask
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & mask
+        z ^= z >> 31
+        j = z % (i + 1)
+        order[i], order[j] = order[j], order[i]
+    return order
+
+
+def schedule_seed(language, length):
+    """
+    Returns the name that seeds the schedule of a language's words of one length. Five-letter words
+    keep the seed they had before other lengths existed, so their schedule did not change.
+
+    Parameters:
+    - language: Language name as a string.
+    - length: Word length.
+    """
+    return language if length == COLS else f"{language}/{length}"
+
+
+def is_stale(language, length=COLS):
+    """
+    Checks whether a language's compiled dictionary of one word length is missing or older than its CSV.
+
+    Parameters:
+    - language: Language name as a string.
+    - length: Word length.
+    """
+    header = read_header(compiled_path(language, length))
+    return header is None or header[3] != file_digest(lang_files[language])
+
+
+def schedule_bytes(schedule):
+    """
+    Returns a schedule from schedule_permutation as SCHEDULE_ENTRY records.
+    """
+    if sys.byteorder != "little":
+        schedule = array("I", schedule)
+        schedule.byteswap()
+    return schedule.tobytes()
+
+
+def write_compiled(path, language, length, records, digest):
+    """
+    Writes one compiled dictionary partition from sorted, unique records, streaming them to disk.
+    The file is written under a temporary name; the caller renames it with os.replace.
+
+    Parameters:
+    - path: Destination path; the file written is path + ".tmp".
+    - language: Language name as a string.
+    - length: Word length.
+    - records: Iterable of records (bytes of codec indexes) in ascending order without duplicates.
+    - digest: The source digest to store, as ASCII bytes.
+
+    Returns:
+    - Tuple (temporary path, number of words written).
+    """
+    alphabet_bytes = language_codec(language).encode("utf-8")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    count = 0
+    with open(tmp_path, "wb") as f:
+        # the count is only known at the end, so the header is written twice
+        f.write(HEADER.pack(MAGIC, VERSION, length, len(alphabet_bytes), 0, digest))
+        f.write(alphabet_bytes)
+        for record in records:
+            f.write(record)
+            count += 1
+        f.write(schedule_bytes(schedule_permutation(count, schedule_seed(language, length))))
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, length, len(alphabet_bytes), count, digest))
+    return tmp_path, count
+
+
+def build_dictionary(language):
+    """
+    Compiles a language's CSV word list in one pass, into one file per word length in WORD_LENGTHS.
+    Words of other lengths or with letters outside the language's alphabet can never be guessed and
+    are left out.
+
+    Parameters:
+    - language: Language name as a string.
+
+    Returns:
+    - Tuple (dictionary of word length to number of words written, number of words skipped).
+    """
+    alphabet = language_codec(language)
+    codes = {ch: i for i, ch in enumerate(alphabet)}
+
+    partitions = {length: set() for length in WORD_LENGTHS}
+    skipped = 0
+    for word in load_words(language):
+        records = partitions.get(len(word))
+        if records is None or not all(ch in codes for ch in word):
+            skipped += 1
+            continue
+        records.add(bytes(codes[ch] for ch in word))
+
+    digest = file_digest(lang_files[language]).encode("ascii")
+
+    for length, records in partitions.items():
+        path = compiled_path(language, length)
+        tmp_path, _ = write_compiled(path, language, length, sorted(records), digest)
+        os.replace(tmp_path, path)
+
+    return {length: len(records) for length, records in partitions.items()}, skipped
+
+
+class _Records:
+    """
+    Sequence view of the fixed-width records of a compiled dictionary, for bisect.
+    """
+
+    def __init__(self, buffer, offset, width, count):
+        self.buffer = buffer
+        self.offset = offset
+        self.width = width
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        start = self.offset + i * self.width
+        return self.buffer[start:start + self.width]
+
+
+class Dictionary:
+    """
+    A compiled dictionary mapped into memory. Supports len(), iteration, indexing and `word in d`.
+    """
+
+    def __init__(self, language, path):
+        """
+        Parameters:
+        - language: Language name as a string.
+        - path: Path to the compiled file.
+        """
+        self.language = language
+        self.path = path
+        self.length, self.alphabet, self.count, self.digest = read_header(path)
+        self.codes = {ch: i for i, ch in enumerate(self.alphabet)}
+
+        with open(path, "rb") as f:
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.offset = HEADER.size + len(self.alphabet.encode("utf-8"))
+        self.records = _Records(self.buffer, self.offset, self.length, self.count)
+        self.schedule_offset = self.offset + self.count * self.length
+
+    def encode(self, word):
+        """
+        Encodes a word as a record.
+
+        Parameters:
+        - word: The word as an uppercase string.
+
+        Returns:
+        - The record as bytes, or None if the word cannot be part of this dictionary.
+        """
+        if len(word) != self.length:
+            return None
+        try:
+            return bytes(self.codes[ch] for ch in word)
+        except KeyError:
+            return None
+
+    def decode(self, record):
+        """
+        Decodes a record into a word.
+
+        Parameters:
+        - record: The record as bytes.
+        """
+        return "".join(self.alphabet[code] for code in record)
+
+    def find(self, word):
+        """
+        Returns the index of a word, or -1 if it is not in the dictionary.
+
+        Parameters:
+        - word: The word as an uppercase string.
+        """
+        record = self.encode(word)
+        if record is None:
+            return -1
+        i = bisect.bisect_left(self.records, record)
+        if i < self.count and self.records[i] == record:
+            return i
+        return -1
+
+    def __contains__(self, word):
+        return self.find(word) >= 0
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        return self.decode(self.records[i])
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self.decode(self.records[i])
+
+    def words(self):
+        """
+        Returns every word as a list, in record order.
+        """
+        return list(self)
+
+    def word_for_date(self, date):
+        """
+        Returns the word of the day for any date, past or future.
+
+        Parameters:
+        - date: A datetime.date.
+        """
+        if not self.count:
+            raise LookupError(f"there are no {self.length}-letter words in {self.language}")
+        day = (date - SCHEDULE_EPOCH).days % self.count
+        (i,) = SCHEDULE_ENTRY.unpack_from(self.buffer, self.schedule_offset + day * SCHEDULE_ENTRY.size)
+        return self[i]
+
+    def words_for_date(self, date, count):
+        """
+        Returns several different words for a date, for games played on several boards. Each day takes
+        the next count entries of the schedule, so no word repeats until the dictionary is used up.
+
+        Parameters:
+        - date: A datetime.date.
+        - count: Number of words.
+        """
+        if count > self.count:
+            raise LookupError(f"there are fewer than {count} {self.length}-letter words in {self.language}")
+        first = (date - SCHEDULE_EPOCH).days * count
+        words = []
+        for day in range(first, first + count):
+            offset = self.schedule_offset + day % self.count * SCHEDULE_ENTRY.size
+            (i,) = SCHEDULE_ENTRY.unpack_from(self.buffer, offset)
+            words.append(self[i])
+        return words
+
+    def encoded(self):
+        """
+        Returns the records as a numpy uint8 array of shape (count, length), without copying.
+        """
+        import numpy as np
+        return np.frombuffer(self.buffer, dtype=np.uint8, count=self.count * self.length,
+                             offset=self.offset).reshape(self.count, self.length)
+
+
+def load_dictionary(language, length=COLS):
+    """
+    Returns a language's compiled dictionary of one word length, rebuilding the language first if
+    its CSV changed. Dictionaries are opened once per process, and only for the lengths asked for.
+    Safe to call from several threads.
+
+    Parameters:
+    - language: Language name as a string.
+    - length: Word length.
+    """
+    dictionary = _dictionaries.get((language, length))
+    if dictionary is not None:
+        return dictionary
+
+    if length not in WORD_LENGTHS:
+        raise ValueError(f"word length must be between {WORD_LENGTHS.start} and {WORD_LENGTHS.stop - 1}")
+    with _load_lock:
+        # another thread may have opened it while this one waited
+        dictionary = _dictionaries.get((language, length))
+        if dictionary is None:
+            if is_stale(language, length):
+                build_dictionary(language)
+            dictionary = _dictionaries[language, length] = Dictionary(language, compiled_path(language, length))
+    return dictionary
+
+
+def available_lengths(language):
+    """
+    Returns the word lengths a language has words for.
+
+    Parameters:
+    - language: Language name as a string.
+    """
+    return [length for length in WORD_LENGTHS if len(load_dictionary(language, length))]
+
+
+def get_todays_word(dictionary):
+    """
+    Selects today's word from the dictionary's schedule.
+
+    Parameters:
+    - dictionary: A Dictionary.
+
+    Returns:
+    - The selected word as a string.
+    """
+    return dictionary.word_for_date(datetime.date.today())
+
+
+def main(argv):
+    if not argv or argv[0] != "build":
+        print("usage: python dictionary.py build [--force] [language ...]")
+        return 2
+
+    args = argv[1:]
+    force = "--force" in args
+    languages = [arg for arg in args if arg != "--force"] or list(lang_files)
+
+    for language in languages:
+        if not force and not any(is_stale(language, length) for length in WORD_LENGTHS):
+            print(f"{language}: up to date ({compiled_folder})")
+            continue
+
+        start = time.perf_counter()
+        written, skipped = build_dictionary(language)
+        counts = ", ".join(f"{length} letters: {n}" for length, n in written.items())
+        print(f"{language}: {counts}; {skipped} skipped, built in {(time.perf_counter() - start) * 1000:.0f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
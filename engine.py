@@ -0,0 +1,529 @@
+import unicodedata
+from collections import namedtuple
+
+ROWS = 6
+COLS = 5
+
+dict_folder = "dictionaries"
+lang_files = {
+    "English": f"{dict_folder}/english.csv",
+    "Norsk": f"{dict_folder}/norwegian.csv",
+    "Українська": f"{dict_folder}/ukrainian.csv"
+}
+language_alphabets = {
+    "English": set("ABCDEFGHIJKLMNOPQRSTUVWXYZ"),
+    "Norsk": set("ABCDEFGHIJKLMNOPQRSTUVWXYZÆØÅ"),
+    "Українська": set("АБВГҐДЕЄЖЗИІЇЙКЛМНОПРСТУФХЦЧШЩЬЮЯ")
+}
+
+# 1 = wrong, 2 = misplaced, 3 = correct
+WRONG = 1
+MISPLACED = 2
+CORRECT = 3
+STATE_NAMES = {
+    WRONG: "wrong",
+    MISPLACED: "misplaced",
+    CORRECT: "correct",
+}
+
+priority = {
+    "wrong": 1,
+    "misplaced": 2,
+    "correct": 3,
+}
+
+# Outcomes of Game.submit(). The rejection statuses match the UI_STRINGS key prefixes
+# ("<status>_title" / "<status>_msg") so the view can look the message up directly.
+NOT_ENOUGH_LETTERS = "not_enough_letters"
+INVALID_LETTERS = "invalid_letters"
+INVALID_WORD = "invalid_word"
+ALREADY_GUESSED = "already_guessed"
+HARD_MODE = "hard_mode"  # the guess ignores a revealed hint; see Constraints.check for which
+ACCEPTED = "accepted"
+WON = "won"
+LOST = "lost"
+
+GuessResult = namedtuple("GuessResult", ["status", "guess", "row", "states"])
+
+
+def rows_for_boards(boards):
+    """
+    Returns the number of attempts of a game played on several boards at once: one more for every
+    board after the first, as in Quordle (4 boards, 9 attempts) and Octordle (8 boards, 13).
+
+    Parameters:
+    - boards: Number of boards.
+    """
+    return ROWS + boards - 1
+
+
+def load_words(language):
+    """
+    Loads the source word list for the specified language from its CSV file.
+    The game itself reads the compiled copy (see dictionary.load_dictionary).
+
+    Parameters:
+    - language: Language name as a string.
+
+    Returns:
+    - List of words in uppercase.
+    """
+    file_path = lang_files[language]
+    words = []
+    with open(file_path, encoding="utf-8") as f:
+        for line in f:
+            # composed letters, so that e.g. Й is one character whichever way the file spells it
+            words.append(unicodedata.normalize("NFC", line.strip().upper()))
+    return words
+
+
+def score_guess(guess, secret):
+    """
+    Scores a guess against the secret word, handling repeated letters the same way as Wordle:
+    exact matches are taken first, then each remaining letter of the secret can mark at most
+    one misplaced letter in the guess, from left to right.
+
+    Parameters:
+    - guess: The guessed word as an uppercase string.
+    - secret: The secret word as an uppercase string.
+
+    Returns:
+    - List with one of WRONG, MISPLACED or CORRECT per position.
+    """
+    result = [WRONG] * len(guess)  # initially all wrong
+    secret_list = list(secret)
+
+    # correct positions
+    for i, ch in enumerate(guess):
+        if ch == secret[i]:
+            result[i] = CORRECT
+            secret_list[i] = None
+
+    # misplaced positions
+    for i, ch in enumerate(guess):
+        if result[i] == CORRECT:
+            continue
+        if ch in secret_list:
+            result[i] = MISPLACED
+            secret_list[secret_list.index(ch)] = None
+
+    return result
+
+
+def score_batch(guess, secrets):
+    """
+    Scores one guess against several secret words in a single call, with the same rules as
+    score_guess, and returns pattern codes directly. The guess is only prepared once, and a secret
+    that shares no letter with it is scored without a scan.
+
+    Parameters:
+    - guess: The guessed word as an uppercase string.
+    - secrets: The secret words as uppercase strings of the same length.
+
+    Returns:
+    - List with the pattern code (see pattern_code) of the guess against every secret.
+    """
+    letters = set(guess)
+    length = len(guess)
+    misplaced = [3 ** i for i in range(length)]
+    correct = [2 * weight for weight in misplaced]
+
+    codes = []
+    for secret in secrets:
+        if letters.isdisjoint(secret):
+            codes.append(0)
+            continue
+
+        # correct positions; the other letters of the secret can each mark one misplaced letter
+        code = 0
+        unmatched = []
+        left = []
+        for i in range(length):
+            secret_ch = secret[i]
+            if guess[i] == secret_ch:
+                code += correct[i]
+            else:
+                unmatched.append(i)
+                left.append(secret_ch)
+
+        for i in unmatched:
+            ch = guess[i]
+            if ch in left:
+                code += misplaced[i]
+                left.remove(ch)
+        codes.append(code)
+    return codes
+
+
+def pattern_code(result):
+    """
+    Packs a scored guess into a single base-3 number, with the first letter as the least
+    significant digit. Five letters give 3^5 = 243 distinct codes, which fit in a byte.
+
+    Parameters:
+    - result: List of WRONG, MISPLACED or CORRECT per position, as returned by score_guess.
+
+    Returns:
+    - The pattern code as an int.
+    """
+    code = 0
+    for state in reversed(result):
+        code = code * 3 + (state - WRONG)
+    return code
+
+
+def decode_pattern(code, length=COLS):
+    """
+    Unpacks a pattern code produced by pattern_code.
+
+    Parameters:
+    - code: The pattern code as an int.
+    - length: Number of letters in the scored word.
+
+    Returns:
+    - List of WRONG, MISPLACED or CORRECT per position.
+    """
+    result = []
+    for _ in range(length):
+        code, digit = divmod(code, 3)
+        result.append(digit + WRONG)
+    return result
+
+
+class Constraints:
+    """
+    What hard mode requires of the next guess: letters fixed in place, the minimum count of every
+    revealed letter and the letters known to be absent. It is updated from each scored guess, so
+    checking a guess never looks at earlier guesses.
+    """
+    __slots__ = ("fixed", "min_counts", "excluded")
+
+    def __init__(self, cols=COLS):
+        """
+        Parameters:
+        - cols: Number of letters per word.
+        """
+        self.fixed = [None] * cols
+        self.min_counts = {}
+        self.excluded = set()
+
+    def update(self, guess, states):
+        """
+        Adds the hints revealed by a scored guess.
+
+        Parameters:
+        - guess: The guessed word as an uppercase string.
+        - states: State name ("correct", "misplaced", "wrong") of every letter of the guess.
+        """
+        found = {}
+        for i, (ch, state) in enumerate(zip(guess, states)):
+            if state == "correct":
+                self.fixed[i] = ch
+            if state != "wrong":
+                found[ch] = found.get(ch, 0) + 1
+
+        for ch, count in found.items():
+            if count > self.min_counts.get(ch, 0):
+                self.min_counts[ch] = count
+        for ch, state in zip(guess, states):
+            if state == "wrong" and ch not in self.min_counts:
+                self.excluded.add(ch)
+
+    def check(self, guess):
+        """
+        Checks whether a guess uses every revealed hint.
+
+        Parameters:
+        - guess: The guessed word as an uppercase string.
+
+        Returns:
+        - None if it does, otherwise the first broken rule: ("fixed", position, letter),
+          ("present", letter, count) or ("excluded", letter).
+        """
+        for i, ch in enumerate(self.fixed):
+            if ch is not None and guess[i] != ch:
+                return ("fixed", i, ch)
+        for ch, count in self.min_counts.items():
+            if guess.count(ch) < count:
+                return ("present", ch, count)
+        for ch in guess:
+            if ch in self.excluded:
+                return ("excluded", ch)
+        return None
+
+
+class Game:
+    """
+    Headless state of a single Wordle game: the board, the cursor, the guesses made so far and the
+    best known state of every letter. It has no GUI dependencies; the CustomTkinter view in main.py
+    only mirrors what this object reports.
+    """
+    __slots__ = ("language", "valid_words", "secret_word", "rows", "cols", "candidate_index", "candidates",
+                 "current_row", "current_col", "game_over", "won", "letters", "tile_states", "keyboard_state",
+                 "previous_guesses", "guesses", "patterns", "constraints", "adversary", "prefixes", "prefix_nodes")
+    boards = 1  # number of secret words; see multiboard.MultiGame
+
+    def __init__(self, language, valid_words, secret_word, rows=ROWS, cols=COLS, candidate_index=None,
+                 hard_mode=False, adversary=None, prefixes=None):
+        """
+        Parameters:
+        - language: Language name as a string, used to validate the alphabet of guesses.
+        - valid_words: Collection of allowed guesses in uppercase.
+        - secret_word: The word to guess. Ignored with an adversary, which keeps changing it.
+        - rows: Number of attempts.
+        - cols: Number of letters per word.
+        - candidate_index: Optional candidates.CandidateIndex over valid_words, used to track the
+          words still consistent with the feedback.
+        - hard_mode: Require every guess to use all revealed hints.
+        - adversary: Optional adversary.Adversary over valid_words that picks the answer to each guess.
+        - prefixes: Optional dawg.Dawg over valid_words, used to tell while a word is typed whether it
+          can still become a valid guess.
+        """
+        self.language = language
+        self.valid_words = valid_words
+        self.secret_word = secret_word.upper()
+        self.rows = rows
+        self.cols = cols
+        self.candidate_index = candidate_index
+        self.candidates = candidate_index.all if candidate_index is not None else None
+
+        self.current_row = 0
+        self.current_col = 0
+        self.game_over = False
+        self.won = False
+
+        self.letters = [["" for _ in range(cols)] for _ in range(rows)]
+        self.tile_states = [[None for _ in range(cols)] for _ in range(rows)]
+        self.keyboard_state = {}
+        self.previous_guesses = set()
+        self.guesses = []
+        self.patterns = []
+        self.constraints = Constraints(cols) if hard_mode else None
+        self.adversary = adversary
+        self.prefixes = prefixes
+        # node of the first col letters of the current row; entry 0 is always the root
+        self.prefix_nodes = [prefixes.root] + [0] * cols if prefixes is not None else None
+
+    def type_letter(self, letter):
+        """
+        Types a letter into the current tile.
+
+        Parameters:
+        - letter: The letter to type as a string.
+
+        Returns:
+        - The (row, col) of the filled tile, or None if nothing was typed.
+        """
+        if self.game_over or self.current_row >= self.rows or self.current_col >= self.cols:
+            return None
+
+        row, col = self.current_row, self.current_col
+        self.letters[row][col] = letter.upper()
+        if self.prefixes is not None:
+            self.prefix_nodes[col + 1] = self.prefixes.step(self.prefix_nodes[col], self.letters[row][col])
+        self.current_col += 1
+        return row, col
+
+    def delete_letter(self):
+        """
+        Deletes the last typed letter in the current row.
+
+        Returns:
+        - The (row, col) of the cleared tile, or None if there was nothing to delete.
+        """
+        if self.game_over or self.current_col == 0:
+            return None
+
+        self.current_col -= 1
+        row, col = self.current_row, self.current_col
+        self.letters[row][col] = ""
+        return row, col
+
+    def dead_end(self):
+        """
+        Returns the column of the current row from which the typed letters no longer lead to any
+        valid word, or None while they still can or without prefixes.
+        """
+        if self.prefixes is None:
+            return None
+        for col in range(self.current_col):
+            if not self.prefix_nodes[col + 1]:
+                return col
+        return None
+
+    def current_guess(self):
+        """
+        Returns the letters typed in the current row as a string.
+        """
+        if self.current_row >= self.rows:
+            return ""
+        return "".join(self.letters[self.current_row])
+
+    def guess(self, word):
+        """
+        Submits a whole word at once, as if it had been typed into the current row.
+
+        Parameters:
+        - word: The guessed word as a string.
+
+        Returns:
+        - A GuessResult, or None if the game is over. See submit().
+        """
+        if self.game_over:
+            return None
+
+        guess = word.upper()
+        status = self.validate(guess)
+        if status is not None:
+            return GuessResult(status, guess, self.current_row, None)
+
+        return self.apply_guess(guess)
+
+    def validate(self, guess):
+        """
+        Checks whether a complete guess may be submitted.
+
+        Parameters:
+        - guess: The guessed word as an uppercase string.
+
+        Returns:
+        - One of the rejection statuses, or None if the guess is acceptable.
+        """
+        if len(guess) < self.cols:
+            return NOT_ENOUGH_LETTERS
+
+        # Validate letters belong to selected language
+        if not set(guess).issubset(language_alphabets[self.language]):
+            return INVALID_LETTERS
+
+        # Check if word exists in dictionary
+        if guess not in self.valid_words:
+            return INVALID_WORD
+
+        # Check if word was already guessed
+        if guess in self.previous_guesses:
+            return ALREADY_GUESSED
+
+        if self.constraints is not None and self.constraints.check(guess) is not None:
+            return HARD_MODE
+
+        return None
+
+    def submit(self):
+        """
+        Submits the word in the current row.
+
+        Returns:
+        - A GuessResult. For rejected guesses only the status and guess are set and the board is
+          left untouched; otherwise states holds the state name of every letter of the scored row.
+        """
+        if self.game_over:
+            return None
+
+        guess = self.current_guess()
+        status = self.validate(guess)
+        if status is not None:
+            return GuessResult(status, guess, self.current_row, None)
+
+        return self.apply_guess(guess)
+
+    def apply_guess(self, guess):
+        """
+        Scores an already validated guess and advances the game.
+
+        Parameters:
+        - guess: The guessed word as an uppercase string.
+
+        Returns:
+        - A GuessResult with status ACCEPTED, WON or LOST.
+        """
+        row = self.current_row
+        self.letters[row] = list(guess)
+        self.previous_guesses.add(guess)
+        self.guesses.append(guess)
+
+        if self.adversary is not None:
+            self.secret_word = self.adversary.respond(guess)
+        result = score_guess(guess, self.secret_word)
+        self.patterns.append(pattern_code(result))
+
+        states = [STATE_NAMES[code] for code in result]
+        for i, (ch, state) in enumerate(zip(guess, states)):
+            self.tile_states[row][i] = state
+            self.update_keyboard_state(ch, state)
+
+        if self.candidate_index is not None:
+            self.candidates = self.candidate_index.constrain(self.candidates, guess, states)
+        if self.constraints is not None:
+            self.constraints.update(guess, states)
+
+        if guess == self.secret_word:
+            self.game_over = True
+            self.won = True
+            return GuessResult(WON, guess, row, states)
+
+        self.current_row += 1
+        self.current_col = 0
+
+        # If player used all rows
+        if self.current_row >= self.rows:
+            self.game_over = True
+            return GuessResult(LOST, guess, row, states)
+
+        return GuessResult(ACCEPTED, guess, row, states)
+
+    def board_states(self, board):
+        """
+        Returns the tile states of a board: one row per attempt, with a state name or None per tile.
+
+        Parameters:
+        - board: Index of the board; a single game only has board 0.
+        """
+        return self.tile_states
+
+    def open_boards(self):
+        """
+        Returns the indexes of the boards that still take guesses.
+        """
+        return () if self.game_over else (0,)
+
+    def remaining_count(self):
+        """
+        Returns the number of words still consistent with the feedback, or None without a candidate index.
+        """
+        if self.candidate_index is None:
+            return None
+        return self.candidate_index.count(self.candidates)
+
+    def remaining_words(self):
+        """
+        Returns the words still consistent with the feedback, or None without a candidate index.
+        """
+        if self.candidate_index is None:
+            return None
+        return self.candidate_index.words_of(self.candidates)
+
+    def feedback(self):
+        """
+        Returns the guesses scored so far as a list of (guess, pattern code) pairs.
+        """
+        return list(zip(self.guesses, self.patterns))
+
+    def update_keyboard_state(self, letter, new_state):
+        """
+        Records the best known state of a letter.
+
+        Parameters:
+        - letter: The letter as a string.
+        - new_state: The new state of the letter ("correct", "misplaced", "wrong").
+
+        Returns:
+        - True if the stored state changed, False otherwise.
+        """
+        old_state = self.keyboard_state.get(letter)
+
+        if old_state and priority[old_state] >= priority[new_state]:
+            return False
+
+        self.keyboard_state[letter] = new_state
+        return True
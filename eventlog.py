@@ -0,0 +1,373 @@
+"""
+Append-only binary log of game events, and a streaming reader that aggregates it.
+
+Every event is one fixed-size little-endian record (RECORD): the time in milliseconds, the game's
+session id, the event kind, the language, the game's word length and mode (see game_mode), the
+puzzle's day number counted from the schedule epoch, row and column, a kind-specific value and up to
+MAX_LETTERS letters. A letter is stored as its index in the language's codec plus one, so zero means
+no letter. Files start with a small header and are rotated once they reach max_bytes; a record cut
+short by a crash is ignored by the reader. Files of version 1, written before records had a length
+and mode, are still read; their games are reported under the mode "unknown".
+
+The reader memory-maps each file and aggregates it in chunks of CHUNK_RECORDS, so logs of any size
+are read in one pass with bounded memory:
+
+    python eventlog.py [--json] [path ...]
+
+Paths can be log files or folders of them and default to log_folder.
+"""
+import argparse
+import datetime
+import json
+import os
+import struct
+import sys
+import time
+from collections import Counter
+
+from dictionary import SCHEDULE_EPOCH, language_codec
+from engine import ALREADY_GUESSED, HARD_MODE, INVALID_LETTERS, INVALID_WORD, NOT_ENOUGH_LETTERS, lang_files
+
+log_folder = "logs/events"
+
+MAGIC = b"WLOG"
+VERSION = 2
+# magic, version, record size
+HEADER = struct.Struct("<4sHH")
+# time in ms, session, kind, language, word length, mode, day, row, column, value, letters
+RECORD = struct.Struct("<QIBBBBhBBH8s")
+RECORD_V1 = struct.Struct("<QIBBhBBH8s")  # without word length and mode
+MAX_LETTERS = 8
+MAX_FILE_BYTES = 16 << 20
+CHUNK_RECORDS = 1 << 20
+
+# Event kinds and the meaning of their value field
+KEY = 1  # a letter was typed at (row, col)
+DELETE = 2  # the letter at (row, col) was deleted
+GUESS = 3  # a scored guess; value is its pattern code
+REJECTED = 4  # a refused submission; value is 1 + its index in REJECTIONS
+OUTCOME = 5  # the game ended after row guesses; value is 1 if it was won; letters are a single board's answer
+KIND_NAMES = {KEY: "key", DELETE: "delete", GUESS: "guess", REJECTED: "rejected", OUTCOME: "outcome"}
+
+# new rejections must be appended so that logged values keep their meaning
+REJECTIONS = (NOT_ENOUGH_LETTERS, INVALID_LETTERS, INVALID_WORD, ALREADY_GUESSED, HARD_MODE)
+# a language's code is its index here; new languages must be appended
+LANGUAGES = list(lang_files)
+
+# Mode byte: the number of boards in the low bits, and flags
+MODE_BOARDS = 0x1F
+MODE_HARD = 0x20
+MODE_ADVERSARIAL = 0x40
+
+
+def game_mode(game):
+    """
+    Returns the mode byte of a game.
+
+    Parameters:
+    - game: The engine.Game or multiboard.MultiGame.
+    """
+    mode = game.boards
+    if game.constraints is not None:
+        mode |= MODE_HARD
+    if game.adversary is not None:
+        mode |= MODE_ADVERSARIAL
+    return mode
+
+
+def mode_name(length, mode):
+    """
+    Names a word length and mode the way snapshot files do, e.g. "5x1", "6x4" or "5x1-hard-absurdle".
+    Records of version 1 files have neither and are named "unknown".
+
+    Parameters:
+    - length: Word length.
+    - mode: Mode byte, as returned by game_mode.
+    """
+    if not mode:
+        return "unknown"
+    name = f"{length}x{mode & MODE_BOARDS}"
+    if mode & MODE_HARD:
+        name += "-hard"
+    if mode & MODE_ADVERSARIAL:
+        name += "-absurdle"
+    return name
+
+
+class EventLog:
+    """
+    Writes events to rotating log files in a folder. Files are created on the first event.
+    """
+
+    def __init__(self, folder=log_folder, max_bytes=MAX_FILE_BYTES):
+        """
+        Parameters:
+        - folder: Folder for the log files.
+        - max_bytes: Size at which a file is closed and a new one started.
+        """
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self.file = None
+        self.size = 0
+        self.files = 0
+        self.codes = {}  # language -> {letter: stored code}
+
+    def open_file(self):
+        os.makedirs(self.folder, exist_ok=True)
+        self.files += 1
+        # names sort in the order the files were written
+        name = f"events-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{self.files}.wlog"
+        self.file = open(os.path.join(self.folder, name), "ab")
+        self.file.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+        self.size = HEADER.size
+
+    def encode(self, language, letters):
+        """
+        Encodes letters as codec indexes plus one, padded with zeros. Unknown letters are stored as 255.
+
+        Parameters:
+        - language: Language name as a string.
+        - letters: The letters as a string, at most MAX_LETTERS long.
+        """
+        codes = self.codes.get(language)
+        if codes is None:
+            codes = self.codes[language] = {ch: i + 1 for i, ch in enumerate(language_codec(language))}
+        return bytes(codes.get(ch, 255) for ch in letters[:MAX_LETTERS])
+
+    def append(self, kind, language, length, mode, date, session, row=0, col=0, value=0, letters=""):
+        """
+        Appends one event.
+
+        Parameters:
+        - kind: One of KEY, DELETE, GUESS, REJECTED, OUTCOME.
+        - language: Language name as a string.
+        - length: The game's word length.
+        - mode: The game's mode byte, as returned by game_mode.
+        - date: The puzzle's datetime.date.
+        - session: Id of the game as an unsigned 32-bit int.
+        - row, col: Position on the board.
+        - value: Kind-specific value, see the event kinds.
+        - letters: The typed letter or the guessed word.
+        """
+        if self.file is None or self.size + RECORD.size > self.max_bytes:
+            self.close()
+            self.open_file()
+
+        self.file.write(RECORD.pack(int(time.time() * 1000), session, kind, LANGUAGES.index(language), length, mode,
+                                    (date - SCHEDULE_EPOCH).days, row, col, value, self.encode(language, letters)))
+        self.size += RECORD.size
+        # keystrokes stay buffered; everything up to a guess is written out with it
+        if kind >= GUESS:
+            self.file.flush()
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def record_dtype(version=VERSION):
+    """
+    Returns the numpy dtype matching RECORD, or RECORD_V1 for version 1.
+    """
+    import numpy as np
+    game = [("length", "u1"), ("mode", "u1")] if version > 1 else []
+    return np.dtype([("time_ms", "<u8"), ("session", "<u4"), ("kind", "u1"), ("language", "u1")] + game +
+                    [("day", "<i2"), ("row", "u1"), ("col", "u1"), ("value", "<u2"),
+                     ("letters", "u1", (MAX_LETTERS,))])
+
+
+def log_files(paths):
+    """
+    Expands folders into the log files they contain, oldest first.
+
+    Parameters:
+    - paths: Log files and folders.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files += sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith(".wlog"))
+        else:
+            files.append(path)
+    return files
+
+
+def read_chunks(path, chunk_records=CHUNK_RECORDS):
+    """
+    Yields the records of a log file as numpy structured arrays of at most chunk_records records.
+    Records of version 1 files are copied into the current layout with length and mode zero.
+
+    Parameters:
+    - path: Path to the log file.
+    - chunk_records: Records per chunk.
+    """
+    import numpy as np
+
+    with open(path, "rb") as f:
+        header = f.read(HEADER.size)
+    if len(header) < HEADER.size:
+        return
+    magic, version, record_size = HEADER.unpack(header)
+    record = {1: RECORD_V1, VERSION: RECORD}.get(version)
+    if magic != MAGIC or record is None or record_size != record.size:
+        raise ValueError(f"{path}: not an event log of version 1 to {VERSION}")
+
+    count = (os.path.getsize(path) - HEADER.size) // record.size
+    if not count:
+        return
+    records = np.memmap(path, dtype=record_dtype(version), mode="r", offset=HEADER.size, shape=(count,))
+    for start in range(0, count, chunk_records):
+        chunk = records[start:start + chunk_records]
+        if version < VERSION:
+            upgraded = np.zeros(len(chunk), dtype=record_dtype())
+            for name in chunk.dtype.names:
+                upgraded[name] = chunk[name]
+            chunk = upgraded
+        yield chunk
+
+
+def decode_letters(language, packed):
+    """
+    Decodes letters packed into a little-endian int by the reader.
+
+    Parameters:
+    - language: Language name as a string.
+    - packed: The letters' stored codes as an int.
+    """
+    codec = language_codec(language)
+    return "".join(codec[code - 1] if code <= len(codec) else "?"
+                   for code in packed.to_bytes(MAX_LETTERS, "little") if code)
+
+
+def analyze(paths, chunk_records=CHUNK_RECORDS):
+    """
+    Aggregates event logs in one pass.
+
+    Parameters:
+    - paths: Log files and folders.
+    - chunk_records: Records per chunk; bounds the memory used.
+
+    Returns:
+    - A report dictionary with the guess distribution per language, game mode and date, the most
+      common openers per language and game mode, and the invalid-word rate per language. Game modes
+      are named by mode_name.
+    """
+    import numpy as np
+
+    start = time.perf_counter()
+    files = log_files(paths)
+    records = 0
+    kinds = Counter()
+    outcomes = Counter()  # (language, length and mode, day, guesses, won) -> games
+    openers = Counter()  # (language, length and mode, packed letters) -> times
+    submissions = Counter()  # language -> scored or rejected submissions
+    invalid_words = Counter()  # language -> submissions rejected as not in the word list
+    invalid_word_value = REJECTIONS.index(INVALID_WORD) + 1
+
+    for path in files:
+        for chunk in read_chunks(path, chunk_records):
+            records += len(chunk)
+            kind = np.asarray(chunk["kind"])
+            language = np.asarray(chunk["language"]).astype(np.int64)
+            # language, word length and mode in one int, to group by with np.unique
+            group = (language << 16) | (chunk["length"].astype(np.int64) << 8) | chunk["mode"]
+            for k, n in enumerate(np.bincount(kind)):
+                if n:
+                    kinds[k] += int(n)
+
+            ended = kind == OUTCOME
+            if ended.any():
+                key = (((group[ended] << 16) | (chunk["day"][ended].astype(np.int64) + 32768)) << 9
+                       | (chunk["row"][ended].astype(np.int64) << 1) | (chunk["value"][ended] > 0))
+                for k, n in zip(*np.unique(key, return_counts=True)):
+                    k = int(k)
+                    outcomes[k >> 41, (k >> 25) & 0xFFFF, ((k >> 9) & 0xFFFF) - 32768, (k >> 1) & 0xFF, k & 1] += int(n)
+
+            opened = (kind == GUESS) & (chunk["row"] == 0)
+            if opened.any():
+                packed = np.ascontiguousarray(chunk["letters"][opened]).view("<u8").ravel()
+                for g in np.unique(group[opened]):
+                    for k, n in zip(*np.unique(packed[group[opened] == g], return_counts=True)):
+                        openers[int(g) >> 16, int(g) & 0xFFFF, int(k)] += int(n)
+
+            submitted = (kind == GUESS) | (kind == REJECTED)
+            for lang, n in enumerate(np.bincount(language[submitted])):
+                submissions[lang] += int(n)
+            invalid = (kind == REJECTED) & (chunk["value"] == invalid_word_value)
+            for lang, n in enumerate(np.bincount(language[invalid])):
+                invalid_words[lang] += int(n)
+
+    elapsed = time.perf_counter() - start
+
+    distribution = {}
+    for (lang, game, day, guesses, won), n in sorted(outcomes.items()):
+        name = LANGUAGES[lang] if lang < len(LANGUAGES) else str(lang)
+        date = (SCHEDULE_EPOCH + datetime.timedelta(days=day)).isoformat()
+        games = distribution.setdefault(name, {}).setdefault(mode_name(game >> 8, game & 0xFF), {}).setdefault(date, {})
+        key = str(guesses) if won else "X"
+        games[key] = games.get(key, 0) + n
+
+    top_openers = {}
+    for (lang, game, packed), n in openers.most_common():
+        if lang >= len(LANGUAGES):
+            continue
+        top = top_openers.setdefault(LANGUAGES[lang], {}).setdefault(mode_name(game >> 8, game & 0xFF), [])
+        if len(top) < 10:
+            top.append([decode_letters(LANGUAGES[lang], packed), n])
+
+    invalid_rates = {LANGUAGES[lang]: {"submissions": n, "invalid_words": invalid_words[lang],
+                                       "rate": invalid_words[lang] / n}
+                     for lang, n in sorted(submissions.items()) if n and lang < len(LANGUAGES)}
+
+    return {
+        "files": len(files),
+        "records": records,
+        "seconds": elapsed,
+        "events": {KIND_NAMES.get(k, str(k)): n for k, n in sorted(kinds.items()) if k},
+        "guess_distribution": distribution,
+        "openers": top_openers,
+        "invalid_word_rate": invalid_rates,
+    }
+
+
+def print_report(report):
+    rate = report["records"] / report["seconds"] if report["seconds"] else 0.0
+    print(f"{report['records']} records in {report['files']} files, {report['seconds']:.2f}s "
+          f"({rate / 1e6:.1f}M records/s)")
+    print("events: " + ", ".join(f"{name} {n}" for name, n in report["events"].items()))
+
+    print("\ninvalid-word rate:")
+    for language, stats in report["invalid_word_rate"].items():
+        print(f"  {language}: {stats['rate']:.1%} ({stats['invalid_words']} of {stats['submissions']} submissions)")
+
+    print("\nmost common openers:")
+    for language, modes in report["openers"].items():
+        for mode, top in modes.items():
+            print(f"  {language} {mode}: " + ", ".join(f"{word} {n}" for word, n in top))
+
+    print("\nguess distribution:")
+    for language, modes in report["guess_distribution"].items():
+        for mode, dates in modes.items():
+            for date, games in dates.items():
+                order = sorted((k for k in games if k != "X"), key=int) + (["X"] if "X" in games else [])
+                print(f"  {language} {mode} {date}: " + " ".join(f"{k}:{games[k]}" for k in order)
+                      + f" ({sum(games.values())} games)")
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Aggregate game event logs")
+    parser.add_argument("paths", nargs="*", default=[log_folder], help="log files or folders")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = analyze(args.paths)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
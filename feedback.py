@@ -0,0 +1,228 @@
+"""
+All-pairs feedback matrix: the pattern code (see engine.pattern_code) of every guess against every
+answer of a dictionary, computed with numpy over the compiled dictionary's encoded words and
+cached on disk as a memory-mapped .npy file keyed by the hash of the dictionary file. Building the
+matrix of a new version of a dictionary deletes the caches of its earlier versions, including those
+named before dictionaries were split by word length.
+
+Build the caches ahead of time with:
+
+    python feedback.py [--length N] [language ...]
+
+Codes of words up to five letters fit in a uint8; longer words use uint16 (3^8 = 6561 codes).
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+import numpy as np
+
+from dictionary import load_dictionary
+from engine import COLS, lang_files
+
+cache_folder = "dictionaries/cache"
+
+# Number of (guess, answer) pairs scored at once while building a matrix; bounds peak memory.
+CHUNK_PAIRS = 1 << 22
+
+_matrices = {}
+
+
+def encode_words(words, alphabet):
+    """
+    Encodes words as a 2D array of letter indexes.
+
+    Parameters:
+    - words: List of words of equal length.
+    - alphabet: String with every letter used by the words; a letter's code is its index.
+
+    Returns:
+    - uint8 array of shape (len(words), word length).
+    """
+    codes = {ch: i for i, ch in enumerate(alphabet)}
+    length = len(words[0]) if words else 0
+    flat = [codes[ch] for word in words for ch in word]
+    return np.array(flat, dtype=np.uint8).reshape(len(words), length)
+
+
+def pattern_dtype(length):
+    """
+    Returns the smallest unsigned numpy dtype that holds every pattern code of a word length.
+
+    Parameters:
+    - length: Word length.
+    """
+    return np.uint8 if 3 ** length <= 256 else np.uint16
+
+
+def compute_patterns(guesses, answers):
+    """
+    Scores every guess against every answer, with the same duplicate-letter rules as
+    engine.score_guess.
+
+    Parameters:
+    - guesses: uint8 array of shape (g, length) from encode_words.
+    - answers: uint8 array of shape (a, length) from encode_words, with the same alphabet.
+
+    Returns:
+    - Array of shape (g, a) and dtype pattern_dtype(length) holding pattern codes.
+    """
+    length = guesses.shape[1]
+    dtype = pattern_dtype(length)
+
+    # eq[i][j][g, a]: letter i of guess g equals letter j of answer a
+    eq = [[guesses[:, i, None] == answers[None, :, j] for j in range(length)] for i in range(length)]
+    green = [eq[i][i] for i in range(length)]
+
+    codes = np.zeros((guesses.shape[0], answers.shape[0]), dtype=dtype)
+    yellow = []
+    for i in range(length):
+        # copies of guess letter i left in the answer once exact matches are taken...
+        available = np.zeros(codes.shape, dtype=np.uint8)
+        for j in range(length):
+            available += eq[i][j] & ~green[j]
+        # ...minus the ones already claimed by earlier misplaced copies of the same letter
+        for k in range(i):
+            same = guesses[:, k] == guesses[:, i]
+            available -= yellow[k] & same[:, None]
+        yellow.append(~green[i] & (available > 0))
+
+        weight = 3 ** i
+        codes += green[i] * dtype(2 * weight) + yellow[i] * dtype(weight)
+    return codes
+
+
+def cache_path(language, length=COLS):
+    """
+    Returns the path of the cached feedback matrix for a language's current dictionary of one word length.
+
+    Parameters:
+    - language: Language name as a string.
+    - length: Word length.
+    """
+    dictionary = load_dictionary(language, length)
+    name = os.path.splitext(os.path.basename(dictionary.path))[0]
+    return os.path.join(cache_folder, f"{name}-{dictionary.digest}.npy")
+
+
+def build_matrix(encoded, path):
+    """
+    Computes the feedback matrix of a word list chunk by chunk straight into a .npy file.
+
+    Parameters:
+    - encoded: uint8 array of shape (n, length) of encoded words, used both as guesses and answers.
+    - path: Destination path. The file is written under a temporary name and then renamed.
+    """
+    n = encoded.shape[0]
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    out = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=pattern_dtype(encoded.shape[1]), shape=(n, n))
+
+    rows_per_chunk = max(1, CHUNK_PAIRS // max(n, 1))
+    for start in range(0, n, rows_per_chunk):
+        stop = min(start + rows_per_chunk, n)
+        out[start:stop] = compute_patterns(encoded[start:stop], encoded)
+
+    out.flush()
+    del out
+    os.replace(tmp_path, path)
+    remove_stale_matrices(path)
+
+
+def remove_stale_matrices(path):
+    """
+    Deletes the cached matrices of earlier versions of a dictionary, which can never match again: those
+    of the same word length, "<name>-<length>-<digest>.npy", and those of the language from before
+    dictionaries were split by word length, "<name>-<digest>.npy".
+
+    Parameters:
+    - path: Path of the current cache file.
+    """
+    folder = os.path.dirname(path) or "."
+    name, length = os.path.basename(path).rsplit("-", 1)[0].rsplit("-", 1)
+    stale = re.compile(rf"{re.escape(name)}(-{length})?-[0-9a-f]+\.npy")
+    for file_name in os.listdir(folder):
+        old_path = os.path.join(folder, file_name)
+        if stale.fullmatch(file_name) and old_path != path:
+            try:
+                os.remove(old_path)
+            except OSError:
+                pass  # still mapped by another process on some systems; removed after the next build
+
+
+class FeedbackMatrix:
+    """
+    Feedback of every word of a dictionary against every other, backed by a read-only memory map.
+    """
+
+    def __init__(self, words, patterns, path=None):
+        """
+        Parameters:
+        - words: List of words, in matrix order.
+        - patterns: Array of shape (len(words), len(words)); rows are guesses, columns answers.
+        - path: The cache file the patterns are mapped from, if any.
+        """
+        self.path = path
+        self.words = words
+        self.index = {word: i for i, word in enumerate(words)}
+        self.patterns = patterns
+
+    def pattern(self, guess, answer):
+        """
+        Returns the pattern code of a guess against an answer.
+
+        Parameters:
+        - guess: The guessed word as an uppercase string.
+        - answer: The answer as an uppercase string.
+        """
+        return int(self.patterns[self.index[guess], self.index[answer]])
+
+
+def load_feedback_matrix(language, length=COLS):
+    """
+    Loads the feedback matrix for a language's words of one length, building and caching it first
+    if the dictionary changed since the last build. Matrices are shared within a process.
+
+    Parameters:
+    - language: Language name as a string.
+    - length: Word length.
+
+    Returns:
+    - A FeedbackMatrix.
+    """
+    path = cache_path(language, length)
+    matrix = _matrices.get((language, length))
+    if matrix is not None and matrix.path == path:
+        return matrix
+
+    dictionary = load_dictionary(language, length)
+    if not os.path.exists(path):
+        build_matrix(dictionary.encoded(), path)
+
+    matrix = FeedbackMatrix(dictionary.words(), np.load(path, mmap_mode="r"), path)
+    _matrices[language, length] = matrix
+    return matrix
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Build the cached feedback matrices")
+    parser.add_argument("--length", type=int, default=COLS, help="word length")
+    parser.add_argument("languages", nargs="*", default=list(lang_files))
+    args = parser.parse_args(argv)
+
+    for language in args.languages:
+        path = cache_path(language, args.length)
+        if os.path.exists(path):
+            print(f"{language}: up to date ({path})")
+            continue
+
+        start = time.perf_counter()
+        build_matrix(load_dictionary(language, args.length).encoded(), path)
+        print(f"{language}: built {path} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,302 @@
+"""
+Streaming ingest of large word lists: turns a raw source (a full-language corpus or frequency list
+with millions of entries) into a language's word list and compiled dictionaries in one pass and
+with bounded memory.
+
+    python ingest.py LANGUAGE SOURCE [--run-words N]
+
+SOURCE is a text file, optionally gzip-compressed, or - for stdin, with one entry per line. Only
+the first field of a line is used (fields are separated by tabs or commas), so word/count lists can
+be read as they are. Every entry is:
+
+1. normalised to NFC and uppercased, so a letter typed as a base letter plus a combining mark
+   matches the precomposed letter of the alphabet;
+2. dropped if its length is not in WORD_LENGTHS or if it has characters outside the language's
+   alphabet; these are counted, and the offending characters are reported, so stray characters
+   show up here instead of as "Invalid Letters" during a game;
+3. encoded as a record of alphabet indexes and collected in a set of at most --run-words entries,
+   which is sorted and written to a temporary run file per word length when it fills up.
+
+The runs are then merged per length (an external merge sort), which removes the duplicates across
+runs and streams the words into the compiled partitions and into the new CSV at the same time. The
+CSV replaces the language's word list, and the compiled files carry its digest, so the game uses
+them without rebuilding. A summary with the counts and the throughput of each stage is printed at
+the end.
+"""
+import argparse
+import gzip
+import hashlib
+import heapq
+import os
+import sys
+import tempfile
+import time
+import unicodedata
+from collections import Counter
+
+from dictionary import HEADER, WORD_LENGTHS, compiled_path, language_codec, write_compiled
+from engine import lang_files
+
+RUN_WORDS = 1_000_000
+READ_BUFFER = 1 << 20
+CSV_LINES = 4096  # words decoded before they are written to the CSV
+
+
+def open_source(source):
+    """
+    Opens a word source for reading text.
+
+    Parameters:
+    - source: Path to a text or .gz file, or "-" for stdin.
+    """
+    if source == "-":
+        return open(sys.stdin.fileno(), encoding="utf-8", errors="replace", closefd=False)
+    if source.endswith(".gz"):
+        return gzip.open(source, "rt", encoding="utf-8", errors="replace")
+    return open(source, encoding="utf-8", errors="replace", buffering=READ_BUFFER)
+
+
+def read_run(path, length):
+    """
+    Yields the records of a run file in order.
+
+    Parameters:
+    - path: Path to the run file.
+    - length: Record size in bytes.
+    """
+    block = length * (READ_BUFFER // length)
+    with open(path, "rb") as f:
+        while True:
+            data = f.read(block)
+            if not data:
+                return
+            for start in range(0, len(data), length):
+                yield data[start:start + length]
+
+
+def unique(records):
+    """
+    Drops consecutive duplicates from sorted records.
+    """
+    previous = None
+    for record in records:
+        if record != previous:
+            yield record
+            previous = record
+
+
+class Ingest:
+    """
+    State of one ingest: the encoding tables, the pending run per word length and the statistics.
+    """
+
+    def __init__(self, language, run_words=RUN_WORDS, folder=None):
+        """
+        Parameters:
+        - language: Language name as a string.
+        - run_words: Words collected in memory before a run is written to disk.
+        - folder: Folder for the temporary run files.
+        """
+        self.language = language
+        self.run_words = run_words
+        self.folder = folder
+        alphabet = language_codec(language)
+        # str.translate encodes a word as alphabet indexes, or removes the alphabet to leave any stray characters
+        self.encode_table = {ord(ch): i for i, ch in enumerate(alphabet)}
+        self.strip_table = dict.fromkeys(map(ord, alphabet))
+        self.decode_table = {i: ch for i, ch in enumerate(alphabet)}
+
+        self.pending = {length: set() for length in WORD_LENGTHS}
+        self.pending_words = 0
+        self.runs = {length: [] for length in WORD_LENGTHS}
+
+        self.lines = 0
+        self.bytes = 0
+        self.kept = 0
+        self.wrong_length = 0
+        self.invalid = 0
+        self.stray = Counter()  # character -> entries it made invalid
+        self.examples = {}  # character -> the first entry it was found in
+        self.written = {}  # length -> unique words
+        self.timings = {}
+
+    def add(self, line):
+        """
+        Normalises, filters and collects one line of the source.
+
+        Parameters:
+        - line: The line as read, with its line break.
+        """
+        self.lines += 1
+        self.bytes += len(line)
+        word = line.split("\t", 1)[0].split(",", 1)[0].strip()
+        if not word:
+            return
+        word = unicodedata.normalize("NFC", word.upper())
+
+        pending = self.pending.get(len(word))
+        if pending is None:
+            self.wrong_length += 1
+            return
+        stray = word.translate(self.strip_table)
+        if stray:
+            self.invalid += 1
+            for ch in set(stray):
+                self.stray[ch] += 1
+                self.examples.setdefault(ch, word)
+            return
+
+        self.kept += 1
+        pending.add(word.translate(self.encode_table).encode("latin-1"))
+        self.pending_words += 1
+        if self.pending_words >= self.run_words:
+            self.flush_runs()
+
+    def flush_runs(self):
+        """
+        Sorts the collected records and writes them to one run file per word length.
+        """
+        for length, pending in self.pending.items():
+            if not pending:
+                continue
+            fd, path = tempfile.mkstemp(prefix=f"ingest-{length}-", suffix=".run", dir=self.folder)
+            with os.fdopen(fd, "wb") as f:
+                f.write(b"".join(sorted(pending)))
+            self.runs[length].append(path)
+            pending.clear()
+        self.pending_words = 0
+
+    def merged(self, length):
+        """
+        Yields the unique records of one word length in ascending order, from the runs and whatever
+        is still in memory.
+
+        Parameters:
+        - length: Word length.
+        """
+        runs = [read_run(path, length) for path in self.runs[length]]
+        runs.append(iter(sorted(self.pending[length])))
+        return unique(heapq.merge(*runs))
+
+    def write_partition(self, length, csv_file, digest):
+        """
+        Merges the runs of one word length into its compiled partition and appends the words to the
+        CSV being written.
+
+        Parameters:
+        - length: Word length.
+        - csv_file: The CSV, open for writing bytes.
+        - digest: hashlib object that is fed everything written to the CSV.
+
+        Returns:
+        - Path of the temporary compiled file.
+        """
+        lines = []
+
+        def write_lines():
+            data = "".join(lines).encode("utf-8")
+            csv_file.write(data)
+            digest.update(data)
+            lines.clear()
+
+        def records():
+            for record in self.merged(length):
+                lines.append(record.decode("latin-1").translate(self.decode_table) + "\n")
+                if len(lines) >= CSV_LINES:
+                    write_lines()
+                yield record
+
+        # the digest of the CSV is not known until every length is written; write patches it in
+        tmp_path, self.written[length] = write_compiled(compiled_path(self.language, length), self.language, length,
+                                                        records(), b"0" * 16)
+        write_lines()
+        return tmp_path
+
+    def write(self, csv_path):
+        """
+        Merges the runs into the new CSV and the compiled partitions. The CSV is replaced first, so
+        an interrupted ingest leaves files that the game rebuilds from the new list.
+
+        Parameters:
+        - csv_path: Path of the language's word list.
+        """
+        digest = hashlib.sha256()
+        csv_tmp = csv_path + ".tmp"
+        partitions = {}
+        try:
+            with open(csv_tmp, "wb") as csv_file:
+                for length in WORD_LENGTHS:
+                    partitions[length] = self.write_partition(length, csv_file, digest)
+
+            # the source digest is the last field of the header
+            source_digest = digest.hexdigest()[:16].encode("ascii")
+            for tmp_path in partitions.values():
+                with open(tmp_path, "r+b") as f:
+                    f.seek(HEADER.size - len(source_digest))
+                    f.write(source_digest)
+
+            os.replace(csv_tmp, csv_path)
+            for length, tmp_path in partitions.items():
+                os.replace(tmp_path, compiled_path(self.language, length))
+        finally:
+            for paths in self.runs.values():
+                for path in paths:
+                    os.remove(path)
+            for path in [csv_tmp, *partitions.values()]:
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def run(self, source, csv_path):
+        """
+        Ingests a source into a language's word list and compiled dictionaries.
+
+        Parameters:
+        - source: See open_source.
+        - csv_path: Path of the word list to write.
+        """
+        start = time.perf_counter()
+        with open_source(source) as f:
+            for line in f:
+                self.add(line)
+        self.timings["read, filter and sort runs"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        self.write(csv_path)
+        self.timings["merge and write"] = time.perf_counter() - start
+
+    def report(self):
+        """
+        Returns a human-readable summary of the ingest.
+        """
+        total = sum(self.timings.values()) or 1e-9
+        unique_words = sum(self.written.values())
+        lines = [f"{self.language}: {self.lines} entries ({self.bytes / 1e6:.1f}M characters) in {total:.2f}s, "
+                 f"{self.lines / total / 1e3:.0f}k entries/s, {self.bytes / total / 1e6:.1f}M characters/s"]
+        for stage, seconds in self.timings.items():
+            lines.append(f"  {stage}: {seconds:.2f}s")
+        lines.append(f"  kept {self.kept}, {unique_words} unique after removing {self.kept - unique_words} duplicates "
+                     f"({sum(len(paths) for paths in self.runs.values())} runs)")
+        lines.append("  per length: " + ", ".join(f"{length}: {n}" for length, n in self.written.items()))
+        lines.append(f"  dropped {self.wrong_length} of other lengths and {self.invalid} with characters "
+                     f"outside the alphabet")
+        for ch, n in self.stray.most_common(20):
+            lines.append(f"    {ch!r} (U+{ord(ch):04X} {unicodedata.name(ch, '?')}): {n}, e.g. {self.examples[ch]}")
+        return "\n".join(lines)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Ingest a large word list into a language's dictionaries")
+    parser.add_argument("language", choices=list(lang_files))
+    parser.add_argument("source", help="text or .gz file with one entry per line, or - for stdin")
+    parser.add_argument("--run-words", type=int, default=RUN_WORDS,
+                        help="words sorted in memory at a time; bounds the memory used")
+    args = parser.parse_args(argv)
+
+    ingest = Ingest(args.language, args.run_words)
+    ingest.run(args.source, lang_files[args.language])
+    print(ingest.report())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,22 +1,78 @@
+import time
+
+# (phase, time) of every finished startup phase; the first entry is taken before anything else is imported
+startup_marks = [("start", time.perf_counter())]
+
+import argparse
 import customtkinter as ctk
 import datetime
+import engine
+import eventlog
+import itertools
+import metrics
+import openings
+import queue
 import random
+import snapshot
+import sys
+import threading
+from collections import deque, namedtuple
+from types import MappingProxyType
+from animation import FLIP_FRAMES, FLIP_STAGGER_MS, SHAKE_OFFSETS, Animator, flip_colors
+from render import CanvasTile, Renderer
+from toast import WARNING_MS, ToastPool
+from candidates import load_candidate_index
+from dawg import load_dawg
+from dictionary import available_lengths, load_dictionary
+from engine import ROWS, COLS, rows_for_boards
+from multiboard import BOARD_COUNTS, MultiGame
+
+
+def mark(phase):
+    """
+    Records that a startup phase has finished. Safe to call from the loader thread.
+
+    Parameters:
+    - phase: Name of the phase.
+    """
+    startup_marks.append((phase, time.perf_counter()))
+
+
+mark("imports")
+
 app = ctk.CTk()
 app.title("Wordle")
 app.geometry("420x552")
 app.minsize(420, 592)
+mark("root window")
 
-ROWS = 6
-COLS = 5
+fonts = {}
+
+
+def font(size, weight="normal"):
+    """
+    Returns the shared CTkFont of a size and weight, creating it on first use.
+
+    Parameters:
+    - size: Font size in points.
+    - weight: "normal" or "bold".
+
+    Returns:
+    - The CTkFont.
+    """
+    key = (size, weight)
+    f = fonts.get(key)
+    if f is None:
+        f = fonts[key] = ctk.CTkFont(family="Helvetica Neue", size=size, weight=weight)
+    return f
 
-FONT_13 = ctk.CTkFont(family="Helvetica Neue", size=13)
-FONT_15 = ctk.CTkFont(family="Helvetica Neue", size=15)
-FONT_16_BOLD = ctk.CTkFont(family="Helvetica Neue", size=16, weight="bold")
-FONT_18_BOLD = ctk.CTkFont(family="Helvetica Neue", size=18, weight="bold")
-FONT_20_BOLD = ctk.CTkFont(family="Helvetica Neue", size=20, weight="bold")
-FONT_30_BOLD = ctk.CTkFont(family="Helvetica Neue", size=30, weight="bold")
 
 current_language = "English"
+puzzle_date = None  # None plays today's word; a datetime.date plays that day's puzzle from the archive
+word_length = COLS
+hard_mode = False  # every guess must use all revealed hints
+adversarial = False  # the answer is picked against each guess instead of being fixed
+board_count = 1  # number of boards played at once
 UI_STRINGS = {
     "English": {
         "language_title": "Language:",
@@ -63,6 +119,36 @@ UI_STRINGS = {
         "game_over_msg": ["The word was", ".\nGreat effort! Try again tomorrow!"],
         "quit_title": "Quit Game?",
         "quit_msg": "Are you sure you want to quit?",
+        "hint_title": "Hint",
+        "hint_msg": "Try one of these words:",
+        "hint_not_ready_msg": "Hints are still being prepared. Try again in a moment.",
+        "hint_failed_msg": "Hints could not be prepared for this dictionary.",
+        "load_error_title": "Loading Failed",
+        "load_error_msg": "The game could not be loaded. You can keep playing the previous one.",
+        "remaining_title": "Words left:",
+        "archive_title": "Archive",
+        "archive_msg": "Enter the date of the puzzle to play (YYYY-MM-DD):",
+        "invalid_date_title": "Invalid Date",
+        "invalid_date_msg": "Please enter today's or a past date as YYYY-MM-DD.",
+        "change_date_title": "Change Puzzle?",
+        "change_date_msg": ["You have already submitted", ". Opening another day's puzzle will reset the game. Continue?"],
+        "change_length_title": "Change Word Length?",
+        "change_length_msg": ["You have already submitted", ". Changing the word length will reset the game. Continue?"],
+        "hard_mode_label": "Hard mode",
+        "hard_mode_title": "Hard Mode",
+        "hard_mode_fixed_msg": ["Letter", "must be"],
+        "hard_mode_present_msg": "The guess must contain",
+        "hard_mode_excluded_msg": "The guess must not contain",
+        "change_hard_mode_title": "Change Hard Mode?",
+        "change_hard_mode_msg": ["You have already submitted", ". Changing hard mode will reset the game. Continue?"],
+        "boards_title": "Boards:",
+        "change_boards_title": "Change Number of Boards?",
+        "change_boards_msg": ["You have already submitted",
+                              ". Changing the number of boards will reset the game. Continue?"],
+        "adversarial_label": "Absurdle",
+        "change_adversarial_title": "Change Absurdle Mode?",
+        "change_adversarial_msg": ["You have already submitted",
+                                   ". Changing Absurdle mode will reset the game. Continue?"],
     },
     "Norsk": {
         "language_title": "Språk:",
@@ -110,6 +196,39 @@ UI_STRINGS = {
         "game_over_msg": ["Ordet var", ".\nGod innsats! Prøv igjen i morgen!"],
         "quit_title": "Avslutte spillet?",
         "quit_msg": "Er du sikker på at du vil avslutte?",
+        "hint_title": "Hint",
+        "hint_msg": "Prøv et av disse ordene:",
+        "hint_not_ready_msg": "Hintene forberedes fortsatt. Prøv igjen om litt.",
+        "hint_failed_msg": "Hint kunne ikke forberedes for denne ordlisten.",
+        "load_error_title": "Lasting mislyktes",
+        "load_error_msg": "Spillet kunne ikke lastes. Du kan fortsette å spille det forrige.",
+        "remaining_title": "Ord igjen:",
+        "archive_title": "Arkiv",
+        "archive_msg": "Skriv inn datoen for oppgaven du vil spille (ÅÅÅÅ-MM-DD):",
+        "invalid_date_title": "Ugyldig dato",
+        "invalid_date_msg": "Vennligst skriv inn dagens eller en tidligere dato som ÅÅÅÅ-MM-DD.",
+        "change_date_title": "Bytte oppgave?",
+        "change_date_msg": ["Du har allerede sendt inn",
+                            ". Å åpne en annen dags oppgave vil tilbakestille spillet. Vil du fortsette?"],
+        "change_length_title": "Endre ordlengde?",
+        "change_length_msg": ["Du har allerede sendt inn",
+                              ". Å endre ordlengden vil tilbakestille spillet. Vil du fortsette?"],
+        "hard_mode_label": "Vanskelig modus",
+        "hard_mode_title": "Vanskelig modus",
+        "hard_mode_fixed_msg": ["Bokstav", "må være"],
+        "hard_mode_present_msg": "Ordet må inneholde",
+        "hard_mode_excluded_msg": "Ordet kan ikke inneholde",
+        "change_hard_mode_title": "Endre vanskelig modus?",
+        "change_hard_mode_msg": ["Du har allerede sendt inn",
+                                 ". Å endre vanskelig modus vil tilbakestille spillet. Vil du fortsette?"],
+        "boards_title": "Brett:",
+        "change_boards_title": "Endre antall brett?",
+        "change_boards_msg": ["Du har allerede sendt inn",
+                              ". Å endre antall brett vil tilbakestille spillet. Vil du fortsette?"],
+        "adversarial_label": "Absurdle",
+        "change_adversarial_title": "Endre Absurdle-modus?",
+        "change_adversarial_msg": ["Du har allerede sendt inn",
+                                   ". Å endre Absurdle-modus vil tilbakestille spillet. Vil du fortsette?"],
     },
     "Українська": {
         "language_title": "Мова:",
@@ -156,6 +275,36 @@ UI_STRINGS = {
         "game_over_msg": ["Слово дня -", ".\nХороша спроба! Спробуйте знову завтра!"],
         "quit_title": "Вийти з гри?",
         "quit_msg": "Ви впевнені, що хочете вийти з гри?",
+        "hint_title": "Підказка",
+        "hint_msg": "Спробуйте одне з цих слів:",
+        "hint_not_ready_msg": "Підказки ще готуються. Спробуйте за мить.",
+        "hint_failed_msg": "Не вдалося підготувати підказки для цього словника.",
+        "load_error_title": "Не вдалося завантажити",
+        "load_error_msg": "Гру не вдалося завантажити. Ви можете продовжити попередню.",
+        "remaining_title": "Залишилось слів:",
+        "archive_title": "Архів",
+        "archive_msg": "Введіть дату головоломки (РРРР-ММ-ДД):",
+        "invalid_date_title": "Недійсна дата",
+        "invalid_date_msg": "Будь ласка, введіть сьогоднішню або минулу дату у форматі РРРР-ММ-ДД.",
+        "change_date_title": "Змінити головоломку?",
+        "change_date_msg": ["Ви вже відправили", ". Відкриття головоломки іншого дня скине гру. Продовжити?"],
+        "change_length_title": "Змінити довжину слова?",
+        "change_length_msg": ["Ви вже відправили", ". Зміна довжини слова скине гру. Продовжити?"],
+        "hard_mode_label": "Складний режим",
+        "hard_mode_title": "Складний режим",
+        "hard_mode_fixed_msg": ["Літера", "має бути"],
+        "hard_mode_present_msg": "Слово має містити",
+        "hard_mode_excluded_msg": "Слово не може містити",
+        "change_hard_mode_title": "Змінити складний режим?",
+        "change_hard_mode_msg": ["Ви вже відправили", ". Зміна складного режиму скине гру. Продовжити?"],
+        "boards_title": "Дошки:",
+        "change_boards_title": "Змінити кількість дошок?",
+        "change_boards_msg": ["Ви вже відправили",
+                              ". Зміна кількості дошок скине гру. Продовжити?"],
+        "adversarial_label": "Absurdle",
+        "change_adversarial_title": "Змінити режим Absurdle?",
+        "change_adversarial_msg": ["Ви вже відправили",
+                                   ". Зміна режиму Absurdle скине гру. Продовжити?"],
     }
 }
 
@@ -290,6 +439,10 @@ def refresh_ui_language():
     """
     lang_label.configure(text=t("language_title"))
     theme_label.configure(text=t("theme_title"))
+    hard_box.configure(text=t("hard_mode_label"))
+    adversarial_box.configure(text=t("adversarial_label"))
+    boards_label.configure(text=t("boards_title"))
+    update_remaining()
 
     labels = list(UI_STRINGS[current_language]["themes"].values())
     theme_box.configure(values=labels)
@@ -298,16 +451,111 @@ def refresh_ui_language():
     theme_box.set(UI_STRINGS[current_language]["themes"][current_theme])
 
 
+def update_remaining():
+    """
+    Updates the label showing how many words are still consistent with the guesses so far.
+    """
+    count = "…" if game is None else game.remaining_count()
+    remaining_label.configure(text=f"{t('remaining_title')} {count}")
+
+
+# A compiled theme. Plain colours are fields; the per-state tables map a tile state
+# (None, "wrong", "misplaced", "correct") straight to its colour.
+Palette = namedtuple("Palette", [
+    "base", "app_bg", "board_bg", "board_tile", "text", "button", "button_hover", "dropdown",
+    "wrong", "misplaced", "correct", "key", "hover_key", "green", "green_hover", "red", "red_hover",
+    "tile_fg", "flip_fg", "key_fg", "state_text", "message_buttons",
+])
+
+
+def resolve_text_color(theme_data, state):
+    """
+    Resolves the text color of a tile or key from a theme's TEXT_OVERRIDE rules.
+
+    Parameters:
+    - theme_data: The merged theme dictionary.
+    - state: The state of the tile ("correct", "misplaced", "wrong") or None if not submitted.
+
+    Returns:
+    - The text color as a hex string.
+    """
+    text = theme_data["TEXT"]
+    override = theme_data.get("TEXT_OVERRIDE", {})
+
+    # typed but not submitted
+    if state is None:
+        typed_override = override.get("typed")
+        if typed_override is None:
+            return text
+        return typed_override
+
+    # submitted tiles
+    submitted_override = override.get("submitted")
+    if submitted_override:
+        if isinstance(submitted_override, dict):  # per-state
+            color = submitted_override.get(state)
+            return text if color is None else color
+        else:
+            return text if submitted_override is None else submitted_override
+
+    # default rules
+    if theme_data["BASE"] == "light":
+        return "#FFFFFF"
+    return text
+
+
+def compile_theme(theme_data):
+    """
+    Compiles a merged theme into an immutable Palette, resolving every per-state color up front.
+
+    Parameters:
+    - theme_data: The merged theme dictionary.
+
+    Returns:
+    - The Palette.
+    """
+    states = (None, "wrong", "misplaced", "correct")
+    state_colors = {"wrong": theme_data["WRONG"], "misplaced": theme_data["MISPLACED"],
+                    "correct": theme_data["CORRECT"]}
+
+    return Palette(
+        base=theme_data["BASE"],
+        app_bg=theme_data["APP_BG"],
+        board_bg=theme_data["BOARD_BG"],
+        board_tile=theme_data["BOARD_TILE"],
+        text=theme_data["TEXT"],
+        button=theme_data["BUTTON"],
+        button_hover=theme_data["BUTTON_HOVER"],
+        dropdown=theme_data["DROPDOWN"],
+        wrong=theme_data["WRONG"],
+        misplaced=theme_data["MISPLACED"],
+        correct=theme_data["CORRECT"],
+        key=theme_data["KEY"],
+        hover_key=theme_data["HOVER_KEY"],
+        green=theme_data["GREEN"],
+        green_hover=theme_data["GREEN_HOVER"],
+        red=theme_data["RED"],
+        red_hover=theme_data["RED_HOVER"],
+        tile_fg=MappingProxyType({state: state_colors.get(state, theme_data["BOARD_TILE"]) for state in states}),
+        # fill colors of every frame of the flip that reveals a tile's state
+        flip_fg=MappingProxyType({state: flip_colors(theme_data["BOARD_TILE"], theme_data["BOARD_BG"], color)
+                                  for state, color in state_colors.items()}),
+        key_fg=MappingProxyType({state: state_colors.get(state, theme_data["KEY"]) for state in states}),
+        state_text=MappingProxyType({state: resolve_text_color(theme_data, state) for state in states}),
+        message_buttons=MappingProxyType(dict(theme_data["MESSAGE_BUTTONS"])),
+    )
+
+
 def build_themes(base_themes, variants):
     """
-    Builds the complete themes dictionary by applying variants to base themes.
+    Builds the complete themes by applying variants to base themes.
 
     Parameters:
     - base_themes: Dictionary of base themes.
     - variants: Dictionary of theme variants.
 
     Returns:
-    - Dictionary of complete themes.
+    - Dictionary of theme name to merged theme dictionary.
     """
     complete_themes = {name: data.copy() for name, data in base_themes.items()}
 
@@ -321,60 +569,88 @@ def build_themes(base_themes, variants):
     return complete_themes
 
 
-themes = build_themes(BASE_THEMES, THEME_VARIANTS)
-current_theme = "Classic Dark"
+def get_palette(name):
+    """
+    Returns the Palette of a theme, compiling it the first time the theme is used.
 
-COLOR_APP_BG = themes[current_theme]["APP_BG"]
-app.configure(fg_color=COLOR_APP_BG)
-COLOR_BOARD_BG = themes[current_theme]["BOARD_BG"]
-COLOR_BOARD_TILE = themes[current_theme]["BOARD_TILE"]
-COLOR_TEXT = themes[current_theme]["TEXT"]
-COLOR_BUTTON = themes[current_theme]["BUTTON"]
-COLOR_BUTTON_HOVER = themes[current_theme]["BUTTON_HOVER"]
-COLOR_DROPDOWN = themes[current_theme]["DROPDOWN"]
-COLOR_WRONG = themes[current_theme]["WRONG"]
-COLOR_MISPLACED = themes[current_theme]["MISPLACED"]
-COLOR_CORRECT = themes[current_theme]["CORRECT"]
-
-COLOR_KEY = themes[current_theme]["KEY"]
-COLOR_HOVER_KEY = themes[current_theme]["HOVER_KEY"]
-
-COLOR_GREEN = themes[current_theme]["GREEN"]
-COLOR_GREEN_HOVER = themes[current_theme]["GREEN_HOVER"]
-COLOR_RED = themes[current_theme]["RED"]
-COLOR_RED_HOVER = themes[current_theme]["RED_HOVER"]
-
-current_row = 0
-current_col = 0
-game_over = False
-
-dict_folder = "dictionaries"
-lang_files = {
-    "English": f"{dict_folder}/english.csv",
-    "Norsk": f"{dict_folder}/norwegian.csv",
-    "Українська": f"{dict_folder}/ukrainian.csv"
-}
-language_alphabets = {
-    "English": set("ABCDEFGHIJKLMNOPQRSTUVWXYZ"),
-    "Norsk": set("ABCDEFGHIJKLMNOPQRSTUVWXYZÆØÅ"),
-    "Українська": set("АБВГҐДЕЄЖЗИІЇЙКЛМНОПРСТУФХЦЧШЩЬЮЯ")
-}
+    Parameters:
+    - name: The theme's name.
+    """
+    compiled = palettes.get(name)
+    if compiled is None:
+        compiled = palettes[name] = compile_theme(themes[name])
+    return compiled
 
-priority = {
-    "wrong": 1,
-    "misplaced": 2,
-    "correct": 3,
-}
-tile_states = [[None for _ in range(COLS)] for _ in range(ROWS)]
 
-tiles = []
-keyboard_window = None
-keyboard_frames = []
+themes = build_themes(BASE_THEMES, THEME_VARIANTS)
+palettes = {}
+current_theme = "Classic Dark"
+# every color lookup goes through this one reference; switching themes replaces it
+palette = get_palette(current_theme)
+app.configure(fg_color=palette.app_bg)
+mark("theme")
+
+game = None  # None while the dictionary for the next game is being loaded
+# (function, argument) of input given while game is None, replayed once the game is ready
+pending_input = []
+# key presses waiting for the next idle tick as (function, arguments), applied in order by drain_input
+input_queue = deque()
+input_scheduled = None  # the after_idle id of the pending drain_input
+# loading happens on a background thread; jobs are (priority, sequence, (kind, language, date))
+load_jobs = queue.PriorityQueue()
+load_results = queue.Queue()
+load_sequence = itertools.count()
+loader_thread = None
+# feedback matrices are built on a thread of their own, so a long build never holds up loading a game;
+# jobs are (language, length)
+hint_jobs = queue.Queue()
+hint_thread = None
+hint_matrices = set()  # (language, length) of the feedback matrices ready for hints
+hint_failures = {}  # (language, length) -> the exception that building its feedback matrix raised
+# hints are ranked on a thread of their own and posted to hint_results as (request, suggestions or exception)
+hint_results = queue.Queue()
+hint_request = None  # (game session, guesses) of the hint being ranked, or None
+pending_game = None  # (language, date, word length, hard mode, adversarial, boards) of the game being loaded
+replaced_game = None  # the game that was current when loading began, played on if the load fails
+polling = False  # whether poll_loader is scheduled
+LOAD_POLL_MS = 15
+PRELOAD_DELAY_MS = 1000
+preloaded = False
+profile_startup = False
+# functions replaced by timing wrappers when the game runs with --metrics
+HOT_PATHS = ("on_key", "drain_input", "type_letter", "delete_letter", "submit_word", "evaluate_guess",
+             "update_keyboard_key", "show_message", "on_theme_change", "on_language_change", "on_length_change")
+INPUT_PATHS = ("on_key", "type_letter", "delete_letter", "submit_word")
+app_metrics = None
+event_log = None  # eventlog.EventLog while the game runs as a program, unless --no-event-log is given
+snapshots = None  # snapshot.SnapshotWriter while the game runs as a program, unless --no-snapshots is given
+game_date = None  # the puzzle date of the current game
+game_session = 0  # random id of the current game in the event log
+
+grid_shape = None  # (boards, rows, columns) of the tiles on screen
+board_canvas = None  # the canvas the tiles are drawn on when there are several boards
+# largest area the boards may take up together, and the gaps between tiles and between boards
+BOARDS_AREA = (700, 560)
+TILE_GAP = 2
+BOARD_GAP = 8
+# board tiles are only ever updated through this renderer, which batches and diffs the changes
+tile_renderer = Renderer(app)
+# flips of scored rows and shakes of rejected words; the frames are drawn through the tile renderer
+animator = Animator(app)
+animate = True  # False draws scored rows at once and does not shake rejected words
+keyboard_layouts = {
+    "English": (["QWERTYUIOP", "ASDFGHJKL", "ZXCVBNM"], 420),
+    "Norsk": (["QWERTYUIOPÅ", "ASDFGHJKLØÆ", "ZXCVBNM"], 458),
+    "Українська": (["ЙЦУКЕНГШЩЗХЇ", "ФІВАПРОЛДЖЄ", "ЯЧСМИТЬБЮ"], 496),
+}
+# on-screen keyboards are built once per layout and then only hidden and shown
+keyboards = {}
+keyboard_visible = False
+# callables invoked as hook(language, "build" or "show", seconds) every time a keyboard is opened
+keyboard_timing_hooks = []
 info_window = None
 info_frames = []
-keyboard_state = {}
-keyboard_buttons = {}
-previous_guesses = set()
+toasts = None  # toast.ToastPool of the in-window messages, created with the first message
 
 # TODO: Translate button labels to current language, add to UI_STRINGS
 MESSAGE_BUTTON_SPECS = {
@@ -384,234 +660,629 @@ MESSAGE_BUTTON_SPECS = {
 }
 
 
-def show_message(title, message, message_type="info"):
+def show_message(title, message, message_type="info", on_answer=None):
     """
-    Shows a message popup.
+    Shows a message over the board without blocking input. Warnings hide themselves after a moment;
+    other messages stay until their button is clicked.
 
     Parameters:
-    - title: Title of the popup window.
+    - title: Title of the message.
     - message: Message text to display.
     - message_type: Type of message. One of "info", "warning", "success", "confirm".
-
-    Returns:
-    - For "confirm" type, returns True if user clicked Yes, False if No.
-    - For other types, returns None.
+    - on_answer: For "confirm", called with True if the user clicked Yes and False if No, or if the
+      question was closed or pushed out by other messages. Not called if a newer question replaced it.
     """
-    win = ctk.CTkToplevel()
-    win.title(title)
-    win.geometry("280x136")
-    win.resizable(False, False)
-    win.configure(fg_color=COLOR_APP_BG)
+    global toasts
 
-    ctk.CTkLabel(win, text=message, text_color=COLOR_TEXT, font=FONT_15, justify="center", wraplength=230,
-                 height=54).pack(pady=(25, 7))
+    if toasts is None:
+        toasts = ToastPool(app, font(15, "bold"), font(15), font(13))
 
+    colors = (palette.app_bg, palette.text, palette.button)
     if message_type == "confirm":
-        result = False
-
-        def set_result(value):
-            nonlocal result
-            result = value
-            win.destroy()
-
-        frame = ctk.CTkFrame(win, fg_color=COLOR_APP_BG)
-        frame.pack()
+        yes_fg, yes_hover = palette.message_buttons["confirm_yes"]
+        no_fg, no_hover = palette.message_buttons["confirm_no"]
+        toasts.show(title, message, colors, [(t("yes"), yes_fg, yes_hover, lambda: on_answer(True)),
+                                             (t("no"), no_fg, no_hover, lambda: on_answer(False))])
+    else:
+        text = UI_STRINGS[current_language]["message_buttons"][message_type]
+        fg, hover = palette.message_buttons[message_type]
+        toasts.show(title, message, colors, [(text, fg, hover, None)],
+                    WARNING_MS if message_type == "warning" else None)
 
-        yes_fg, yes_hover = get_message_button_colors("confirm_yes")
-        no_fg, no_hover = get_message_button_colors("confirm_no")
 
-        ctk.CTkButton(frame, text=t("yes"), width=75, height=30, text_color="#FFFFFF", fg_color=yes_fg,
-                      hover_color=yes_hover, border_color=yes_hover, border_width=2,
-                      font=FONT_13, command=lambda: set_result(True)).pack(side="left", padx=(0, 20))
+def new_game(language, date=None, length=COLS, hard=False, adversarial_answers=False, boards=1):
+    """
+    Starts a new headless game with the word of the day for the specified language, with an
+    adversary instead of a fixed word, or on several boards with words of the day for each.
 
-        ctk.CTkButton(frame, text=t("no"), width=75, height=30, text_color="#FFFFFF", fg_color=no_fg,
-                      hover_color=no_hover, border_color=no_hover, border_width=2, font=FONT_13,
-                      command=lambda: set_result(False)).pack(side="right")
+    Parameters:
+    - language: Language name as a string.
+    - date: The puzzle's date, or None for today.
+    - length: Word length. Falls back to COLS if the language has no words of this length.
+    - hard: Play in hard mode.
+    - adversarial_answers: Let an adversary.Adversary pick the answer to each guess.
+    - boards: Number of boards. Hard mode and adversarial answers only apply to a single board.
 
-        win.grab_set()
-        win.wait_window()
-        return result
+    Returns:
+    - The new engine.Game.
+    """
+    dictionary = load_dictionary(language, length)
+    if not len(dictionary):
+        length = COLS
+        dictionary = load_dictionary(language, length)
+    if boards > 1:
+        secrets = dictionary.words_for_date(date or datetime.date.today(), boards)
+        return MultiGame(language, dictionary, secrets, cols=length,
+                         candidate_index=load_candidate_index(language, length), prefixes=load_dawg(language, length))
+    if adversarial_answers:
+        from adversary import Adversary
+        secret, opponent = "", Adversary(dictionary)
     else:
-        text = UI_STRINGS[current_language]["message_buttons"][message_type]
-        fg, hover = get_message_button_colors(message_type)
+        secret, opponent = dictionary.word_for_date(date or datetime.date.today()), None
+    return engine.Game(language, dictionary, secret, cols=length,
+                       candidate_index=load_candidate_index(language, length), hard_mode=hard, adversary=opponent,
+                       prefixes=load_dawg(language, length))
 
-        ctk.CTkButton(win, text=text, width=75, height=30, text_color="#FFFFFF", fg_color=fg, hover_color=hover,
-                      border_color=hover, border_width=2, font=FONT_13, command=win.destroy).pack()
 
-    win.bind("<Return>", lambda e: win.destroy())
-    win.grab_set()
-    win.wait_window()
+def loader():
+    """
+    Runs on the loader thread: loads dictionaries, candidate indexes and prefix graphs, one job at a time.
+    Games are restored from their snapshots and posted to load_results for the Tk loop to pick up, with
+    whether snapshots were looked at and the word lengths of the language. Once a game is posted, the
+    feedback matrix its hints rank with is handed to hint_builder.
+    """
+    while True:
+        _, _, job = load_jobs.get()
+        kind, language, date, length, hard, adversarial_answers, boards = job
+        try:
+            load_dictionary(language, length)
+            mark(f"dictionary ({language})")
+            load_candidate_index(language, length)
+            mark(f"candidate index ({language})")
+            load_dawg(language, length)
+            mark(f"prefix graph ({language})")
+            if kind == "game":
+                loaded_game = new_game(language, date, length, hard, adversarial_answers, boards)
+                resumed = snapshots is not None
+                if resumed:
+                    name = snapshot.snapshot_name(loaded_game, date or datetime.date.today())
+                    loaded_game = snapshot.restore(loaded_game, snapshots.load(name), lambda: new_game(*job[1:]))
+                load_results.put((job[1:], loaded_game, resumed, available_lengths(language)))
+                if (language, loaded_game.cols) not in hint_matrices:
+                    hint_jobs.put((language, loaded_game.cols))
+        except Exception as e:
+            if kind == "game":
+                load_results.put((job[1:], e, False, None))
+
+
+def hint_builder():
+    """
+    Runs on the hint thread: loads the feedback matrices hints rank with, building each the first time
+    its dictionary is played. A build that fails is reported on stderr and in hint_failures, and tried
+    again the next time a game of that dictionary is loaded.
+    """
+    from feedback import load_feedback_matrix  # numpy is only needed for hints
+
+    while True:
+        key = hint_jobs.get()
+        if key in hint_matrices:
+            continue
+        try:
+            load_feedback_matrix(*key)
+        except Exception as e:
+            print(f"Could not prepare hints for {key}: {e!r}", file=sys.stderr)
+            hint_failures[key] = e
+            continue
+        hint_failures.pop(key, None)
+        hint_matrices.add(key)
 
 
-def load_words(language):
+def load_game(language, date=None, length=COLS, hard=False, adversarial_answers=False, boards=1):
     """
-    Loads the word list for the specified language.
+    Starts loading a new game in the background. Until it is ready the game is None and input is queued.
 
     Parameters:
     - language: Language name as a string.
+    - date: The puzzle's date, or None for today.
+    - length: Word length.
+    - hard: Play in hard mode.
+    - adversarial_answers: Let an adversary pick the answer to each guess.
+    - boards: Number of boards.
+    """
+    global game, pending_game, loader_thread, hint_thread, replaced_game, polling
+
+    if loader_thread is None:
+        loader_thread = threading.Thread(target=loader, name="loader", daemon=True)
+        loader_thread.start()
+        hint_thread = threading.Thread(target=hint_builder, name="hints", daemon=True)
+        hint_thread.start()
+
+    if game is not None:
+        replaced_game = game
+    game = None
+    pending_game = (language, date, length, hard, adversarial_answers, boards)
+    pending_input.clear()
+    load_jobs.put((0, next(load_sequence), ("game",) + pending_game))
+    update_remaining()
+    if not polling:
+        polling = True
+        app.after(LOAD_POLL_MS, poll_loader)
+
+
+def poll_loader():
+    """
+    Checks on the Tk loop whether the game being loaded is ready. Results of superseded loads are dropped.
+    Polling goes on until the pending load has finished or failed.
+    """
+    global polling
 
-    Returns:
-    - List of words in uppercase.
+    while pending_game is not None:
+        try:
+            key, result, resumed, lengths = load_results.get_nowait()
+        except queue.Empty:
+            app.after(LOAD_POLL_MS, poll_loader)
+            return
+        if key != pending_game:
+            continue
+        if isinstance(result, Exception):
+            load_failed(result)
+        else:
+            game_ready(result, resumed, lengths)
+    polling = False
+
+
+def load_failed(error):
     """
-    file_path = lang_files[language]
-    words = []
-    with open(file_path, encoding="utf-8") as f:
-        for line in f:
-            words.append(line.strip().upper())
-    return words
+    Goes back to the game that was current before a load failed, with the settings it was started
+    with, and tells the player. Without one the board stays empty until another game is started.
+
+    Parameters:
+    - error: The exception raised while loading.
+    """
+    global game, pending_game, replaced_game, current_language, puzzle_date, word_length, board_count, \
+        hard_mode, adversarial
+
+    print(f"Could not load the game {pending_game}: {error!r}", file=sys.stderr)
+    pending_game = None
+    pending_input.clear()
+    if replaced_game is not None:
+        game, replaced_game = replaced_game, None
+        previous_language = current_language
+        current_language = game.language
+        puzzle_date = None if game_date == datetime.date.today() else game_date
+        word_length = game.cols
+        board_count = game.boards
+        hard_mode = game.constraints is not None
+        adversarial = game.adversary is not None
+        sync_settings()
+        app.title("Wordle" if puzzle_date is None else f"Wordle – {puzzle_date.isoformat()}")
+
+        if (game.boards, game.rows, game.cols) != grid_shape:
+            create_grid(frame, game.cols, game.boards)
+        draw_game()
+        refresh_ui_language()
+        refresh_keyboard_colors()
+        if keyboard_visible and previous_language != current_language:
+            hide_keyboard()
+            open_keyboard()
+        if game.game_over:
+            disable_game()
+    show_message(t("load_error_title"), t("load_error_msg"), message_type="warning")
+
+
+def sync_settings():
+    """
+    Sets the language, length, boards and mode widgets to the current settings.
+    """
+    lang_box.set(current_language)
+    length_box.set(str(word_length))
+    boards_box.set(str(board_count))
+    for box, selected in ((hard_box, hard_mode), (adversarial_box, adversarial)):
+        if selected:
+            box.select()
+        else:
+            box.deselect()
+        box.configure(state="normal" if board_count == 1 else "disabled")
 
 
-def get_todays_word(words):
+def game_ready(loaded_game, resumed=True, lengths=None):
     """
-    Selects today's word deterministically based on the current date.
+    Makes a loaded game current, draws it if it was restored from its snapshot and replays the input
+    given while it was loading.
 
     Parameters:
-    - words: List of possible words.
+    - loaded_game: The new engine.Game.
+    - resumed: Whether the loader looked for the game's snapshot.
+    - lengths: The word lengths the game's language has words for, found by the loader, or None for
+      just the game's.
+    """
+    global game, pending_game, replaced_game, preloaded, game_date, game_session, word_length
+
+    game = loaded_game
+    replaced_game = None
+    settings = pending_game
+    game_date = pending_game[1] or datetime.date.today()
+    game_session = random.getrandbits(32)
+    pending_game = None
+
+    # the language may not have words of the length asked for
+    word_length = game.cols
+    if (game.boards, game.rows, game.cols) != grid_shape:
+        create_grid(frame, game.cols, game.boards)
+    # the dictionaries of every length are opened by the loader, never on the Tk thread
+    length_box.configure(values=[str(length) for length in lengths or [game.cols]])
+    length_box.set(str(word_length))
+
+    if snapshots is not None and not resumed:
+        # the first game starts loading before the command line is read
+        game = snapshot.restore(game, snapshots.load(snapshot.snapshot_name(game, game_date)),
+                                lambda: new_game(*settings))
+    # a game restored from its snapshot is drawn before any input is applied
+    if game.guesses or game.current_col:
+        draw_game()
+        if game.game_over:
+            disable_game()
+    update_remaining()
+    refresh_keyboard_colors()
+    mark("game ready")
 
-    Returns:
-    - The selected word as a string.
+    queued = pending_input[:]
+    pending_input.clear()
+    for action, *args in queued:
+        action(*args)
+    if queued:
+        save_snapshot()
+
+    if not preloaded:
+        preloaded = True
+        app.after(PRELOAD_DELAY_MS, preload_languages)
+    report_startup()
+
+
+def preload_languages():
     """
-    today = datetime.date.today()
-    seed = int(today.strftime("%Y%m%d"))
-    random.seed(seed)
-    return random.choice(words)
+    Loads the other languages in the background so that switching to them is instant.
+    """
+    for language in engine.lang_files:
+        if language != current_language:
+            load_jobs.put((1, next(load_sequence), ("preload", language, None, word_length, False, False, 1)))
+
+
+def first_frame():
+    """
+    Runs once the main loop is up: draws the window and records the time.
+    """
+    app.update_idletasks()
+    mark("first frame")
+    report_startup()
+
+
+def report_startup():
+    """
+    With --profile-startup, prints the timeline of the cold start once the window is drawn and the game is
+    ready, and quits.
+    """
+    phases = [phase for phase, _ in startup_marks]
+    if not profile_startup or "first frame" not in phases or "game ready" not in phases:
+        return
 
+    start = startup_marks[0][1]
+    previous = start
+    print("Startup timeline:")
+    for phase, at in sorted(startup_marks[1:], key=lambda m: m[1]):
+        print(f"  {(at - start) * 1000:8.1f}ms  (+{(at - previous) * 1000:6.1f}ms)  {phase}")
+        previous = at
+    app.after(0, app.destroy)
 
-def create_grid(parent):
+
+def create_grid(parent, length=COLS, boards=1):
     """
-    Creates the grid of tiles for the word game.
+    Creates the grid of tiles for the word game, replacing any previous one. Tiles shrink for words
+    longer than five letters so that the board keeps its width. Several boards are drawn on a canvas
+    by create_boards. Tiles are registered with the tile renderer as (board, row, column).
 
     Parameters:
     - parent: The parent tkinter widget where the grid will be placed.
+    - length: Number of tiles per row.
+    - boards: Number of boards.
     """
-    for r in range(ROWS):
-        row_tiles = []
-        for c in range(COLS):
-            # horizontal padding
-            if c == 0:
-                pad_x = (10, 5)  # left edge
-            elif c == COLS - 1:
-                pad_x = (5, 10)  # right edge
-            else:
-                pad_x = (5, 5)  # middle tiles
+    global tile_renderer, grid_shape, board_canvas
 
-            # vertical padding
-            if r == 0:
-                pad_y = (10, 5)  # top edge
-            elif r == ROWS - 1:
-                pad_y = (5, 10)  # bottom edge
-            else:
-                pad_y = (5, 5)  # middle tiles
+    animator.cancel()
+    if board_canvas is not None:
+        board_canvas.destroy()
+        board_canvas = None
+        app.geometry("420x552")
+    else:
+        for tile in tile_renderer.widgets.values():
+            tile.destroy()
+    tile_renderer = Renderer(app)
+    grid_shape = (boards, rows_for_boards(boards), length)
 
-            tile = ctk.CTkLabel(parent, text="", width=60, height=60, corner_radius=5, fg_color=COLOR_BOARD_TILE,
-                                font=FONT_30_BOLD, justify="center")
+    if boards > 1:
+        create_boards(parent, length, boards)
+        return
+
+    size = min(60, (350 - 10 * length) // length)
+    for r in range(ROWS):
+        for c in range(length):
+            pad_x = tile_padding(c, length)
+            pad_y = tile_padding(r, ROWS)
+            text_color = palette.state_text[None]
+            tile = ctk.CTkLabel(parent, text="", width=size, height=size, corner_radius=5, fg_color=palette.board_tile,
+                                text_color=text_color, font=font(size // 2, "bold"), justify="center")
             tile.grid(row=r, column=c, padx=pad_x, pady=pad_y)
+            tile_renderer.add((0, r, c), tile, text="", fg_color=palette.board_tile, text_color=text_color)
+
 
-            row_tiles.append(tile)
-        tiles.append(row_tiles)
+def tile_padding(index, count):
+    """
+    Returns the padding of a tile on the single board along one axis: wider at the edges of the board.
 
+    Parameters:
+    - index: Column or row of the tile.
+    - count: Number of columns or rows.
 
-def create_letter_key(parent, ch):
+    Returns:
+    - Tuple (before, after) in pixels.
     """
-    Creates a letter key button on the on-screen keyboard.
+    if index == 0:
+        return (10, 5)  # left or top edge
+    if index == count - 1:
+        return (5, 10)  # right or bottom edge
+    return (5, 5)  # middle tiles
+
+
+def board_layout(length, boards):
+    """
+    Chooses how many boards to put side by side so that the tiles come out as large as possible
+    within BOARDS_AREA.
 
     Parameters:
-    - parent: The parent tkinter widget where the key will be placed.
-    - ch: The character for the key as a string.
+    - length: Number of tiles per row.
+    - boards: Number of boards.
+
+    Returns:
+    - Tuple (boards per row, tile size in pixels).
     """
-    key = ctk.CTkButton(parent, text=ch, width=34, height=36, text_color=get_text_color(None), fg_color=COLOR_KEY,
-                        hover_color=COLOR_HOVER_KEY, corner_radius=5, font=FONT_18_BOLD,
-                        command=lambda c=ch: type_letter(c))
-    key.pack(side="left", padx=2)
-    keyboard_buttons[ch] = key
+    rows = rows_for_boards(boards)
+    width, height = BOARDS_AREA
+    best = None
+    for across in range(1, boards + 1):
+        if boards % across:
+            continue
+        down = boards // across
+        size = min(60, ((width - (across + 1) * BOARD_GAP) // across + TILE_GAP) // length - TILE_GAP,
+                   ((height - (down + 1) * BOARD_GAP) // down + TILE_GAP) // rows - TILE_GAP)
+        if best is None or size > best[1]:
+            best = (across, size)
+    return best
 
 
-def open_keyboard():
+def create_boards(parent, length, boards):
     """
-    Opens the on-screen keyboard in a new window.
+    Draws several boards on one canvas. Each tile is a rectangle and a text item wrapped in a
+    CanvasTile, so the boards get the same batched, diffed updates as the single board without a
+    widget per tile. Each board also has a frame, ("board", index), that marks the focused board.
+
+    Parameters:
+    - parent: The parent tkinter widget where the canvas will be placed.
+    - length: Number of tiles per row.
+    - boards: Number of boards.
+    """
+    global board_canvas
+
+    rows = rows_for_boards(boards)
+    across, size = board_layout(length, boards)
+    step = size + TILE_GAP
+    board_width = length * step - TILE_GAP
+    board_height = rows * step - TILE_GAP
+    width = across * (board_width + BOARD_GAP) + BOARD_GAP
+    height = boards // across * (board_height + BOARD_GAP) + BOARD_GAP
+
+    board_canvas = ctk.CTkCanvas(parent, width=width, height=height, bg=palette.board_bg, highlightthickness=0)
+    board_canvas.grid(row=0, column=0)
+    board_canvas.bind("<Button-1>", lambda event: on_board_click(event, across, board_width, board_height))
+    app.geometry(f"{max(420, width + 60)}x{max(552, height + 200)}")
+
+    text_color = palette.state_text[None]
+    tile_font = font(max(6, size // 2), "bold")
+    for b in range(boards):
+        left = BOARD_GAP + b % across * (board_width + BOARD_GAP)
+        top = BOARD_GAP + b // across * (board_height + BOARD_GAP)
+        outline = board_canvas.create_rectangle(left - 3, top - 3, left + board_width + 2, top + board_height + 2,
+                                                outline=palette.board_bg, width=2)
+        tile_renderer.add(("board", b), CanvasTile(board_canvas, outline), border_color=palette.board_bg)
+
+        for r in range(rows):
+            for c in range(length):
+                x, y = left + c * step, top + r * step
+                rect = board_canvas.create_rectangle(x, y, x + size, y + size, fill=palette.board_tile, outline="")
+                label = board_canvas.create_text(x + size / 2, y + size / 2, text="", fill=text_color, font=tile_font)
+                tile_renderer.add((b, r, c), CanvasTile(board_canvas, rect, label), text="",
+                                  fg_color=palette.board_tile, text_color=text_color)
+
+
+def on_board_click(event, across, board_width, board_height):
     """
-    global keyboard_window
-    keyboard_buttons.clear()
+    Focuses the board that was clicked, so that the keyboard shows its letter states.
 
-    if keyboard_window is not None and keyboard_window.winfo_exists():
-        keyboard_window.lift()
+    Parameters:
+    - event: The click event on the boards canvas.
+    - across: Boards per row.
+    - board_width, board_height: Size of a board in pixels.
+    """
+    column = (event.x - BOARD_GAP // 2) // (board_width + BOARD_GAP)
+    row = (event.y - BOARD_GAP // 2) // (board_height + BOARD_GAP)
+    if game is None or not 0 <= column < across or not game.focus_board(row * across + column):
         return
+    refresh_board_frames()
+    refresh_keyboard_colors()
+    update_remaining()
+    save_snapshot()
 
-    lang = lang_box.get()
 
-    layouts = {
-        "English": (["QWERTYUIOP", "ASDFGHJKL", "ZXCVBNM"], 420),
-        "Norsk": (["QWERTYUIOPÅ", "ASDFGHJKLØÆ", "ZXCVBNM"], 458),
-        "Українська": (["ЙЦУКЕНГШЩЗХЇ", "ФІВАПРОЛДЖЄ", "ЯЧСМИТЬБЮ"], 496),
-    }
+def refresh_board_frames():
+    """
+    Outlines the focused board of a multi-board game.
+    """
+    for key in tile_renderer.widgets:
+        if key[0] == "board":
+            focused = game is not None and game.boards > 1 and key[1] == game.focus and not game.game_over
+            tile_renderer.set(key, border_color=palette.text if focused else palette.board_bg)
 
-    rows, window_width = layouts.get(lang, layouts["English"])
 
-    keyboard_window = ctk.CTkToplevel()
-    keyboard_window.title(t("keyboard_title"))
-    keyboard_window.geometry(f"{window_width}x140")
-    keyboard_window.resizable(False, False)
-    keyboard_window.configure(fg_color=COLOR_APP_BG)
+def create_letter_key(renderer, parent, ch):
+    """
+    Creates a letter key button on the on-screen keyboard.
 
-    container = ctk.CTkFrame(keyboard_window, fg_color=COLOR_APP_BG)
-    container.pack(expand=True)
+    Parameters:
+    - renderer: The Renderer of the keyboard the key belongs to.
+    - parent: The parent tkinter widget where the key will be placed.
+    - ch: The character for the key as a string.
+    """
+    key = ctk.CTkButton(parent, text=ch, width=34, height=36, text_color=palette.state_text[None], fg_color=palette.key,
+                        hover_color=palette.hover_key, corner_radius=5, font=font(18, "bold"),
+                        command=lambda c=ch: queue_input(type_letter, c))
+    key.pack(side="left", padx=2)
+    renderer.add(ch, key, fg_color=palette.key, text_color=palette.state_text[None])
 
-    keyboard_frames.clear()
-    keyboard_frames.extend([keyboard_window, container])
 
-    row1 = ctk.CTkFrame(container, fg_color=COLOR_APP_BG)
+def build_keyboard(language):
+    """
+    Builds the on-screen keyboard window for a language's layout. The window starts hidden.
+
+    Parameters:
+    - language: Language name as a string.
+
+    Returns:
+    - A Renderer holding the window ("window"), its frames (("frame", i)) and its keys (by label).
+    """
+    rows, window_width = keyboard_layouts.get(language, keyboard_layouts["English"])
+    renderer = Renderer(app)
+
+    window = ctk.CTkToplevel()
+    window.withdraw()
+    window.title(t("keyboard_title"))
+    window.geometry(f"{window_width}x140")
+    window.resizable(False, False)
+    window.configure(fg_color=palette.app_bg)
+    # closing only hides the window so it can be shown again without rebuilding
+    window.protocol("WM_DELETE_WINDOW", hide_keyboard)
+    renderer.add("window", window, fg_color=palette.app_bg)
+
+    container = ctk.CTkFrame(window, fg_color=palette.app_bg)
+    container.pack(expand=True)
+
+    row1 = ctk.CTkFrame(container, fg_color=palette.app_bg)
     row1.pack(pady=2)
     for ch in rows[0]:
-        create_letter_key(row1, ch)
+        create_letter_key(renderer, row1, ch)
 
-    row2 = ctk.CTkFrame(container, fg_color=COLOR_APP_BG)
+    row2 = ctk.CTkFrame(container, fg_color=palette.app_bg)
     row2.pack(pady=2)
     for ch in rows[1]:
-        create_letter_key(row2, ch)
+        create_letter_key(renderer, row2, ch)
 
-    row3 = ctk.CTkFrame(container, fg_color=COLOR_APP_BG)
+    row3 = ctk.CTkFrame(container, fg_color=palette.app_bg)
     row3.pack(pady=2)
 
     # ENTER
-    enter_btn = ctk.CTkButton(row3, text="⏎", width=53, height=36, text_color=COLOR_TEXT, fg_color=COLOR_GREEN,
-                              hover_color=COLOR_GREEN_HOVER, corner_radius=5, font=FONT_16_BOLD,
-                              command=submit_word)
+    enter_btn = ctk.CTkButton(row3, text="⏎", width=53, height=36, text_color=palette.text, fg_color=palette.green,
+                              hover_color=palette.green_hover, corner_radius=5, font=font(16, "bold"),
+                              command=lambda: queue_input(submit_word))
     enter_btn.pack(side="left", padx=3)
-    keyboard_buttons["⏎"] = enter_btn
+    renderer.add("⏎", enter_btn, fg_color=palette.green, hover_color=palette.green_hover, text_color=palette.text)
 
     for ch in rows[2]:
-        create_letter_key(row3, ch)
+        create_letter_key(renderer, row3, ch)
 
     # DELETE
-    delete_btn = ctk.CTkButton(row3, text="⌫", width=53, height=36, text_color=COLOR_TEXT, fg_color=COLOR_RED,
-                               hover_color=COLOR_RED_HOVER, corner_radius=5, font=FONT_16_BOLD,
-                               command=delete_letter)
+    delete_btn = ctk.CTkButton(row3, text="⌫", width=53, height=36, text_color=palette.text, fg_color=palette.red,
+                               hover_color=palette.red_hover, corner_radius=5, font=font(16, "bold"),
+                               command=lambda: queue_input(delete_letter))
     delete_btn.pack(side="left", padx=3)
-    keyboard_buttons["⌫"] = delete_btn
+    renderer.add("⌫", delete_btn, fg_color=palette.red, hover_color=palette.red_hover, text_color=palette.text)
+
+    for i, frame_widget in enumerate([container, row1, row2, row3]):
+        renderer.add(("frame", i), frame_widget, fg_color=palette.app_bg)
+
+    return renderer
 
-    keyboard_frames.extend([row1, row2, row3])
 
-    # Refresh colors according to current theme
+def open_keyboard():
+    """
+    Shows the on-screen keyboard for the current language, building it on first use.
+    """
+    global keyboard_visible
+
+    start = time.perf_counter()
+    action = "show"
+    renderer = keyboards.get(current_language)
+    if renderer is None:
+        renderer = keyboards[current_language] = build_keyboard(current_language)
+        action = "build"
+
+    window = renderer.widgets["window"]
+    window.title(t("keyboard_title"))
     refresh_keyboard_colors()
+    renderer.flush_now()
+    window.deiconify()
+    window.lift()
+    keyboard_visible = True
+
+    elapsed = time.perf_counter() - start
+    for hook in keyboard_timing_hooks:
+        hook(current_language, action, elapsed)
+
+
+def hide_keyboard():
+    """
+    Hides every on-screen keyboard window without destroying it.
+    """
+    global keyboard_visible
+
+    for renderer in keyboards.values():
+        window = renderer.widgets["window"]
+        if window.winfo_exists():
+            window.withdraw()
+    keyboard_visible = False
 
 
 def refresh_keyboard_colors():
     """
-    Refreshes the colors of the keyboard buttons.
+    Refreshes the colors of the current language's keyboard from the theme and the game's key states.
+    The changes are applied by the keyboard's renderer in one batch.
     """
-    for w in keyboard_frames:
-        if w and w.winfo_exists():
-            w.configure(fg_color=COLOR_APP_BG)
+    renderer = keyboards.get(current_language)
+    if renderer is None:
+        return
 
-    for letter, btn in keyboard_buttons.items():
-        if btn and btn.winfo_exists():
-            state = keyboard_state.get(letter)
-            if letter == "⏎":  # Enter key
-                btn.configure(fg_color=COLOR_GREEN, hover_color=COLOR_GREEN_HOVER, text_color=COLOR_TEXT)
-            elif letter == "⌫":  # Delete key
-                btn.configure(fg_color=COLOR_RED, hover_color=COLOR_RED_HOVER, text_color=COLOR_TEXT)
-            else:
-                btn.configure(fg_color=get_key_fg_color(state), text_color=get_text_color(state))
+    for key in renderer.widgets:
+        if key == "window" or isinstance(key, tuple):
+            renderer.set(key, fg_color=palette.app_bg)
+        elif key == "⏎":  # Enter key
+            renderer.set(key, fg_color=palette.green, hover_color=palette.green_hover, text_color=palette.text)
+        elif key == "⌫":  # Delete key
+            renderer.set(key, fg_color=palette.red, hover_color=palette.red_hover, text_color=palette.text)
+        else:
+            state = None if game is None else game.keyboard_state.get(key)
+            renderer.set(key, fg_color=palette.key_fg[state], text_color=palette.state_text[state])
+
+
+def log_event(kind, row=0, col=0, value=0, letters=""):
+    """
+    Appends an event of the current game to the event log, if logging is on.
+
+    Parameters:
+    - kind: One of the eventlog event kinds.
+    - row, col: Position on the board.
+    - value: Kind-specific value.
+    - letters: The typed letter or the guessed word.
+    """
+    if event_log is not None:
+        event_log.append(kind, game.language, game.cols, eventlog.game_mode(game), game_date, game_session, row, col,
+                         value, letters)
 
 
 def type_letter(letter):
@@ -622,13 +1293,22 @@ def type_letter(letter):
     Parameters:
     - letter: The letter to type as a string.
     """
-    global current_row, current_col, game_over
-    if game_over or current_row >= ROWS:
+    if game is None:
+        pending_input.append((type_letter, letter))
         return
 
-    if current_col < COLS:
-        tiles[current_row][current_col].configure(text=letter.upper(), text_color=get_text_color(None))
-        current_col += 1
+    pos = game.type_letter(letter)
+    if pos is None:
+        return
+
+    row, col = pos
+    dead_end = game.dead_end()
+    color = palette.state_text[None] if dead_end is None else palette.red
+    for board in game.open_boards():
+        tile_renderer.set((board, row, col), text=game.letters[row][col], text_color=color)
+    if dead_end == col:
+        tint_current_row()
+    log_event(eventlog.KEY, row, col, letters=game.letters[row][col])
 
 
 def delete_letter():
@@ -636,13 +1316,36 @@ def delete_letter():
     Deletes the last typed letter in the current row.
     If there are no letters to delete or the game is over, does nothing.
     """
-    global current_row, current_col, game_over
-    if game_over:
+    if game is None:
+        pending_input.append((delete_letter,))
         return
 
-    if current_col > 0:
-        current_col -= 1
-        tiles[current_row][current_col].configure(text="", text_color=get_text_color(None))
+    dead_end = game.dead_end()
+    pos = game.delete_letter()
+    if pos is None:
+        return
+
+    row, col = pos
+    for board in game.open_boards():
+        tile_renderer.set((board, row, col), text="", text_color=palette.state_text[None])
+    if dead_end == col:
+        tint_current_row()
+    log_event(eventlog.DELETE, row, col)
+
+
+def tint_current_row():
+    """
+    Colors the letters typed in the current row: red once they no longer lead to any valid word, so
+    the player sees it before pressing Enter, and in the usual color otherwise.
+    """
+    if game is None or game.game_over:
+        return
+
+    color = palette.state_text[None] if game.dead_end() is None else palette.red
+    row = game.current_row
+    for board in game.open_boards():
+        for col in range(game.current_col):
+            tile_renderer.set((board, row, col), text_color=color)
 
 
 def submit_word():
@@ -650,61 +1353,67 @@ def submit_word():
     Submits the current word guess for evaluation.
     If the word is incomplete, invalid, or the game is over, shows appropriate messages.
     """
-    global current_row, current_col, game_over
-    if game_over:
+    if game is None:
+        pending_input.append((submit_word,))
         return
 
-    if current_col < COLS:
-        show_message(t("not_enough_letters_title"), t("not_enough_letters_msg"), message_type="warning")
+    result = game.submit()
+    if result is None:
         return
 
-    guess = "".join(tile.cget("text") for tile in tiles[current_row])
-
-    # Validate letters belong to selected language
-    allowed = language_alphabets[current_language]
-
-    word_letters = set(guess)
+    if result.states is None:
+        log_event(eventlog.REJECTED, result.row, value=eventlog.REJECTIONS.index(result.status) + 1,
+                  letters=result.guess)
+        shake_row(result.row)
+    else:
+        log_event(eventlog.GUESS, result.row, value=game.patterns[-1], letters=result.guess)
+        if game.game_over:
+            # a record holds one word; the answers of several boards are not logged
+            answer = game.secret_word if game.boards == 1 else ""
+            log_event(eventlog.OUTCOME, len(game.guesses), value=int(game.won), letters=answer)
 
-    if not word_letters.issubset(allowed):
-        show_message(t("invalid_letters_title"), t("invalid_letters_msg"), message_type="warning")
+    if result.status == engine.ALREADY_GUESSED:
+        show_message(t("already_guessed_title"),
+                     t("already_guessed_msg")[0] + " " + result.guess + t("already_guessed_msg")[1],
+                     message_type="warning")
         return
 
-    # Check if word exists in dictionary
-    if guess not in valid_words:
-        show_message(t("invalid_word_title"), t("invalid_word_msg"), message_type="warning")
+    if result.status == engine.HARD_MODE:
+        rule = game.constraints.check(result.guess)
+        if rule[0] == "fixed":
+            prefix, suffix = t("hard_mode_fixed_msg")
+            msg = f"{prefix} {rule[1] + 1} {suffix} {rule[2]}"
+        elif rule[0] == "present":
+            msg = t("hard_mode_present_msg") + " " + rule[1] + (f" ×{rule[2]}" if rule[2] > 1 else "")
+        else:
+            msg = t("hard_mode_excluded_msg") + " " + rule[1]
+        show_message(t("hard_mode_title"), msg + ".", message_type="warning")
         return
 
-    # Check if word was already guessed
-    if guess in previous_guesses:
-        show_message(t("already_guessed_title"),
-                     t("already_guessed_msg")[0] + " " + guess + t("already_guessed_msg")[1], message_type="warning")
+    if result.states is None:
+        show_message(t(result.status + "_title"), t(result.status + "_msg"), message_type="warning")
         return
 
-    previous_guesses.add(guess)
-
-    evaluate_guess(guess)
+    evaluate_guess(result)
 
-    if guess == secret_word.upper():
-        num_guesses = len(previous_guesses)
+    if result.status == engine.WON:
+        num_guesses = len(game.guesses)
         # Depending on number of guesses, show different messages
         if num_guesses == 1:
             msg = t("first_try_congratulations")
         elif num_guesses <= 3:
             msg = t("medium_try_congratulations")
-        elif num_guesses <= 6:
+        else:
             msg = t("normal_congratulations")
 
         show_message(t("congratulations_title"), msg, message_type="success")
         disable_game()
         return
 
-    current_row += 1
-    current_col = 0
-
     # If player used all rows
-    if current_row >= ROWS:
+    if result.status == engine.LOST:
         show_message(t("game_over_title"),
-                     t("game_over_msg")[0] + " " + secret_word + t("game_over_msg")[1],
+                     t("game_over_msg")[0] + " " + game.secret_word + t("game_over_msg")[1],
                      message_type="info")
         disable_game()
 
@@ -713,142 +1422,105 @@ def disable_game():
     """
     Disables further input to the game after it has ended.
     """
-    global game_over
-    game_over = True
-
     # Unbind keyboard input
     app.unbind("<Key>")
 
 
-def get_state_color(state):
+def evaluate_guess(result):
     """
-    Maps a semantic state to its color.
-    Returns None if the state is not evaluated yet.
-    """
-    if state == "correct":
-        return COLOR_CORRECT
-    elif state == "misplaced":
-        return COLOR_MISPLACED
-    elif state == "wrong":
-        return COLOR_WRONG
-    return None
-
+    Updates tile colors and the keyboard for a guess scored by the game engine, on every board it was
+    scored on. The tiles of the row are turned over one after the other.
 
-def get_tile_fg_color(state):
-    """
-    Returns the background color for a board tile.
+    Parameters:
+    - result: The engine.GuessResult of the submitted guess.
     """
-    return get_state_color(state) or COLOR_BOARD_TILE
+    for board in range(game.boards):
+        states = game.board_states(board)[result.row]
+        if states[0] is None:  # the board was already solved
+            continue
+        for i, state in enumerate(states):
+            if animate:
+                flip_tile((board, result.row, i), state, i * FLIP_STAGGER_MS)
+            else:
+                tile_renderer.set((board, result.row, i), fg_color=palette.tile_fg[state],
+                                  text_color=palette.state_text[state])
 
+    if game.boards > 1:
+        # the focus may have moved to another board
+        refresh_board_frames()
+        refresh_keyboard_colors()
+    else:
+        for ch in result.guess:
+            update_keyboard_key(ch)
 
-def get_key_fg_color(state):
-    """
-    Returns the background color for a keyboard key.
-    """
-    return get_state_color(state) or COLOR_KEY
+    update_remaining()
 
 
-def get_text_color(state):
+def flip_tile(key, state, delay_ms=0):
     """
-    Returns the text color based on the current theme and tile state.
+    Turns a tile over to reveal its state. Every frame takes its colors from the current palette, so
+    a theme change in the middle of a flip carries on in the new colors.
 
     Parameters:
-    - state: The state of the tile ("correct", "misplaced", "wrong") or None if not submitted.
-
-    Returns:
-    - The text color as a hex string.
+    - key: The tile's (board, row, column).
+    - state: The state revealed: "correct", "misplaced" or "wrong".
+    - delay_ms: Time before the tile starts turning.
     """
-    theme_data = themes[current_theme]
-    base = theme_data["BASE"]
-    override = theme_data.get("TEXT_OVERRIDE", {})
+    def draw(frame):
+        # the letter takes the color of the back once the tile is edge-on
+        text_state = None if frame < FLIP_FRAMES // 2 else state
+        tile_renderer.set(key, fg_color=palette.flip_fg[state][frame], text_color=palette.state_text[text_state])
 
-    # typed but not submitted
-    if state is None:
-        typed_override = override.get("typed")
-        if typed_override is None:
-            return COLOR_TEXT
-        return typed_override
-
-    # submitted tiles
-    submitted_override = override.get("submitted")
-    if submitted_override:
-        if isinstance(submitted_override, dict):  # per-state
-            color = submitted_override.get(state)
-            return COLOR_TEXT if color is None else color
-        else:
-            return COLOR_TEXT if submitted_override is None else submitted_override
-
-    # default rules
-    if base == "light":
-        return "#FFFFFF"
-    return COLOR_TEXT
+    animator.start(key, FLIP_FRAMES, draw, delay_ms)
 
 
-def get_message_button_colors(kind):
-    return themes[current_theme]["MESSAGE_BUTTONS"][kind]
-
-
-def evaluate_guess(guess):
+def shake_row(row):
     """
-    Evaluates the guessed word against the secret word and updates tile colors accordingly.
+    Shakes the tiles of the current row sideways on every open board, for a rejected word. The tiles
+    are moved directly rather than through the tile renderer, which only handles colors and text.
 
     Parameters:
-    - guess: The guessed word as a string.
+    - row: The row of the rejected word.
     """
-    guess = guess.upper()
-    secret = secret_word.upper()
-
-    # 1 = wrong, 2 = misplaced, 3 = correct
-    # correct positions
-    result = [1] * COLS  # initially all wrong
-    secret_list = list(secret)
+    if not animate:
+        return
 
-    for i, ch in enumerate(guess):
-        if ch == secret[i]:
-            result[i] = 3  # correct
-            secret_list[i] = None
+    boards = game.open_boards()
+    cols = game.cols
+    offset = 0
 
-    # misplaced positions
-    for i, ch in enumerate(guess):
-        if result[i] == 3:  # correct
-            continue
-        if ch in secret_list:
-            result[i] = 2  # misplaced
-            secret_list[secret_list.index(ch)] = None
-
-    # update tile colors and keyboard
-    for i, ch in enumerate(guess):
-        if result[i] == 3:
-            state = "correct"
-        elif result[i] == 2:
-            state = "misplaced"
-        else:
-            state = "wrong"
-
-        tile_states[current_row][i] = state
-        tiles[current_row][i].configure(fg_color=get_tile_fg_color(state), text_color=get_text_color(state))
+    def draw(frame):
+        nonlocal offset
+        shift = SHAKE_OFFSETS[frame]
+        if shift == offset:
+            return
+        for board in boards:
+            for col in range(cols):
+                tile = tile_renderer.widgets[(board, row, col)]
+                if board_canvas is None:
+                    before, after = tile_padding(col, cols)
+                    tile.grid_configure(padx=(before + shift, after - shift))
+                else:
+                    board_canvas.move(tile.rect, shift - offset, 0)
+                    board_canvas.move(tile.label, shift - offset, 0)
+        offset = shift
 
-        update_keyboard_key(ch, state)
+    animator.start(("shake", row), len(SHAKE_OFFSETS), draw)
 
 
-def update_keyboard_key(letter, new_state):
+def update_keyboard_key(letter):
     """
-    Updates the color of a keyboard key based on the new state.
+    Updates the color of a keyboard key to the best state the game knows for its letter.
 
     Parameters:
     - letter: The letter on the keyboard key as a string.
-    - new_state: The new state of the letter ("correct", "misplaced", "wrong").
     """
-    old_state = keyboard_state.get(letter)
-
-    if old_state and priority[old_state] >= priority[new_state]:
+    renderer = keyboards.get(current_language)
+    if renderer is None or letter not in renderer.widgets:
         return
 
-    keyboard_state[letter] = new_state
-
-    btn = keyboard_buttons.get(letter)
-    if btn and btn.winfo_exists():
-        btn.configure(fg_color=get_key_fg_color(new_state), text_color=get_text_color(new_state))
+    state = None if game is None else game.keyboard_state.get(letter)
+    renderer.set(letter, fg_color=palette.key_fg[state], text_color=palette.state_text[state])
 
 
 def on_key(event):
@@ -858,41 +1530,92 @@ def on_key(event):
     Parameters:
     - event: The key press event.
     """
+    # Escape declines an open question or closes the newest message
+    if toasts is not None and toasts.handle_key(event.keysym):
+        return
+
     char = event.char.upper()
 
     if char == "ʼ":  # no words with apostrophes
         return
 
     if char.isalpha() and len(char) == 1:
-        type_letter(char)
+        queue_input(type_letter, char)
 
     elif event.keysym == "BackSpace":
-        delete_letter()
+        queue_input(delete_letter)
 
     elif event.keysym == "Return":
-        submit_word()
+        queue_input(submit_word)
 
 
-def reset_grid():
+def queue_input(action, *args):
     """
-    Resets the word grid to its initial empty state.
+    Queues a key press to be applied on the next idle tick, so that a burst of key events (fast
+    typing, key repeat, pasted text) is applied in one go and drawn once.
+
+    Parameters:
+    - action: type_letter, delete_letter or submit_word.
+    - args: Its arguments.
     """
-    global current_row, current_col
+    global input_scheduled
 
-    previous_guesses.clear()
-    keyboard_state.clear()
+    input_queue.append((action, args))
+    if input_scheduled is None:
+        input_scheduled = app.after_idle(drain_input)
+
+
+def drain_input():
+    """
+    Applies every queued key press in order. The tiles they changed are drawn together by the
+    renderer's flush, which is scheduled behind this tick, and the game is saved once.
+    """
+    global input_scheduled
+
+    input_scheduled = None
+    while input_queue:
+        action, args = input_queue.popleft()
+        action(*args)
+    save_snapshot()
 
-    for r in range(ROWS):
-        for c in range(COLS):
-            tile_states[r][c] = None
-            tiles[r][c].configure(text="", fg_color=COLOR_BOARD_TILE)
 
-    for letter, btn in keyboard_buttons.items():
-        if btn and btn.winfo_exists():
-            btn.configure(fg_color=COLOR_KEY, text_color=get_text_color(None))
+def draw_game():
+    """
+    Draws the whole board of the current game, e.g. of a game restored from its snapshot.
+    """
+    for key in tile_renderer.widgets:
+        if key[0] == "board":
+            continue
+        b, r, c = key
+        state = game.board_states(b)[r][c]
+        # a board solved before the last guess took none of the letters typed after it
+        solved = game.solved[b] if game.boards > 1 else None
+        text = "" if solved is not None and r > solved else game.letters[r][c]
+        tile_renderer.set(key, text=text, fg_color=palette.tile_fg[state], text_color=palette.state_text[state])
+    tint_current_row()
+    refresh_board_frames()
 
-    current_row = 0
-    current_col = 0
+
+def save_snapshot():
+    """
+    Saves the progress of the current game. Only the encoding runs on the Tk thread; the file is
+    written by the snapshot writer's thread.
+    """
+    if snapshots is not None and game is not None:
+        snapshots.save(snapshot.snapshot_name(game, game_date), snapshot.encode(game))
+
+
+def reset_grid():
+    """
+    Resets the word grid to its initial empty state.
+    """
+    animator.finish()
+    for key in tile_renderer.widgets:
+        if key[0] != "board":
+            tile_renderer.set(key, text="", fg_color=palette.board_tile)
+
+    refresh_board_frames()
+    refresh_keyboard_colors()
 
 
 def on_language_change(choice):
@@ -903,36 +1626,139 @@ def on_language_change(choice):
     Parameters:
     - choice: The newly selected language as a string.
     """
-    global current_language, valid_words, secret_word, current_row, current_col, game_over, keyboard_window
+    def change():
+        global current_language
+        current_language = choice
+        start_game()
 
-    if len(previous_guesses) >= 1 and game_over is False:
-        word_text = t("word")[0] if len(previous_guesses) == 1 else t("word")[1]
-        confirm = show_message(t("change_language_title"),
-                               t("change_language_msg")[0] + " " + str(len(previous_guesses)) + " " + word_text +
-                               t("change_language_msg")[1], message_type="confirm")
-        if not confirm:
-            lang_box.set(current_language)  # revert dropdown
-            return
+    confirm_reset("change_language", change)
+
+
+def on_length_change(choice):
+    """
+    Handles the event when the word length selection is changed.
+
+    Parameters:
+    - choice: The newly selected length as a string.
+    """
+    def change():
+        global word_length
+        word_length = int(choice)
+        start_game()
+
+    confirm_reset("change_length", change)
+
+
+def on_boards_change(choice):
+    """
+    Handles the event when the number of boards is changed. Hard mode and Absurdle only apply to a
+    single board, so their checkboxes are disabled for several.
+
+    Parameters:
+    - choice: The newly selected number of boards as a string.
+    """
+    def change():
+        global board_count
+        board_count = int(choice)
+        single_board_state = "normal" if board_count == 1 else "disabled"
+        hard_box.configure(state=single_board_state)
+        adversarial_box.configure(state=single_board_state)
+        start_game()
+
+    confirm_reset("change_boards", change)
+
+
+def on_hard_mode_change():
+    """
+    Handles the event when the hard mode checkbox is toggled.
+    """
+    def change():
+        global hard_mode
+        hard_mode = bool(hard_box.get())
+        start_game()
+
+    confirm_reset("change_hard_mode", change)
+
+
+def on_adversarial_change():
+    """
+    Handles the event when the Absurdle checkbox is toggled.
+    """
+    def change():
+        global adversarial
+        adversarial = bool(adversarial_box.get())
+        start_game()
+
+    confirm_reset("change_adversarial", change)
+
+
+def open_archive():
+    """
+    Asks for a date and starts that day's puzzle.
+    """
+    answer = ctk.CTkInputDialog(title=t("archive_title"), text=t("archive_msg")).get_input()
+    if not answer:
+        return
+
+    try:
+        date = datetime.date.fromisoformat(answer.strip())
+    except ValueError:
+        date = None
+    today = datetime.date.today()
+    if date is None or date > today:
+        show_message(t("invalid_date_title"), t("invalid_date_msg"), message_type="warning")
+        return
+
+    def change():
+        global puzzle_date
+        puzzle_date = None if date == today else date
+        start_game()
+
+    confirm_reset("change_date", change)
+
+
+def confirm_reset(key, on_confirm):
+    """
+    Asks the player to confirm abandoning a game in progress. Returns at once; the answer arrives
+    through the callback. Whatever the answer, the settings widgets are set back to the settings
+    then in use, undoing the choices of declined questions and of those a newer question replaced.
+
+    Parameters:
+    - key: Prefix of the "<key>_title" and "<key>_msg" UI strings to show.
+    - on_confirm: Called if there is no game in progress or once the player confirms.
+    """
+    def answer(confirmed):
+        if confirmed:
+            on_confirm()
+        sync_settings()
+
+    num_guesses = 0 if game is None else len(game.guesses)
+    if num_guesses >= 1 and game.game_over is False:
+        word_text = t("word")[0] if num_guesses == 1 else t("word")[1]
+        show_message(t(key + "_title"),
+                     t(key + "_msg")[0] + " " + str(num_guesses) + " " + word_text + t(key + "_msg")[1],
+                     message_type="confirm", on_answer=answer)
+    else:
+        on_confirm()
 
-    # Reset game state
-    game_over = False
-    current_language = choice
-    valid_words = load_words(current_language)
-    secret_word = get_todays_word(valid_words)
-    print("Today's word:", secret_word)
+
+def start_game():
+    """
+    Starts a new game for the current language and puzzle date and resets the UI.
+    """
+    # Reset game state; the new game is loaded in the background
+    load_game(current_language, puzzle_date, word_length, hard_mode, adversarial, board_count)
+    if (board_count, rows_for_boards(board_count), word_length) != grid_shape:
+        create_grid(frame, word_length, board_count)
+    app.title("Wordle" if puzzle_date is None else f"Wordle – {puzzle_date.isoformat()}")
 
     reset_grid()
     refresh_ui_language()
 
-    # Re-enable keyboard buttons if they were disabled
-    for btn in keyboard_buttons.values():
-        if btn and btn.winfo_exists():
-            btn.configure(state="normal")
-
-    # Close the keyboard window if it's open, so it can be recreated with the new layout
-    if keyboard_window is not None and keyboard_window.winfo_exists():
-        keyboard_window.destroy()
-        keyboard_window = None
+    # Swap an open keyboard for the (cached) one with the new layout
+    if keyboard_visible:
+        hide_keyboard()
+        open_keyboard()
 
     # Rebind key input
     app.bind("<Key>", on_key)
@@ -945,70 +1771,147 @@ def on_theme_change(theme):
     Parameters:
     - theme: The newly selected theme as a string.
     """
-    global current_theme, info_window
-    global COLOR_APP_BG, COLOR_BOARD_BG, COLOR_BOARD_TILE, COLOR_TEXT, COLOR_BUTTON, COLOR_BUTTON_HOVER, COLOR_DROPDOWN
-    global COLOR_WRONG, COLOR_MISPLACED, COLOR_CORRECT, COLOR_KEY, COLOR_HOVER_KEY
-    global COLOR_GREEN, COLOR_GREEN_HOVER, COLOR_RED, COLOR_RED_HOVER
+    global current_theme, palette, info_window
 
     label_map = UI_STRINGS[current_language]["themes"]
     current_theme = next((theme_id for theme_id, label in label_map.items() if label == theme), None)
-
-    COLOR_APP_BG = themes[current_theme]["APP_BG"]
-    COLOR_BOARD_BG = themes[current_theme]["BOARD_BG"]
-    COLOR_BOARD_TILE = themes[current_theme]["BOARD_TILE"]
-    COLOR_TEXT = themes[current_theme]["TEXT"]
-    COLOR_BUTTON = themes[current_theme]["BUTTON"]
-    COLOR_BUTTON_HOVER = themes[current_theme]["BUTTON_HOVER"]
-    COLOR_DROPDOWN = themes[current_theme]["DROPDOWN"]
-    COLOR_WRONG = themes[current_theme]["WRONG"]
-    COLOR_MISPLACED = themes[current_theme]["MISPLACED"]
-    COLOR_CORRECT = themes[current_theme]["CORRECT"]
-
-    COLOR_KEY = themes[current_theme]["KEY"]
-    COLOR_HOVER_KEY = themes[current_theme]["HOVER_KEY"]
-
-    COLOR_GREEN = themes[current_theme]["GREEN"]
-    COLOR_GREEN_HOVER = themes[current_theme]["GREEN_HOVER"]
-    COLOR_RED = themes[current_theme]["RED"]
-    COLOR_RED_HOVER = themes[current_theme]["RED_HOVER"]
-
-    app.configure(fg_color=themes[current_theme]["APP_BG"])
-    frame.configure(fg_color=themes[current_theme]["BOARD_BG"])
-    top.configure(fg_color=themes[current_theme]["APP_BG"])
-    bottom.configure(fg_color=themes[current_theme]["APP_BG"])
-    lang_label.configure(text_color=COLOR_TEXT)
-    theme_label.configure(text_color=COLOR_TEXT)
-    lang_box.configure(fg_color=COLOR_DROPDOWN, border_color=COLOR_BUTTON, button_color=COLOR_BUTTON,
-                       text_color=COLOR_TEXT)
-    theme_box.configure(fg_color=COLOR_DROPDOWN, border_color=COLOR_BUTTON, button_color=COLOR_BUTTON,
-                        text_color=COLOR_TEXT)
-    info_btn.configure(fg_color=COLOR_BUTTON, hover_color=COLOR_BUTTON_HOVER, text_color=COLOR_TEXT)
-    keyboard_btn.configure(fg_color=COLOR_BUTTON, hover_color=COLOR_BUTTON_HOVER, text_color=COLOR_TEXT)
-
-    for r in range(ROWS):
-        for c in range(COLS):
-            state = tile_states[r][c]
-            tiles[r][c].configure(fg_color=get_tile_fg_color(state), text_color=get_text_color(state))
+    palette = get_palette(current_theme)
+
+    app.configure(fg_color=palette.app_bg)
+    frame.configure(fg_color=palette.board_bg)
+    top.configure(fg_color=palette.app_bg)
+    bottom.configure(fg_color=palette.app_bg)
+    lang_label.configure(text_color=palette.text)
+    theme_label.configure(text_color=palette.text)
+    boards_label.configure(text_color=palette.text)
+    lang_box.configure(fg_color=palette.dropdown, border_color=palette.button, button_color=palette.button,
+                       text_color=palette.text)
+    length_box.configure(fg_color=palette.dropdown, border_color=palette.button, button_color=palette.button,
+                         text_color=palette.text)
+    hard_box.configure(fg_color=palette.correct, hover_color=palette.button_hover, border_color=palette.button,
+                       text_color=palette.text)
+    adversarial_box.configure(fg_color=palette.correct, hover_color=palette.button_hover,
+                              border_color=palette.button, text_color=palette.text)
+    boards_box.configure(fg_color=palette.dropdown, border_color=palette.button, button_color=palette.button,
+                         text_color=palette.text)
+    theme_box.configure(fg_color=palette.dropdown, border_color=palette.button, button_color=palette.button,
+                        text_color=palette.text)
+    info_btn.configure(fg_color=palette.button, hover_color=palette.button_hover, text_color=palette.text)
+    hint_btn.configure(fg_color=palette.button, hover_color=palette.button_hover, text_color=palette.text)
+    archive_btn.configure(fg_color=palette.button, hover_color=palette.button_hover, text_color=palette.text)
+    remaining_label.configure(text_color=palette.text)
+    keyboard_btn.configure(fg_color=palette.button, hover_color=palette.button_hover, text_color=palette.text)
+
+    if board_canvas is not None:
+        board_canvas.configure(bg=palette.board_bg)
+    for key in tile_renderer.widgets:
+        if key[0] == "board":
+            continue
+        b, r, c = key
+        state = None if game is None else game.board_states(b)[r][c]
+        tile_renderer.set(key, fg_color=palette.tile_fg[state], text_color=palette.state_text[state])
+    tint_current_row()
+    refresh_board_frames()
 
     refresh_keyboard_colors()
 
     # Update keyboard window title if open
-    if keyboard_window is not None and keyboard_window.winfo_exists():
-        keyboard_window.title(t("keyboard_title"))
+    if keyboard_visible:
+        keyboards[current_language].widgets["window"].title(t("keyboard_title"))
 
     if info_window is not None and info_window.winfo_exists():
         info_window.destroy()
         info_window = None
 
 
+def show_hint():
+    """
+    Starts finding the best next guesses for the current game; poll_hint shows them once they are
+    ranked.
+    """
+    global hint_request
+
+    if game is None or game.game_over:
+        return
+
+    # in hard mode only the words using every revealed hint may be suggested; the opening book's
+    # second guesses ignore them
+    allowed = None
+    if game.constraints is not None and game.guesses:
+        allowed = game.candidate_index.satisfying(game.constraints)
+
+    # past the opening book, hints need the feedback matrix, which may still be being built
+    key = (game.language, game.cols)
+    if key not in hint_matrices and \
+            (allowed is not None or openings.lookup(game.language, game.feedback(), 3, game.cols) is None):
+        if key in hint_failures:
+            show_message(t("hint_title"), t("hint_failed_msg"), message_type="warning")
+        else:
+            show_message(t("hint_title"), t("hint_not_ready_msg"), message_type="info")
+        return
+
+    # ranking may take the whole latency budget; one hint at a time is ranked off the Tk thread
+    if hint_request is not None:
+        return
+    hint_request = (game_session, len(game.guesses))
+    threading.Thread(target=find_hint, args=(hint_request, game.language, game.feedback(), game.cols, allowed),
+                     name="hint", daemon=True).start()
+    app.after(LOAD_POLL_MS, poll_hint)
+
+
+def find_hint(request, language, feedback, length, allowed):
+    """
+    Runs on a hint thread: ranks the next guesses and posts them to hint_results.
+
+    Parameters:
+    - request: The hint_request the hint is for.
+    - language, feedback, length, allowed: Arguments of solver.suggest.
+    """
+    import solver  # numpy is only needed once a hint is asked for
+    try:
+        suggestions, _ = solver.suggest(language, feedback, k=3, length=length, allowed=allowed)
+    except Exception as e:
+        hint_results.put((request, e))
+        return
+    hint_results.put((request, suggestions))
+
+
+def poll_hint():
+    """
+    Checks on the Tk loop whether the hint being ranked is ready, and shows it unless the game has
+    moved on meanwhile.
+    """
+    global hint_request
+
+    try:
+        request, result = hint_results.get_nowait()
+    except queue.Empty:
+        app.after(LOAD_POLL_MS, poll_hint)
+        return
+    hint_request = None
+    if game is None or request != (game_session, len(game.guesses)):
+        return
+    if isinstance(result, Exception):
+        print(f"Could not find a hint: {result!r}", file=sys.stderr)
+        show_message(t("hint_title"), t("hint_failed_msg"), message_type="warning")
+    elif result:
+        words = ", ".join(s.word for s in result)
+        show_message(t("hint_title"), t("hint_msg") + "\n" + words, message_type="info")
+
+
 def on_close():
     """
     Handles the event when the main window is closed.
     Prompts the user for confirmation before quitting.
     """
-    confirm = show_message(t("quit_title"), t("quit_msg"), message_type="confirm")
-    if confirm:
-        app.destroy()
+    def answer(confirmed):
+        if confirmed:
+            solver = sys.modules.get("solver")
+            if solver is not None:
+                solver.shutdown_pool()
+            app.destroy()
+
+    show_message(t("quit_title"), t("quit_msg"), message_type="confirm", on_answer=answer)
 
 
 def open_info():
@@ -1022,55 +1925,96 @@ def open_info():
     info_window.title(t("about_title"))
     info_window.geometry("360x277")
     info_window.resizable(False, False)
-    info_window.configure(fg_color=COLOR_APP_BG)
+    info_window.configure(fg_color=palette.app_bg)
 
-    ctk.CTkLabel(info_window, text=t("about_intro"), font=FONT_15, text_color=COLOR_TEXT, justify="left",
-                 wraplength=300, bg_color=COLOR_APP_BG).pack(padx=(30, 0), pady=(30, 0), anchor="w")
+    ctk.CTkLabel(info_window, text=t("about_intro"), font=font(15), text_color=palette.text, justify="left",
+                 wraplength=300, bg_color=palette.app_bg).pack(padx=(30, 0), pady=(30, 0), anchor="w")
 
-    ctk.CTkLabel(info_window, text=t("about_rules"), font=FONT_15, text_color=COLOR_TEXT, justify="left",
+    ctk.CTkLabel(info_window, text=t("about_rules"), font=font(15), text_color=palette.text, justify="left",
                  wraplength=300).pack(pady=(5, 10), padx=30, anchor="w")
 
     # Color explanations
     for letter, state, color, state_desc in [
-        (t("example_letters")[0], "correct", COLOR_CORRECT, t("correct_description")),
-        (t("example_letters")[1], "misplaced", COLOR_MISPLACED, t("misplaced_description")),
-        (t("example_letters")[2], "wrong", COLOR_WRONG, t("wrong_description")),
+        (t("example_letters")[0], "correct", palette.correct, t("correct_description")),
+        (t("example_letters")[1], "misplaced", palette.misplaced, t("misplaced_description")),
+        (t("example_letters")[2], "wrong", palette.wrong, t("wrong_description")),
     ]:
-        frame = ctk.CTkFrame(info_window, fg_color=COLOR_APP_BG, width=300, height=40)
+        frame = ctk.CTkFrame(info_window, fg_color=palette.app_bg, width=300, height=40)
         frame.pack(pady=(0, 5), padx=30)
         info_frames.append(frame)
 
-        ctk.CTkLabel(frame, text=letter, font=FONT_20_BOLD,
-                     text_color=get_text_color(state), fg_color=color,
+        ctk.CTkLabel(frame, text=letter, font=font(20, "bold"),
+                     text_color=palette.state_text[state], fg_color=color,
                      width=40, height=40, corner_radius=5).place(x=0, y=0)
 
         ctk.CTkLabel(frame, text="= " + state_desc,
-                     font=FONT_13, text_color=COLOR_TEXT,
+                     font=font(13), text_color=palette.text,
                      wraplength=255, justify="left").place(x=45, rely=0.5, anchor="w")
 
 
-top = ctk.CTkFrame(app, width=360, height=30, fg_color=COLOR_APP_BG)
+def enable_metrics():
+    """
+    Instruments the hot paths by replacing them with timing wrappers, and counts widget configure calls.
+    Renderer flushes end the input-to-flush measurement that key presses start. Opening the on-screen
+    keyboard is recorded as keyboard.build the first time per layout and as keyboard.show afterwards.
+
+    Returns:
+    - The metrics.Metrics that collects the measurements.
+    """
+    collected = metrics.Metrics()
+    namespace = globals()
+    for name in HOT_PATHS:
+        namespace[name] = collected.wrap(namespace[name], name, starts_input=name in INPUT_PATHS)
+    Renderer.flush = collected.wrap(Renderer.flush, "render.flush", ends_input=True)
+    Animator.tick = collected.wrap(Animator.tick, "animation.tick")
+    keyboard_timing_hooks.append(lambda language, action, seconds: collected.observe("keyboard." + action, seconds))
+    collected.count_configures([ctk.CTk, ctk.CTkToplevel, ctk.CTkFrame, ctk.CTkLabel, ctk.CTkButton, ctk.CTkComboBox])
+
+    # callbacks registered before the functions were replaced
+    app.bind("<Key>", on_key)
+    lang_box.configure(command=on_language_change)
+    length_box.configure(command=on_length_change)
+    return collected
+
+
+top = ctk.CTkFrame(app, width=360, height=30, fg_color=palette.app_bg)
 top.pack(pady=(30, 0), padx=30)
 
-info_btn = ctk.CTkButton(top, text="?", width=60, height=30, fg_color=COLOR_BUTTON, hover_color=COLOR_BUTTON_HOVER,
-                         font=FONT_20_BOLD, text_color=COLOR_TEXT, corner_radius=5, command=open_info)
+info_btn = ctk.CTkButton(top, text="?", width=60, height=30, fg_color=palette.button,
+                         hover_color=palette.button_hover, font=font(20, "bold"), text_color=palette.text,
+                         corner_radius=5, command=open_info)
 info_btn.place(x=290, y=0)
 
+hint_btn = ctk.CTkButton(top, text="💡", width=60, height=30, fg_color=palette.button,
+                         hover_color=palette.button_hover, font=font(20, "bold"), text_color=palette.text,
+                         corner_radius=5, command=show_hint)
+hint_btn.place(x=0, y=0)
+
+archive_btn = ctk.CTkButton(top, text="📅", width=60, height=30, fg_color=palette.button,
+                            hover_color=palette.button_hover, font=font(20, "bold"), text_color=palette.text,
+                            corner_radius=5, command=open_archive)
+archive_btn.place(x=65, y=0)
+
+# centred in the gap between the archive and info buttons
+remaining_label = ctk.CTkLabel(top, text="", font=font(15), text_color=palette.text)
+remaining_label.place(x=208, rely=0.5, anchor="center")
+
 # Word grid
-frame = ctk.CTkFrame(app, fg_color=COLOR_BOARD_BG)
+frame = ctk.CTkFrame(app, fg_color=palette.board_bg)
 frame.pack(padx=30, pady=(10, 5))
 create_grid(frame)
 
-bottom = ctk.CTkFrame(app, width=360, fg_color=COLOR_APP_BG)
+bottom = ctk.CTkFrame(app, width=360, fg_color=palette.app_bg)
 bottom.pack()
 
 # Language label
-lang_label = ctk.CTkLabel(bottom, text=t("language_title"), font=FONT_15, text_color=COLOR_TEXT)
+lang_label = ctk.CTkLabel(bottom, text=t("language_title"), font=font(15), text_color=palette.text)
 lang_label.grid(row=0, column=0, sticky="w", padx=5)
 
 # Language dropdown
-lang_box = ctk.CTkComboBox(bottom, fg_color=COLOR_DROPDOWN, border_color=COLOR_BUTTON, button_color=COLOR_BUTTON,
-                           text_color=COLOR_TEXT, values=["English", "Norsk", "Українська"], width=130, font=FONT_15,
+lang_box = ctk.CTkComboBox(bottom, fg_color=palette.dropdown, border_color=palette.button,
+                           button_color=palette.button, text_color=palette.text,
+                           values=["English", "Norsk", "Українська"], width=130, font=font(15),
                            corner_radius=5)
 lang_box.set("English")
 lang_box.configure(state="readonly")
@@ -1078,17 +2022,51 @@ lang_box.grid(row=1, column=0, padx=(0, 10))
 lang_box.configure(command=on_language_change)
 
 current_language = lang_box.get()
-valid_words = load_words(current_language)
-secret_word = get_todays_word(valid_words)
-print("Today's word:", secret_word)
+
+# Word length dropdown, above the keyboard button; filled in once the dictionary is loaded
+length_box = ctk.CTkComboBox(bottom, fg_color=palette.dropdown, border_color=palette.button,
+                             button_color=palette.button, text_color=palette.text, values=[str(word_length)],
+                             width=60, height=28, font=font(15), corner_radius=5)
+length_box.set(str(word_length))
+length_box.configure(state="readonly")
+length_box.grid(row=0, column=2, padx=(10, 0), pady=(0, 4))
+length_box.configure(command=on_length_change)
+
+# Hard mode checkbox
+hard_box = ctk.CTkCheckBox(bottom, text=t("hard_mode_label"), font=font(15), text_color=palette.text,
+                           fg_color=palette.correct, hover_color=palette.button_hover, border_color=palette.button,
+                           checkbox_width=20, checkbox_height=20, corner_radius=5, command=on_hard_mode_change)
+hard_box.grid(row=2, column=0, sticky="w", pady=(8, 0))
+
+# Absurdle checkbox: no fixed word, every guess gets the least helpful answer
+adversarial_box = ctk.CTkCheckBox(bottom, text=t("adversarial_label"), font=font(15), text_color=palette.text,
+                                  fg_color=palette.correct, hover_color=palette.button_hover,
+                                  border_color=palette.button, checkbox_width=20, checkbox_height=20,
+                                  corner_radius=5, command=on_adversarial_change)
+adversarial_box.grid(row=2, column=1, columnspan=2, sticky="w", padx=5, pady=(8, 0))
+
+# Number of boards
+boards_label = ctk.CTkLabel(bottom, text=t("boards_title"), font=font(15), text_color=palette.text)
+boards_label.grid(row=3, column=0, sticky="w", padx=5, pady=(8, 0))
+
+boards_box = ctk.CTkComboBox(bottom, fg_color=palette.dropdown, border_color=palette.button,
+                             button_color=palette.button, text_color=palette.text,
+                             values=[str(count) for count in (1,) + BOARD_COUNTS], width=130, font=font(15),
+                             corner_radius=5)
+boards_box.set(str(board_count))
+boards_box.configure(state="readonly")
+boards_box.grid(row=3, column=1, pady=(8, 0))
+boards_box.configure(command=on_boards_change)
+
+load_game(current_language, puzzle_date, word_length, hard_mode, adversarial, board_count)
 
 # Theme Label
-theme_label = ctk.CTkLabel(bottom, text=t("theme_title"), font=FONT_15, text_color=COLOR_TEXT)
+theme_label = ctk.CTkLabel(bottom, text=t("theme_title"), font=font(15), text_color=palette.text)
 theme_label.grid(row=0, column=1, sticky="w", padx=5)
 
 # Theme Dropdown
-theme_box = ctk.CTkComboBox(bottom, fg_color=COLOR_DROPDOWN, border_color=COLOR_BUTTON, button_color=COLOR_BUTTON,
-                            text_color=COLOR_TEXT, values=list(t("themes").values()), font=FONT_15, corner_radius=5,
+theme_box = ctk.CTkComboBox(bottom, fg_color=palette.dropdown, border_color=palette.button, button_color=palette.button,
+                            text_color=palette.text, values=list(t("themes").values()), font=font(15), corner_radius=5,
                             width=130, height=30)
 theme_box.set(UI_STRINGS[current_language]["themes"][current_theme])
 theme_box.configure(state="readonly")
@@ -1096,10 +2074,45 @@ theme_box.grid(row=1, column=1)
 theme_box.configure(command=lambda t: on_theme_change(t))
 
 # On-screen keyboard button
-keyboard_btn = ctk.CTkButton(bottom, text="⌨️", command=open_keyboard, fg_color=COLOR_BUTTON,
-                             hover_color=COLOR_BUTTON_HOVER, font=FONT_20_BOLD, corner_radius=5, width=60, height=30)
+keyboard_btn = ctk.CTkButton(bottom, text="⌨️", command=open_keyboard, fg_color=palette.button,
+                             hover_color=palette.button_hover, font=font(20, "bold"), corner_radius=5, width=60,
+                             height=30)
 keyboard_btn.grid(row=1, column=2, padx=(10, 0))
 
 app.protocol("WM_DELETE_WINDOW", on_close)
 app.bind("<Key>", on_key)
-app.mainloop()
+mark("widgets")
+app.after_idle(first_frame)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Wordle")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print a timeline of the cold start once the game is ready, then quit")
+    parser.add_argument("--metrics", choices=metrics.FORMATS,
+                        help="time the UI's hot paths and write the measurements in this format on exit")
+    parser.add_argument("--metrics-file", help="file to write the metrics to instead of stdout")
+    parser.add_argument("--no-animations", action="store_true",
+                        help="reveal scored rows at once and do not shake rejected words")
+    parser.add_argument("--no-event-log", action="store_true",
+                        help=f"do not record key presses and guesses in {eventlog.log_folder}")
+    parser.add_argument("--no-snapshots", action="store_true",
+                        help=f"do not save the progress of games in {snapshot.snapshot_folder} and resume them")
+    args = parser.parse_args()
+    profile_startup = args.profile_startup
+    animate = not args.no_animations
+    if args.metrics:
+        app_metrics = enable_metrics()
+    if not args.no_event_log:
+        event_log = eventlog.EventLog()
+    if not args.no_snapshots:
+        snapshots = snapshot.SnapshotWriter()
+
+    app.mainloop()
+
+    if event_log is not None:
+        event_log.close()
+    if snapshots is not None:
+        snapshots.close()
+
+    if app_metrics is not None:
+        app_metrics.dump(args.metrics, args.metrics_file)
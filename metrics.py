@@ -0,0 +1,197 @@
+"""
+Opt-in latency and redraw instrumentation for the UI's hot paths.
+
+Nothing here runs unless it is installed: Metrics.wrap returns a timing wrapper that the caller puts
+in place of the original function, and count_configures patches configure on the given widget
+classes. Uninstrumented code keeps calling the original functions, so there is no overhead when
+metrics are off.
+
+Call latencies go into histograms with power-of-two buckets from 25µs. Every instrumented call also
+records how many widget configure calls happened while it ran, including those of nested
+instrumented calls. The results are written as JSON or in the Prometheus text format.
+"""
+import bisect
+import functools
+import json
+import time
+
+BUCKETS = tuple(25e-6 * 2 ** k for k in range(18))  # 25µs .. ~3.3s
+FORMATS = ("json", "prometheus")
+
+
+class Histogram:
+    """
+    Latency histogram with fixed buckets, in seconds.
+    """
+    __slots__ = ("counts", "count", "sum", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # the last bucket is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q):
+        """
+        Returns the upper bound of the bucket holding the q-quantile, or the maximum for the last bucket.
+
+        Parameters:
+        - q: Quantile between 0 and 1.
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(BUCKETS, self.counts):
+            seen += n
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self):
+        """
+        Returns the histogram as a JSON-serialisable dictionary.
+        """
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+            "max": self.max,
+            "buckets": [[bound, n] for bound, n in zip(BUCKETS + ("+Inf",), self.counts) if n],
+        }
+
+
+class Metrics:
+    """
+    Collects call latencies, configure counts and input-to-flush latency.
+    """
+
+    def __init__(self):
+        self.calls = {}  # name -> Histogram
+        self.call_configures = {}  # name -> configure calls made while it ran
+        self.configures = {}  # widget class name -> configure calls
+        self.configure_total = 0
+        self.input_started = None
+
+    def wrap(self, function, name, starts_input=False, ends_input=False):
+        """
+        Returns a wrapper of a function that records its latency and the configure calls it caused.
+
+        Parameters:
+        - function: The function to time.
+        - name: Name to report it under.
+        - starts_input: The function handles user input; starts the input-to-flush clock unless it is running.
+        - ends_input: The function draws pending changes; stops the input-to-flush clock.
+
+        Returns:
+        - The wrapper.
+        """
+        histogram = self.calls.setdefault(name, Histogram())
+        self.call_configures.setdefault(name, 0)
+        clock = time.perf_counter
+
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            configures = self.configure_total
+            start = clock()
+            if starts_input and self.input_started is None:
+                self.input_started = start
+            try:
+                return function(*args, **kwargs)
+            finally:
+                end = clock()
+                histogram.observe(end - start)
+                self.call_configures[name] += self.configure_total - configures
+                if ends_input and self.input_started is not None:
+                    self.calls.setdefault("input_to_flush", Histogram()).observe(end - self.input_started)
+                    self.input_started = None
+
+        timed.__wrapped__ = function
+        return timed
+
+    def observe(self, name, seconds):
+        """
+        Records a latency measured by the caller, for work that is not a single function call.
+
+        Parameters:
+        - name: Name to report it under.
+        - seconds: The latency.
+        """
+        self.calls.setdefault(name, Histogram()).observe(seconds)
+
+    def count_configures(self, widget_classes):
+        """
+        Patches configure on widget classes to count calls per class.
+
+        Parameters:
+        - widget_classes: The classes to patch. None of them should inherit configure from another one.
+        """
+        for cls in widget_classes:
+            original = cls.configure
+
+            def configure(widget, *args, _original=original, _name=cls.__name__, **kwargs):
+                self.configures[_name] = self.configures.get(_name, 0) + 1
+                self.configure_total += 1
+                return _original(widget, *args, **kwargs)
+
+            cls.configure = configure
+
+    def as_dict(self):
+        """
+        Returns every metric as a JSON-serialisable dictionary. Latencies are in seconds.
+        """
+        return {
+            "calls": {name: dict(h.summary(), configures=self.call_configures.get(name, 0))
+                      for name, h in self.calls.items() if h.count},
+            "configures": dict(self.configures),
+        }
+
+    def prometheus(self):
+        """
+        Returns every metric in the Prometheus text exposition format.
+        """
+        lines = ["# HELP wordle_call_seconds Latency of instrumented UI calls.",
+                 "# TYPE wordle_call_seconds histogram"]
+        for name, h in self.calls.items():
+            cumulative = 0
+            for bound, n in zip(BUCKETS + ("+Inf",), h.counts):
+                cumulative += n
+                lines.append(f'wordle_call_seconds_bucket{{function="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'wordle_call_seconds_sum{{function="{name}"}} {h.sum}')
+            lines.append(f'wordle_call_seconds_count{{function="{name}"}} {h.count}')
+
+        lines += ["# HELP wordle_call_configures_total Widget configure calls made during instrumented calls.",
+                  "# TYPE wordle_call_configures_total counter"]
+        for name, n in self.call_configures.items():
+            lines.append(f'wordle_call_configures_total{{function="{name}"}} {n}')
+
+        lines += ["# HELP wordle_widget_configures_total Widget configure calls per widget class.",
+                  "# TYPE wordle_widget_configures_total counter"]
+        for name, n in sorted(self.configures.items()):
+            lines.append(f'wordle_widget_configures_total{{widget="{name}"}} {n}')
+        return "\n".join(lines) + "\n"
+
+    def dump(self, fmt="json", path=None):
+        """
+        Writes the metrics to a file, or prints them.
+
+        Parameters:
+        - fmt: "json" or "prometheus".
+        - path: File to write, or None for stdout.
+        """
+        text = self.prometheus() if fmt == "prometheus" else json.dumps(self.as_dict(), indent=2) + "\n"
+        if path is None:
+            print(text, end="")
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
@@ -0,0 +1,153 @@
+"""
+Games played on several boards at once (Quordle, Octordle, Sedecordle): every guess goes to all
+boards that are not solved yet, and each board has its own secret word.
+
+A guess is scored against every open board in one engine.score_batch call instead of one
+score_guess per board; the view then redraws every board through the same diffing renderer.
+"""
+from engine import ACCEPTED, COLS, LOST, STATE_NAMES, WON, Game, GuessResult, decode_pattern, priority, \
+    rows_for_boards, score_batch
+
+BOARD_COUNTS = (4, 8, 16)
+
+
+class MultiGame(Game):
+    """
+    Headless state of a game on several boards. The typed letters, the cursor and the guesses are
+    shared; tile states, keyboard states, candidates and patterns are kept per board.
+
+    tile_states, keyboard_state, patterns, candidates and feedback() follow the focused board, which the
+    player can change and which moves on to the next open board once it is solved, so the view and the
+    solver can treat it like a single game.
+    """
+    __slots__ = ("boards", "secret_words", "solved", "board_tile_states", "board_keyboards", "board_patterns",
+                 "board_candidates", "focus")
+
+    def __init__(self, language, valid_words, secret_words, rows=None, cols=COLS, candidate_index=None, prefixes=None):
+        """
+        Parameters:
+        - language: Language name as a string, used to validate the alphabet of guesses.
+        - valid_words: Collection of allowed guesses in uppercase.
+        - secret_words: The word to guess on every board.
+        - rows: Number of attempts; rows_for_boards by default.
+        - cols: Number of letters per word.
+        - candidate_index: Optional candidates.CandidateIndex over the dictionary, used to track the
+          words still consistent with each board's feedback.
+        - prefixes: Optional dawg.Dawg over the dictionary; see engine.Game.
+        """
+        boards = len(secret_words)
+        super().__init__(language, valid_words, ", ".join(secret_words), rows or rows_for_boards(boards), cols,
+                         candidate_index, prefixes=prefixes)
+        self.boards = boards
+        self.secret_words = [word.upper() for word in secret_words]
+
+        self.solved = [None] * boards  # row each board was solved in
+        self.board_tile_states = [[[None] * cols for _ in range(self.rows)] for _ in range(boards)]
+        self.board_keyboards = [{} for _ in range(boards)]
+        self.board_patterns = [[] for _ in range(boards)]
+        self.board_candidates = [self.candidates] * boards
+        self.focus = None
+        self.focus_board(0)
+
+    def board_states(self, board):
+        return self.board_tile_states[board]
+
+    def open_boards(self):
+        if self.game_over:
+            return ()
+        return tuple(board for board, row in enumerate(self.solved) if row is None)
+
+    def focus_board(self, board):
+        """
+        Makes a board the one the keyboard colours and hints are for.
+
+        Parameters:
+        - board: Index of the board.
+
+        Returns:
+        - True if the focus changed.
+        """
+        if board == self.focus or not 0 <= board < self.boards:
+            return False
+        self.focus = board
+        self.tile_states = self.board_tile_states[board]
+        self.keyboard_state = self.board_keyboards[board]
+        self.patterns = self.board_patterns[board]
+        self.candidates = self.board_candidates[board]
+        return True
+
+    def apply_guess(self, guess):
+        """
+        Scores an already validated guess against every open board at once and advances the game.
+
+        Parameters:
+        - guess: The guessed word as an uppercase string.
+
+        Returns:
+        - A GuessResult with status ACCEPTED, WON or LOST. Its states are those of the focused board;
+          board_states has the rest.
+        """
+        row = self.current_row
+        self.letters[row] = list(guess)
+        self.previous_guesses.add(guess)
+        self.guesses.append(guess)
+
+        boards = self.open_boards()
+        codes = score_batch(guess, [self.secret_words[board] for board in boards])
+
+        focus_states = None
+        for board, code in zip(boards, codes):
+            states = [STATE_NAMES[state] for state in decode_pattern(code, self.cols)]
+            self.board_tile_states[board][row] = states
+            self.board_patterns[board].append(code)
+
+            keyboard = self.board_keyboards[board]
+            for ch, state in zip(guess, states):
+                old_state = keyboard.get(ch)
+                if not old_state or priority[old_state] < priority[state]:
+                    keyboard[ch] = state
+
+            if self.candidate_index is not None:
+                self.board_candidates[board] = self.candidate_index.constrain(self.board_candidates[board], guess,
+                                                                              states)
+            if guess == self.secret_words[board]:
+                self.solved[board] = row
+            if board == self.focus:
+                focus_states = states
+
+        if all(solved is not None for solved in self.solved):
+            self.game_over = True
+            self.won = True
+            return GuessResult(WON, guess, row, focus_states)
+
+        # a solved board hands the focus to the next open one
+        if self.solved[self.focus] is not None:
+            self.focus_board(next(board for board, solved in enumerate(self.solved) if solved is None))
+        else:
+            self.candidates = self.board_candidates[self.focus]
+
+        self.current_row += 1
+        self.current_col = 0
+
+        if self.current_row >= self.rows:
+            self.game_over = True
+            self.secret_word = ", ".join(word for word, solved in zip(self.secret_words, self.solved)
+                                         if solved is None)
+            return GuessResult(LOST, guess, row, focus_states)
+
+        return GuessResult(ACCEPTED, guess, row, focus_states)
+
+    def remaining_count(self):
+        """
+        Returns the number of words still consistent with the feedback of the open boards, or None
+        without a candidate index.
+        """
+        if self.candidate_index is None:
+            return None
+        return sum(self.candidate_index.count(self.board_candidates[board]) for board in self.open_boards())
+
+    def feedback(self):
+        """
+        Returns the guesses scored on the focused board as a list of (guess, pattern code) pairs.
+        """
+        return list(zip(self.guesses, self.board_patterns[self.focus]))
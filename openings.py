@@ -0,0 +1,185 @@
+"""
+Opening book: the best first guess of a language's dictionary and the best second guess after each
+feedback the first one can get (up to 3 ** length patterns), as ranked by the solver. These are the
+two most expensive rankings, since the candidates are the whole dictionary or a large part of it;
+with the book, hints for the first two turns are a table lookup.
+
+Books are small JSON files in dictionaries/openings/, keyed like the feedback caches by the digest
+of the dictionary, and ship with the game for the default word length. A book that does not match
+the current dictionary is ignored, and the solver ranks as usual. Rebuild the books with:
+
+    python openings.py [--length N] [--force] [language ...]
+
+which fans the rankings of every pattern out over the solver's process pool at once.
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+from dictionary import load_dictionary
+from engine import COLS, lang_files
+
+book_folder = "dictionaries/openings"
+
+BOOK_SIZE = 5  # suggestions kept per position; hints asking for more are ranked by the solver
+
+_books = {}
+
+
+def book_path(language, length=COLS):
+    """
+    Returns the path of the opening book for a language's current dictionary of one word length.
+
+    Parameters:
+    - language: Language name as a string.
+    - length: Word length.
+    """
+    dictionary = load_dictionary(language, length)
+    name = os.path.splitext(os.path.basename(dictionary.path))[0]
+    return os.path.join(book_folder, f"{name}-{dictionary.digest}.json")
+
+
+def load_book(language, length=COLS):
+    """
+    Loads the opening book for a language's words of one length. Books are read once per process.
+
+    Parameters:
+    - language: Language name as a string.
+    - length: Word length.
+
+    Returns:
+    - The book as a dictionary, or None if there is none for the current dictionary.
+    """
+    path = book_path(language, length)
+    cached = _books.get((language, length))
+    if cached is not None and cached[0] == path:
+        return cached[1]
+
+    try:
+        with open(path, encoding="utf-8") as f:
+            book = json.load(f)
+    except (OSError, ValueError):
+        book = None
+    _books[language, length] = (path, book)
+    return book
+
+
+def lookup(language, feedback, k, length=COLS):
+    """
+    Looks up the best next guesses of a game in its opening book.
+
+    Parameters:
+    - language: Language name as a string.
+    - feedback: List of (guess, pattern code) pairs, as returned by engine.Game.feedback().
+    - k: Number of suggestions.
+    - length: Word length of the game.
+
+    Returns:
+    - List of (word, entropy, expected remaining, is candidate) best first, or None if the book does
+      not cover the position: after two guesses, after a first guess other than the book's, for
+      more than BOOK_SIZE suggestions or without a book.
+    """
+    if len(feedback) > 1:
+        return None
+    book = load_book(language, length)
+    if book is None or k > book["size"]:
+        return None
+    if not feedback:
+        return book["opener"][:k]
+
+    guess, code = feedback[0]
+    if guess != book["opener"][0][0]:
+        return None
+    # a pattern missing from the book leaves no candidates
+    return book["replies"].get(str(code), [])[:k]
+
+
+def build_book(language, length=COLS, size=BOOK_SIZE):
+    """
+    Ranks the first guesses of a language's dictionary and the second guesses after every pattern
+    of the best one, and writes them to the language's opening book.
+
+    Parameters:
+    - language: Language name as a string.
+    - length: Word length.
+    - size: Suggestions to keep per position.
+
+    Returns:
+    - Path of the book.
+    """
+    import numpy as np
+
+    import solver
+    from feedback import load_feedback_matrix
+
+    matrix = load_feedback_matrix(language, length)
+    words = matrix.words
+    # every word is a candidate for the first guess
+    opener = [(words[row], entropy, expected, True)
+              for row, entropy, expected in solver.rank_many(matrix, [np.arange(len(words))], size)[0]]
+
+    first = np.asarray(matrix.patterns[matrix.index[opener[0][0]]])
+    replies = {}
+    candidate_sets = {}
+    for code in np.unique(first):
+        candidates = np.flatnonzero(first == code)
+        # as in solver.suggest: with one or two words left, guessing one of them is always best
+        if len(candidates) <= 2:
+            replies[str(code)] = [(words[row], float(len(candidates) - 1), 1.0, True) for row in candidates]
+        else:
+            candidate_sets[str(code)] = candidates
+
+    ranked = solver.rank_many(matrix, list(candidate_sets.values()), size)
+    for (code, candidates), best in zip(candidate_sets.items(), ranked):
+        replies[code] = [(words[row], entropy, expected, bool(first[row] == int(code)))
+                         for row, entropy, expected in best]
+
+    path = book_path(language, length)
+    book = {"language": language, "length": length, "digest": load_dictionary(language, length).digest,
+            "size": size, "opener": opener, "replies": dict(sorted(replies.items(), key=lambda item: int(item[0])))}
+
+    os.makedirs(book_folder, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(book, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+    # books of earlier versions of the dictionary can never match again
+    name = os.path.basename(path).rsplit("-", 1)[0]
+    for old_path in glob.glob(os.path.join(book_folder, f"{name}-*.json")):
+        if old_path != path:
+            os.remove(old_path)
+    return path
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Build the opening books")
+    parser.add_argument("--length", type=int, default=COLS, help="word length")
+    parser.add_argument("--force", action="store_true", help="rebuild books that are up to date")
+    parser.add_argument("languages", nargs="*", default=list(lang_files))
+    args = parser.parse_args(argv)
+
+    import solver
+    try:
+        for language in args.languages:
+            if not len(load_dictionary(language, args.length)):
+                print(f"{language}: no {args.length}-letter words")
+                continue
+            path = book_path(language, args.length)
+            if os.path.exists(path) and not args.force:
+                print(f"{language}: up to date ({path})")
+                continue
+
+            start = time.perf_counter()
+            build_book(language, args.length)
+            print(f"{language}: built {path} ({os.path.getsize(path) / 1024:.0f} KiB) "
+                  f"in {time.perf_counter() - start:.1f}s")
+    finally:
+        solver.shutdown_pool()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,148 @@
+"""
+Diff-based widget rendering. The UI states what every widget should look like; the renderer
+remembers what was last drawn and, once per idle tick, calls configure only on the widgets and
+properties that actually changed. Items drawn on a canvas take part through CanvasTile.
+"""
+
+
+class Renderer:
+    """
+    Batches and diffs widget updates. Widgets are registered under any hashable key.
+    """
+
+    def __init__(self, root):
+        """
+        Parameters:
+        - root: The Tk root, used to schedule flushes with after_idle.
+        """
+        self.root = root
+        self.widgets = {}
+        self.desired = {}
+        self.drawn = {}
+        self.dirty = set()
+        self.scheduled = None
+
+        # counters to verify how much each frame redraws
+        self.frames = 0
+        self.configures = 0
+        self.last_frame_configures = 0
+        self.max_frame_configures = 0
+
+    def add(self, key, widget, **drawn):
+        """
+        Registers a widget.
+
+        Parameters:
+        - key: Key to refer to the widget by.
+        - widget: The CustomTkinter widget.
+        - drawn: The properties the widget was created with.
+        """
+        self.widgets[key] = widget
+        self.drawn[key] = dict(drawn)
+        self.desired[key] = dict(drawn)
+
+    def set(self, key, **props):
+        """
+        Sets the desired properties of a widget. Nothing is drawn until the next flush.
+
+        Parameters:
+        - key: The widget's key.
+        - props: Properties to pass to configure, e.g. text or fg_color.
+        """
+        desired = self.desired[key]
+        drawn = self.drawn[key]
+        for name, value in props.items():
+            desired[name] = value
+            if drawn.get(name, self) != value:
+                self.dirty.add(key)
+
+        if self.dirty and self.scheduled is None:
+            self.scheduled = self.root.after_idle(self.flush)
+
+    def get(self, key, name, default=None):
+        """
+        Returns a desired property of a widget.
+        """
+        return self.desired[key].get(name, default)
+
+    def flush(self):
+        """
+        Applies every pending change with one configure call per changed widget.
+        """
+        self.scheduled = None
+        count = 0
+        for key in self.dirty:
+            widget = self.widgets[key]
+            drawn = self.drawn[key]
+            changed = {name: value for name, value in self.desired[key].items() if drawn.get(name, self) != value}
+            if not changed:
+                continue
+            if widget.winfo_exists():
+                widget.configure(**changed)
+                count += 1
+            drawn.update(changed)
+        self.dirty.clear()
+
+        self.frames += 1
+        self.configures += count
+        self.last_frame_configures = count
+        self.max_frame_configures = max(self.max_frame_configures, count)
+
+    def flush_now(self):
+        """
+        Applies pending changes immediately instead of waiting for the idle callback.
+        """
+        if self.scheduled is not None:
+            self.root.after_cancel(self.scheduled)
+        self.flush()
+
+    def stats(self):
+        """
+        Returns the redraw counters as a dictionary.
+        """
+        return {
+            "frames": self.frames,
+            "configures": self.configures,
+            "last_frame": self.last_frame_configures,
+            "max_frame": self.max_frame_configures,
+        }
+
+
+class CanvasTile:
+    """
+    A board tile drawn on a canvas as a rectangle and a text item. It is configured like a label
+    (text, fg_color, text_color, border_color), so a Renderer can diff and batch it like a widget
+    while a whole board costs one widget instead of one per tile.
+    """
+    __slots__ = ("canvas", "rect", "label")
+
+    def __init__(self, canvas, rect, label=None):
+        """
+        Parameters:
+        - canvas: The canvas the items are on.
+        - rect: Id of the rectangle item.
+        - label: Id of the text item, or None for a tile without text.
+        """
+        self.canvas = canvas
+        self.rect = rect
+        self.label = label
+
+    def configure(self, text=None, fg_color=None, text_color=None, border_color=None):
+        rect_options = {}
+        if fg_color is not None:
+            rect_options["fill"] = fg_color
+        if border_color is not None:
+            rect_options["outline"] = border_color
+        if rect_options:
+            self.canvas.itemconfigure(self.rect, **rect_options)
+
+        label_options = {}
+        if text is not None:
+            label_options["text"] = text
+        if text_color is not None:
+            label_options["fill"] = text_color
+        if label_options and self.label is not None:
+            self.canvas.itemconfigure(self.label, **label_options)
+
+    def winfo_exists(self):
+        return self.canvas.winfo_exists()
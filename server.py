@@ -0,0 +1,339 @@
+"""
+Multi-session game server: one process hosts many concurrent games of the daily puzzle over a
+small HTTP/JSON API built directly on asyncio streams.
+
+    python server.py [--host 127.0.0.1] [--port 8080]
+
+Endpoints:
+- POST /games                  {"language": "English", "length": 5, "date": "2025-06-01", "hard_mode": false,
+                                "adversarial": false}   -> new game state
+- GET  /games/<id>                                      -> game state
+- POST /games/<id>/guess       {"word": "CRANE"}        -> guess result and game state
+
+Dictionaries and today's word are loaded once per language and word length and shared by every
+session. The optional "length" picks the word length (default 5) and the optional "date" plays a
+past day's puzzle from the archive. In hard mode every guess has to use all revealed hints. An
+adversarial ("Absurdle") game has no fixed word: each guess gets the answer that keeps the most
+words possible.
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import secrets
+import time
+
+import engine
+from dictionary import WORD_LENGTHS, get_todays_word, load_dictionary
+
+MAX_SESSIONS = 100_000
+SESSION_TTL = 6 * 60 * 60
+MAX_BODY = 4096
+
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class Puzzle:
+    """
+    Immutable per-language and word length data shared by all sessions: the dictionary and the word of the day.
+    """
+    __slots__ = ("language", "dictionary", "date", "secret_word")
+
+    def __init__(self, language, date, length=engine.COLS):
+        self.language = language
+        self.dictionary = load_dictionary(language, length)
+        self.date = date
+        self.secret_word = get_todays_word(self.dictionary)
+
+
+class Session:
+    """
+    A player's game on the server.
+    """
+    __slots__ = ("id", "game", "date", "last_seen")
+
+    def __init__(self, session_id, puzzle, date=None, hard_mode=False, adversarial=False):
+        """
+        Parameters:
+        - session_id: The session's id.
+        - puzzle: Today's Puzzle for the session's language.
+        - date: A past date to play from the archive, or None for today.
+        - hard_mode: Require every guess to use all revealed hints.
+        - adversarial: Let an adversary pick the answer to each guess instead of the date's word.
+        """
+        self.id = session_id
+        if date is None or date == puzzle.date:
+            date, secret_word = puzzle.date, puzzle.secret_word
+        else:
+            secret_word = puzzle.dictionary.word_for_date(date)
+        adversary = None
+        if adversarial:
+            # numpy is only needed by servers that host adversarial games
+            from adversary import Adversary
+            adversary = Adversary(puzzle.dictionary)
+        self.game = engine.Game(puzzle.language, puzzle.dictionary, secret_word, cols=puzzle.dictionary.length,
+                                hard_mode=hard_mode, adversary=adversary)
+        self.date = date
+        self.last_seen = time.monotonic()
+
+    def state(self):
+        """
+        Returns the public state of the game as a JSON-serialisable dictionary.
+        The answer is only included once the game is over.
+        """
+        game = self.game
+        state = {
+            "id": self.id,
+            "language": game.language,
+            "length": game.cols,
+            "hard_mode": game.constraints is not None,
+            "adversarial": game.adversary is not None,
+            "date": self.date.isoformat(),
+            "guesses": [{"word": guess, "states": game.tile_states[row]} for row, guess in enumerate(game.guesses)],
+            "keyboard": game.keyboard_state,
+            "attempts_left": game.rows - len(game.guesses),
+            "game_over": game.game_over,
+            "won": game.won,
+        }
+        if game.game_over:
+            state["answer"] = game.secret_word
+        return state
+
+
+class GameServer:
+    """
+    Holds the shared puzzles and the sessions, and answers API requests.
+    """
+
+    def __init__(self, max_sessions=MAX_SESSIONS, session_ttl=SESSION_TTL):
+        self.max_sessions = max_sessions
+        self.session_ttl = session_ttl
+        self.puzzles = {}
+        self.sessions = {}
+        self.requests = 0
+        self.expiry_task = None
+
+    def puzzle(self, language, length=engine.COLS):
+        """
+        Returns today's shared puzzle for a language and word length.
+
+        Parameters:
+        - language: Language name as a string.
+        - length: Word length.
+        """
+        if not isinstance(language, str) or language not in engine.lang_files:
+            raise HTTPError(400, f"unknown language {language!r}")
+        if not isinstance(length, int) or isinstance(length, bool) or length not in WORD_LENGTHS:
+            raise HTTPError(400, f"length must be between {WORD_LENGTHS.start} and {WORD_LENGTHS.stop - 1}")
+
+        today = datetime.date.today()
+        puzzle = self.puzzles.get((language, length))
+        if puzzle is None or puzzle.date != today:
+            try:
+                puzzle = self.puzzles[language, length] = Puzzle(language, today, length)
+            except LookupError:
+                raise HTTPError(400, f"there are no {length}-letter words in {language}")
+        return puzzle
+
+    def new_session(self, language, date=None, length=engine.COLS, hard_mode=False, adversarial=False):
+        """
+        Starts a new game.
+
+        Parameters:
+        - language: Language name as a string.
+        - date: A past date to play from the archive, or None for today.
+        - length: Word length.
+        - hard_mode: Require every guess to use all revealed hints.
+        - adversarial: Let an adversary pick the answer to each guess.
+
+        Returns:
+        - The new Session.
+        """
+        puzzle = self.puzzle(language, length)
+        if date is not None and date > puzzle.date:
+            raise HTTPError(400, "future puzzles are not available")
+
+        if len(self.sessions) >= self.max_sessions:
+            self.expire_sessions()
+            if len(self.sessions) >= self.max_sessions:
+                # dicts keep insertion order, so the first session is the oldest
+                del self.sessions[next(iter(self.sessions))]
+
+        session_id = secrets.token_urlsafe(9)
+        session = self.sessions[session_id] = Session(session_id, puzzle, date, hard_mode, adversarial)
+        return session
+
+    def get_session(self, session_id):
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise HTTPError(404, "no such game")
+        session.last_seen = time.monotonic()
+        return session
+
+    def expire_sessions(self):
+        """
+        Drops sessions that have been idle for longer than the session TTL.
+        """
+        cutoff = time.monotonic() - self.session_ttl
+        for session_id in [s.id for s in self.sessions.values() if s.last_seen < cutoff]:
+            del self.sessions[session_id]
+
+    def handle(self, method, path, body):
+        """
+        Routes an API request.
+
+        Parameters:
+        - method: HTTP method.
+        - path: Request path.
+        - body: Parsed JSON body, or None.
+
+        Returns:
+        - Tuple (HTTP status, JSON-serialisable response).
+        """
+        self.requests += 1
+        if body is not None and not isinstance(body, dict):
+            raise HTTPError(400, "expected a JSON object")
+        parts = [part for part in path.split("?", 1)[0].split("/") if part]
+
+        if parts == ["games"]:
+            if method != "POST":
+                raise HTTPError(405, "use POST")
+            body = body or {}
+            date = None
+            if body.get("date") is not None:
+                try:
+                    if not isinstance(body["date"], str):
+                        raise TypeError
+                    date = datetime.date.fromisoformat(body["date"])
+                except (TypeError, ValueError):
+                    raise HTTPError(400, "date must be YYYY-MM-DD")
+            # only JSON true turns a mode on; "false" or 1 do not
+            session = self.new_session(body.get("language", "English"), date, body.get("length", engine.COLS),
+                                       body.get("hard_mode") is True, body.get("adversarial") is True)
+            return 201, session.state()
+
+        if len(parts) == 2 and parts[0] == "games":
+            if method != "GET":
+                raise HTTPError(405, "use GET")
+            return 200, self.get_session(parts[1]).state()
+
+        if len(parts) == 3 and parts[0] == "games" and parts[2] == "guess":
+            if method != "POST":
+                raise HTTPError(405, "use POST")
+            word = (body or {}).get("word")
+            if not isinstance(word, str):
+                raise HTTPError(400, "missing word")
+
+            session = self.get_session(parts[1])
+            result = session.game.guess(word)
+            response = {"state": session.state()}
+            if result is None:
+                response["status"] = "game_over"
+            else:
+                response["status"] = result.status
+                response["states"] = result.states
+                if result.status == engine.HARD_MODE:
+                    response["violation"] = list(session.game.constraints.check(result.guess))
+            return 200, response
+
+        raise HTTPError(404, "not found")
+
+    async def serve_connection(self, reader, writer):
+        """
+        Serves HTTP/1.1 requests on one connection until the client closes it.
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    method, path, version = request_line.decode("latin-1").split()
+                    length = int(headers.get("content-length", 0))
+                    if length > MAX_BODY:
+                        raise HTTPError(413, "body too large")
+                    body = json.loads(await reader.readexactly(length)) if length else None
+                    status, response = self.handle(method, path, body)
+                except HTTPError as e:
+                    status, response = e.status, {"error": str(e)}
+                except (ValueError, UnicodeDecodeError):
+                    status, response = 400, {"error": "malformed request"}
+                    version = "HTTP/1.0"
+                except Exception as e:
+                    # the client always gets an answer, and the connection is not reused
+                    status, response = 500, {"error": f"internal error: {type(e).__name__}"}
+                    version = "HTTP/1.0"
+
+                # an oversized body is left unread, so the connection cannot be reused
+                keep_alive = (version == "HTTP/1.1" and status != 413
+                              and headers.get("connection", "").lower() != "close")
+                payload = json.dumps(response, ensure_ascii=False).encode("utf-8")
+                writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                             f"Content-Type: application/json; charset=utf-8\r\n"
+                             f"Content-Length: {len(payload)}\r\n"
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1")
+                             + payload)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def expire_periodically(self):
+        while True:
+            await asyncio.sleep(min(self.session_ttl, 60))
+            self.expire_sessions()
+
+    async def start(self, host="127.0.0.1", port=8080):
+        """
+        Starts listening.
+
+        Returns:
+        - The asyncio server. Its bound port is server.sockets[0].getsockname()[1].
+        """
+        for language in engine.lang_files:
+            self.puzzle(language)
+        server = await asyncio.start_server(self.serve_connection, host, port)
+        self.expiry_task = asyncio.create_task(self.expire_periodically())
+        return server
+
+
+async def serve(host, port):
+    game_server = GameServer()
+    server = await game_server.start(host, port)
+    print(f"Serving on http://{host}:{server.sockets[0].getsockname()[1]}")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Wordle game server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
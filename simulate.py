@@ -0,0 +1,315 @@
+"""
+Headless self-play: plays many games with the real engine (engine.Game, ROWS and COLS) against a
+pluggable strategy over a process pool, and reports the guess-count distribution, failure rate,
+throughput and where the time went.
+
+    python simulate.py [--language English] [--length 5] [--strategy entropy] [--hard] [--games N] [--seed S]
+                       [--workers W] [--max-failure-rate R] [--json]
+
+Without --games every word of the dictionary is played once as the answer. A strategy is one of the
+built-in names below or "module:callable"; the callable gets the language and the word length and
+returns an object with a next_guess(game) method. With --hard every game is played in hard mode,
+where game.constraints holds the hints every guess must use.
+"""
+import argparse
+import concurrent.futures
+import importlib
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+
+import engine
+from candidates import load_candidate_index
+from dictionary import load_dictionary
+
+# Games handed to a worker at once.
+CHUNK_GAMES = 256
+
+_worker = {}
+
+
+class FirstCandidateStrategy:
+    """
+    Always guesses the first word still consistent with the feedback.
+    """
+
+    def __init__(self, language, length=engine.COLS):
+        pass
+
+    def next_guess(self, game):
+        lowest = game.candidates & -game.candidates
+        return game.candidate_index.words[lowest.bit_length() - 1]
+
+
+class RandomCandidateStrategy:
+    """
+    Guesses a random word still consistent with the feedback.
+    """
+
+    def __init__(self, language, length=engine.COLS, seed=0):
+        self.random = random.Random(seed)
+
+    def next_guess(self, game):
+        return self.random.choice(game.remaining_words())
+
+
+class EntropyStrategy:
+    """
+    Guesses the word with the highest expected information, like the hint button. In hard mode
+    only the words that use every revealed hint are considered. The first two guesses come from the
+    opening book when there is one.
+    Runs in-process; parallelism comes from the simulation pool.
+    """
+
+    def __init__(self, language, length=engine.COLS):
+        import openings
+        import solver
+        from feedback import load_feedback_matrix
+
+        self.openings = openings
+        self.solver = solver
+        self.language = language
+        self.length = length
+        self.matrix = load_feedback_matrix(language, length)
+        self.all_rows = np.arange(len(self.matrix.words))
+        self.pattern_count = 3 ** length
+        self.opener = None
+
+    def next_guess(self, game):
+        if not game.guesses and self.opener is not None:
+            return self.opener
+        # hard mode restricts the second guess, which the book does not
+        if not game.guesses or game.constraints is None:
+            entries = self.openings.lookup(self.language, game.feedback(), 1, self.length)
+            if entries:
+                return entries[0][0]
+
+        mask = self.solver.candidate_mask(self.matrix.patterns, self.matrix.index, game.feedback())
+        candidates = np.flatnonzero(mask)
+        if len(candidates) <= 2:
+            return self.matrix.words[candidates[0]]
+
+        rows = self.all_rows
+        if game.constraints is not None:
+            allowed = game.candidate_index.satisfying(game.constraints).to_bytes((len(rows) + 7) // 8, "little")
+            rows = np.flatnonzero(np.unpackbits(np.frombuffer(allowed, dtype=np.uint8), bitorder="little")[:len(rows)])
+
+        entropy, _ = self.solver.score_block(self.matrix.patterns, rows, candidates, self.pattern_count)
+        best = rows[np.lexsort((~mask[rows], -entropy))[0]]
+        guess = self.matrix.words[best]
+        if not game.guesses:
+            self.opener = guess
+        return guess
+
+
+STRATEGIES = {
+    "first": FirstCandidateStrategy,
+    "random": RandomCandidateStrategy,
+    "entropy": EntropyStrategy,
+}
+
+
+def load_strategy(name, language, length=engine.COLS):
+    """
+    Creates a strategy by built-in name or "module:callable" path.
+
+    Parameters:
+    - name: Strategy name.
+    - language: Language name as a string.
+    - length: Word length.
+    """
+    if name in STRATEGIES:
+        return STRATEGIES[name](language, length)
+    module_name, _, attr = name.partition(":")
+    return getattr(importlib.import_module(module_name), attr)(language, length)
+
+
+def play(secret, dictionary, index, strategy, timings, hard_mode=False):
+    """
+    Plays one game to the end.
+
+    Parameters:
+    - secret: The answer.
+    - dictionary: Allowed guesses.
+    - index: candidates.CandidateIndex over the dictionary.
+    - strategy: Object with a next_guess(game) method.
+    - timings: Counter of seconds per stage, updated in place.
+    - hard_mode: Play in hard mode.
+
+    Returns:
+    - Number of guesses used, or 0 if the game was lost.
+    """
+    clock = time.perf_counter
+
+    start = clock()
+    game = engine.Game(dictionary.language, dictionary, secret, cols=dictionary.length, candidate_index=index,
+                       hard_mode=hard_mode)
+    timings["setup"] += clock() - start
+
+    while not game.game_over:
+        start = clock()
+        guess = strategy.next_guess(game)
+        timings["strategy"] += clock() - start
+
+        start = clock()
+        for ch in guess:
+            game.type_letter(ch)
+        result = game.submit()
+        timings["scoring"] += clock() - start
+
+        if result.states is None:
+            raise ValueError(f"strategy guessed {guess!r} for {secret!r}: {result.status}")
+
+    return len(game.guesses) if game.won else 0
+
+
+def _init_worker(language, length, strategy_name, hard_mode):
+    _worker["hard_mode"] = hard_mode
+    _worker["dictionary"] = load_dictionary(language, length)
+    _worker["index"] = load_candidate_index(language, length)
+    _worker["strategy"] = load_strategy(strategy_name, language, length)
+
+
+def _play_chunk(task):
+    dictionary = _worker["dictionary"]
+    kind, a, b = task
+    if kind == "range":
+        secrets = (dictionary[i] for i in range(a, b))
+    else:
+        rng = random.Random(a)
+        secrets = (dictionary[rng.randrange(len(dictionary))] for _ in range(b))
+
+    guesses = Counter()
+    timings = Counter()
+    for secret in secrets:
+        guesses[play(secret, dictionary, _worker["index"], _worker["strategy"], timings, _worker["hard_mode"])] += 1
+    return guesses, timings
+
+
+def make_tasks(count, games, seed):
+    """
+    Splits the simulation into chunks for the pool.
+
+    Parameters:
+    - count: Number of words in the dictionary.
+    - games: Number of random games, or None to play every word once.
+    - seed: Seed for the random games.
+
+    Returns:
+    - List of ("range", start, stop) or ("sample", chunk seed, games) tuples.
+    """
+    if games is None:
+        return [("range", start, min(start + CHUNK_GAMES, count)) for start in range(0, count, CHUNK_GAMES)]
+
+    rng = random.Random(seed)
+    return [("sample", rng.getrandbits(64), min(CHUNK_GAMES, games - start)) for start in range(0, games, CHUNK_GAMES)]
+
+
+def simulate(language, strategy="entropy", games=None, seed=0, workers=None, length=engine.COLS, hard_mode=False):
+    """
+    Runs a simulation.
+
+    Parameters:
+    - language: Language name as a string.
+    - strategy: Strategy name, see load_strategy.
+    - games: Number of random games, or None to play every word once.
+    - seed: Seed for the random games.
+    - workers: Number of worker processes; defaults to one per core.
+    - length: Word length.
+    - hard_mode: Play every game in hard mode.
+
+    Returns:
+    - Dictionary with the results.
+    """
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+
+    # Build shared artifacts before forking so workers only map them.
+    count = len(load_dictionary(language, length))
+    load_candidate_index(language, length)
+    if strategy == "entropy":
+        from feedback import load_feedback_matrix
+        load_feedback_matrix(language, length)
+    prepared = time.perf_counter()
+
+    guesses = Counter()
+    timings = Counter()
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in methods else None)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker,
+                                                initargs=(language, length, strategy, hard_mode)) as pool:
+        for chunk_guesses, chunk_timings in pool.map(_play_chunk, make_tasks(count, games, seed)):
+            guesses.update(chunk_guesses)
+            timings.update(chunk_timings)
+    elapsed = time.perf_counter() - prepared
+
+    played = sum(guesses.values())
+    failures = guesses.pop(0, 0)
+    solved = played - failures
+    return {
+        "language": language,
+        "length": length,
+        "strategy": strategy,
+        "hard_mode": hard_mode,
+        "games": played,
+        "distribution": {str(n): guesses.get(n, 0) for n in range(1, engine.ROWS + 1)},
+        "failures": failures,
+        "failure_rate": failures / played if played else 0.0,
+        "mean_guesses": sum(n * c for n, c in guesses.items()) / solved if solved else None,
+        "workers": workers,
+        "prepare_seconds": prepared - start,
+        "play_seconds": elapsed,
+        "games_per_second": played / elapsed if elapsed else 0.0,
+        # summed over workers, per game
+        "stage_microseconds": {stage: seconds / played * 1e6 for stage, seconds in timings.items()} if played else {},
+    }
+
+
+def print_report(report):
+    mode = ", hard mode" if report["hard_mode"] else ""
+    print(f"{report['language']} ({report['length']} letters{mode}) / {report['strategy']}: {report['games']} games "
+          f"on {report['workers']} workers")
+    top = max(report["distribution"].values(), default=0) or 1
+    for n, c in report["distribution"].items():
+        print(f"  {n}: {c:8d} {'#' * round(40 * c / top)}")
+    print(f"  X: {report['failures']:8d}  ({report['failure_rate']:.2%})")
+    if report["mean_guesses"] is not None:
+        print(f"mean guesses (solved): {report['mean_guesses']:.3f}")
+    print(f"prepare {report['prepare_seconds']:.2f}s, play {report['play_seconds']:.2f}s, "
+          f"{report['games_per_second']:.1f} games/s")
+    for stage, us in report["stage_microseconds"].items():
+        print(f"  {stage:9s}{us:10.1f} us/game")
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Headless Wordle self-play")
+    parser.add_argument("--language", default="English", choices=list(engine.lang_files))
+    parser.add_argument("--length", type=int, default=engine.COLS, help="word length")
+    parser.add_argument("--strategy", default="entropy")
+    parser.add_argument("--hard", action="store_true", help="play in hard mode")
+    parser.add_argument("--games", type=int, help="number of random games instead of every word once")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--max-failure-rate", type=float, help="exit with status 1 above this failure rate")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = simulate(args.language, args.strategy, args.games, args.seed, args.workers, args.length, args.hard)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print_report(report)
+
+    if args.max_failure_rate is not None and report["failure_rate"] > args.max_failure_rate:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,285 @@
+"""
+Saved progress of the games being played, so that closing the window does not lose the day's game.
+
+A snapshot holds what the game cannot work out on its own: the guesses submitted and the letters
+typed into the current row, and the focused board of a game on several boards. Everything else
+(tile and keyboard states, candidates, hard-mode constraints, the adversary's answers) follows from
+replaying the guesses, which the loader thread does while the dictionary for the game is loaded, so
+the game arrives on the Tk thread already restored and its board is drawn in one go.
+
+Snapshots are a few dozen bytes: a fixed header (SNAPSHOT) and the letters as UTF-8. There is one
+file per language, puzzle date and game mode in snapshot_folder. The Tk thread only encodes the
+snapshot and queues it; a writer thread writes the newest one of each game to a temporary file and
+replaces the old file with it, so a crash leaves either the old snapshot or the new one. A snapshot
+written for another version of the dictionary is ignored.
+
+To time saving and restoring over random games without the GUI:
+
+    python snapshot.py [--games N] [language ...]
+"""
+import argparse
+import datetime
+import os
+import queue
+import random
+import struct
+import sys
+import tempfile
+import threading
+import time
+
+from engine import COLS, lang_files
+
+snapshot_folder = "saves"
+
+MAGIC = b"WSAV"
+VERSION = 1
+# magic, version, dictionary digest, guesses, letters typed in the current row, focused board
+SNAPSHOT = struct.Struct("<4sH16sBBB")
+NO_FOCUS = 255
+
+
+def snapshot_name(game, date):
+    """
+    Returns the file name of the snapshot of a game.
+
+    Parameters:
+    - game: The engine.Game or multiboard.MultiGame.
+    - date: The puzzle's date.
+    """
+    name = os.path.splitext(os.path.basename(lang_files[game.language]))[0]
+    mode = "-hard" if game.constraints is not None else ""
+    if game.adversary is not None:
+        mode += "-absurdle"
+    return f"{name}-{date.isoformat()}-{game.cols}x{game.boards}{mode}.wsav"
+
+
+def encode(game):
+    """
+    Encodes the progress of a game.
+
+    Parameters:
+    - game: The engine.Game or multiboard.MultiGame.
+
+    Returns:
+    - The snapshot as bytes.
+    """
+    # the row of a won game still holds the winning word
+    typed = "" if game.game_over else game.current_guess()
+    focus = NO_FOCUS if game.boards == 1 or game.focus is None else game.focus
+    header = SNAPSHOT.pack(MAGIC, VERSION, game.valid_words.digest.encode("ascii"), len(game.guesses), len(typed),
+                           focus)
+    return header + ("".join(game.guesses) + typed).encode("utf-8")
+
+
+def restore(game, data, make_game):
+    """
+    Replays a snapshot into a new game. Whether every guess is still accepted (hard mode, a game won
+    early) only shows while replaying, so a snapshot rejected partway is not left half replayed:
+    a new game is made in place of the one it was replayed into.
+
+    Parameters:
+    - game: A new engine.Game or multiboard.MultiGame with the dictionary and mode the snapshot was taken of.
+    - data: The snapshot as bytes, or None.
+    - make_game: Called without arguments to make another new game like game.
+
+    Returns:
+    - game with the snapshot replayed, game untouched if the snapshot was missing, damaged or taken of
+      another dictionary, or the game from make_game if replaying it failed.
+    """
+    if data is None or len(data) < SNAPSHOT.size:
+        return game
+    magic, version, digest, guess_count, typed_count, focus = SNAPSHOT.unpack_from(data)
+    if magic != MAGIC or version != VERSION or digest != game.valid_words.digest.encode("ascii"):
+        return game
+    try:
+        text = data[SNAPSHOT.size:].decode("utf-8")
+    except UnicodeDecodeError:
+        return game
+    if len(text) != guess_count * game.cols + typed_count:
+        return game
+
+    for i in range(guess_count):
+        result = game.guess(text[i * game.cols:(i + 1) * game.cols])
+        if result is None or result.states is None:
+            return make_game()
+    for letter in text[guess_count * game.cols:]:
+        game.type_letter(letter)
+    if focus != NO_FOCUS and game.boards > 1:
+        game.focus_board(focus)
+    return game
+
+
+def write_file(path, data):
+    """
+    Replaces a file with new contents atomically.
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class SnapshotWriter:
+    """
+    Writes snapshots on a background thread, started with the writer so that no save pays for
+    starting it. Saving only queues the snapshot; when a game changes again before its file is
+    written, only the newest snapshot is.
+    """
+
+    def __init__(self, folder=snapshot_folder):
+        """
+        Parameters:
+        - folder: Folder for the snapshot files.
+        """
+        self.folder = folder
+        self.latest = {}  # file name -> newest snapshot handed in
+        self.jobs = queue.Queue()
+        self.queued = set()  # file names in jobs the writer thread has not taken yet
+        self.thread = None
+
+        # counters of the writer thread
+        self.writes = 0
+        self.write_seconds = 0.0
+        self.max_write = 0.0
+        self.start()
+
+    def start(self):
+        """
+        Starts the writer thread.
+        """
+        self.thread = threading.Thread(target=self.run, name="snapshots", daemon=True)
+        self.thread.start()
+
+    def save(self, name, data):
+        """
+        Queues a snapshot to be written. Returns at once.
+
+        Parameters:
+        - name: File name of the snapshot, as returned by snapshot_name.
+        - data: The snapshot, as returned by encode.
+        """
+        if self.latest.get(name) == data:
+            return
+        self.latest[name] = data
+        if self.thread is None:  # saving after close
+            self.start()
+        # the writer reads latest when it takes the name, so a game already queued need not wake it again
+        if name not in self.queued:
+            self.queued.add(name)
+            self.jobs.put(name)
+
+    def load(self, name):
+        """
+        Returns the newest snapshot saved under a file name, including one not written yet, or None if
+        there is none.
+        """
+        data = self.latest.get(name)
+        if data is not None:
+            return data
+        try:
+            with open(os.path.join(self.folder, name), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def run(self):
+        """
+        Runs on the writer thread: writes queued snapshots until close is called.
+        """
+        os.makedirs(self.folder, exist_ok=True)
+        while True:
+            names = [self.jobs.get()]
+            # snapshots queued meanwhile are written together, each game's newest once
+            while True:
+                try:
+                    names.append(self.jobs.get_nowait())
+                except queue.Empty:
+                    break
+            done = None in names
+            self.queued.difference_update(names)
+            for name in dict.fromkeys(name for name in names if name is not None):
+                path = os.path.join(self.folder, name)
+                start = time.perf_counter()
+                try:
+                    write_file(path, self.latest[name])
+                except OSError as e:
+                    print(f"Could not save {path}: {e}", file=sys.stderr)
+                    continue
+                elapsed = time.perf_counter() - start
+                self.writes += 1
+                self.write_seconds += elapsed
+                self.max_write = max(self.max_write, elapsed)
+            if done:
+                return
+
+    def close(self):
+        """
+        Writes the snapshots still queued and stops the writer thread.
+        """
+        if self.thread is not None:
+            self.jobs.put(None)
+            self.thread.join()
+            self.thread = None
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Time saving and restoring snapshots over random games")
+    parser.add_argument("languages", nargs="*", default=list(lang_files))
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    import engine
+    from dictionary import load_dictionary
+
+    rng = random.Random(args.seed)
+    date = datetime.date.today()
+    with tempfile.TemporaryDirectory() as folder:
+        for language in args.languages:
+            dictionary = load_dictionary(language, COLS)
+            words = dictionary.words()
+            writer = SnapshotWriter(folder)
+            save_times = []
+            restore_times = []
+            for _ in range(args.games):
+                game = engine.Game(language, dictionary, rng.choice(words))
+                name = snapshot_name(game, date)
+                # every letter typed or deleted and every guess is a state change
+                while not game.game_over:
+                    word = rng.choice(words)
+                    changes = [(game.type_letter, letter) for letter in word]
+                    if rng.random() < 0.3:  # a typo, corrected
+                        changes[-1:-1] = [(game.delete_letter,), (game.type_letter, word[-2])]
+                    changes.append((game.submit,))
+                    for action, *action_args in changes:
+                        result = action(*action_args)
+                        start = time.perf_counter()
+                        writer.save(name, encode(game))
+                        save_times.append(time.perf_counter() - start)
+                    if result.states is None:  # guessed before
+                        while game.delete_letter():
+                            pass
+
+                start = time.perf_counter()
+                restored = restore(engine.Game(language, dictionary, game.secret_word), writer.load(name),
+                                   lambda: engine.Game(language, dictionary, game.secret_word))
+                restore_times.append(time.perf_counter() - start)
+                assert restored.guesses == game.guesses and restored.letters == game.letters
+            writer.close()
+
+            save_times.sort()
+            print(f"{language}: {len(save_times)} saves on the caller's thread: p50 "
+                  f"{save_times[len(save_times) // 2] * 1e6:.1f}µs, p99 "
+                  f"{save_times[int(len(save_times) * 0.99)] * 1e6:.1f}µs, max {save_times[-1] * 1e6:.1f}µs; "
+                  f"{writer.writes} files written by the writer thread, "
+                  f"{writer.write_seconds / max(1, writer.writes) * 1000:.2f}ms each "
+                  f"(max {writer.max_write * 1000:.2f}ms); restoring a finished game takes "
+                  f"{sum(restore_times) / len(restore_times) * 1000:.2f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
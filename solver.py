@@ -0,0 +1,332 @@
+"""
+Entropy-based hints: ranks every allowed guess by the information it is expected to reveal about
+the words still consistent with the feedback so far.
+
+Ranking reads rows of the cached feedback matrix (see feedback.py) and turns them into pattern
+histograms with numpy. Large rankings are split into blocks and fanned out over a process pool;
+whatever finishes within the latency budget is used. The blocks of a ranking that ran out of time
+are dropped by the workers between chunks, so they do not hold up the next ranking.
+
+    python solver.py [language] [GUESS:PATTERN ...]
+
+where PATTERN is one digit per letter (1 = wrong, 2 = misplaced, 3 = correct), e.g. CRANE:11231.
+The word length is taken from the guesses and is COLS without any.
+"""
+import concurrent.futures
+import multiprocessing
+import os
+import sys
+import time
+from collections import namedtuple
+
+import numpy as np
+
+import openings
+from engine import COLS, pattern_code
+from feedback import load_feedback_matrix
+
+PATTERNS = 3 ** COLS  # pattern codes of COLS-letter words; other lengths have 3 ** length
+
+# Below this many (guess, candidate) pairs a ranking is cheaper in-process than over the pool.
+POOL_THRESHOLD = 1 << 21
+# Upper bound on the pairs histogrammed in one numpy call; bounds worker memory.
+BLOCK_PAIRS = 1 << 22
+DEFAULT_BUDGET = 0.5
+WORKERS = os.cpu_count() or 1
+
+Suggestion = namedtuple("Suggestion", ["word", "entropy", "expected_remaining", "is_candidate"])
+
+_pool = None
+_generation = None  # shared counter of rankings; blocks of any but the newest one stop early
+_worker_matrices = {}
+_worker_generation = None
+
+
+def candidate_mask(patterns, index, feedback):
+    """
+    Finds the answers consistent with every scored guess.
+
+    Parameters:
+    - patterns: The feedback matrix as an array of shape (words, words).
+    - index: Dictionary from word to its row in the matrix.
+    - feedback: List of (guess, pattern code) pairs.
+
+    Returns:
+    - Boolean array over the answers.
+    """
+    mask = np.ones(patterns.shape[1], dtype=bool)
+    for guess, code in feedback:
+        mask &= patterns[index[guess]] == code
+    return mask
+
+
+def score_block(patterns, rows, candidates, pattern_count=PATTERNS, stop=None):
+    """
+    Computes the entropy and expected remaining candidates of a block of guesses.
+
+    Parameters:
+    - patterns: The feedback matrix as an array of shape (words, words).
+    - rows: Array of guess indexes.
+    - candidates: Array of candidate answer indexes.
+    - pattern_count: Number of distinct pattern codes, 3 ** word length.
+    - stop: Called between chunks of guesses; when it returns True the block is given up. None to
+      always finish.
+
+    Returns:
+    - Tuple of float arrays (entropy, expected remaining), one value per row, or None if stopped.
+    """
+    count = len(candidates)
+    entropy = np.empty(len(rows))
+    expected = np.empty(len(rows))
+    step = max(1, BLOCK_PAIRS // max(count, 1))
+
+    for start in range(0, len(rows), step):
+        if stop is not None and stop():
+            return None
+        block = rows[start:start + step]
+        codes = patterns[block][:, candidates].astype(np.int32)
+        codes += (np.arange(len(block), dtype=np.int32) * pattern_count)[:, None]
+        hist = np.bincount(codes.ravel(), minlength=len(block) * pattern_count).reshape(len(block), pattern_count)
+
+        nonzero = np.where(hist > 0, hist, 1).astype(np.float64)
+        entropy[start:start + step] = np.log2(count) - (hist * np.log2(nonzero)).sum(axis=1) / count
+        expected[start:start + step] = (hist.astype(np.float64) ** 2).sum(axis=1) / count
+    return entropy, expected
+
+
+def _init_worker(generation):
+    global _worker_generation
+    # Workers inherit the parent's matrices on fork; make sure they open their own maps.
+    _worker_matrices.clear()
+    _worker_generation = generation
+
+
+def _score_task(path, rows, candidates, k, pattern_count, generation=None):
+    # a block of a ranking that has since been given up returns None
+    if generation is None:
+        stop = None
+    else:
+        def stop():
+            return _worker_generation.value != generation
+
+    patterns = _worker_matrices.get(path)
+    if patterns is None:
+        patterns = _worker_matrices[path] = np.load(path, mmap_mode="r")
+    scores = score_block(patterns, rows, candidates, pattern_count, stop)
+    if scores is None:
+        return None
+    entropy, expected = scores
+    best = np.argsort(-entropy, kind="stable")[:k]
+    return rows[best], entropy[best], expected[best]
+
+
+def get_pool():
+    """
+    Returns the shared process pool, creating it on first use with one worker per core.
+    """
+    global _pool, _generation
+    if _pool is None:
+        # fork keeps workers from re-importing the Tk app on platforms that default to spawn
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else None)
+        _generation = context.Value("l", 0)
+        _pool = concurrent.futures.ProcessPoolExecutor(max_workers=WORKERS, mp_context=context,
+                                                       initializer=_init_worker, initargs=(_generation,))
+    return _pool
+
+
+def shutdown_pool():
+    """
+    Stops the shared process pool, if it was started.
+    """
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+def ranking_order(n, candidates, rows=None):
+    """
+    Orders the guesses of a ranking: the candidates first, so that a partial ranking still covers
+    every possible answer, then every other word.
+
+    Parameters:
+    - n: Number of words in the dictionary.
+    - candidates: Array of candidate answer indexes.
+    - rows: Array of the indexes of the allowed guesses, or None if every word is. The candidates
+      must be among them.
+
+    Returns:
+    - Tuple (boolean array marking the candidates, array of guess indexes in ranking order).
+    """
+    is_candidate = np.zeros(n, dtype=bool)
+    is_candidate[candidates] = True
+    others = np.flatnonzero(~is_candidate) if rows is None else rows[~is_candidate[rows]]
+    return is_candidate, np.concatenate([candidates, others])
+
+
+def best_guesses(results, is_candidate, k):
+    """
+    Merges the (rows, entropy, expected remaining) results of ranked blocks into the k best guesses.
+
+    Parameters:
+    - results: Non-empty list of (rows, entropy, expected remaining) array triples.
+    - is_candidate: Boolean array marking the candidates.
+    - k: Number of guesses to return.
+
+    Returns:
+    - List of (row, entropy, expected remaining), best first.
+    """
+    rows = np.concatenate([r[0] for r in results])
+    entropy = np.concatenate([r[1] for r in results])
+    expected = np.concatenate([r[2] for r in results])
+
+    # Prefer higher entropy; on ties prefer a guess that could itself be the answer.
+    ranking = np.lexsort((~is_candidate[rows], -entropy))[:k]
+    return [(int(rows[i]), float(entropy[i]), float(expected[i])) for i in ranking]
+
+
+def rank_guesses(matrix, candidates, k, budget, rows=None):
+    """
+    Ranks every allowed guess against a candidate set.
+
+    Parameters:
+    - matrix: A feedback.FeedbackMatrix.
+    - candidates: Array of candidate answer indexes.
+    - k: Number of guesses to return.
+    - budget: Seconds to wait for pool results before settling for the blocks that finished, or
+      None to wait for all of them. Blocks still running then are dropped.
+    - rows: Array of the indexes of the allowed guesses, or None if every word is.
+
+    Returns:
+    - Tuple (list of (row, entropy, expected remaining) best first, True if every guess was ranked).
+    """
+    patterns = matrix.patterns
+    n = patterns.shape[0]
+    pattern_count = 3 ** len(matrix.words[0])
+    is_candidate, order = ranking_order(n, candidates, rows)
+
+    results = []
+    complete = True
+    if len(order) * len(candidates) <= POOL_THRESHOLD or matrix.path is None:
+        entropy, expected = score_block(patterns, order, candidates, pattern_count)
+        results.append((order, entropy, expected))
+    else:
+        pool = get_pool()
+        blocks = WORKERS * 4
+        with _generation.get_lock():
+            _generation.value += 1
+            generation = _generation.value
+        futures = [pool.submit(_score_task, matrix.path, block, candidates, k, pattern_count, generation)
+                   for block in np.array_split(order, blocks) if len(block)]
+        done, pending = concurrent.futures.wait(futures, timeout=budget)
+        if pending:
+            # blocks a worker has started cannot be cancelled; moving on makes them stop at their next chunk
+            with _generation.get_lock():
+                if _generation.value == generation:
+                    _generation.value += 1
+            for future in pending:
+                future.cancel()
+        # a newer ranking started meanwhile also drops this one's blocks
+        scored = [future.result() for future in done]
+        results.extend(result for result in scored if result is not None)
+        complete = not pending and len(results) == len(scored)
+
+    if not results:
+        return [], False
+    return best_guesses(results, is_candidate, k), complete
+
+
+def rank_many(matrix, candidate_sets, k):
+    """
+    Ranks every allowed guess against several candidate sets, with the blocks of all of them queued
+    on the pool at once so that small sets do not leave workers idle. Waits for every block.
+
+    Parameters:
+    - matrix: A feedback.FeedbackMatrix backed by a cache file.
+    - candidate_sets: List of arrays of candidate answer indexes.
+    - k: Number of guesses to return per set.
+
+    Returns:
+    - List with one list of (row, entropy, expected remaining) best first per candidate set.
+    """
+    n = matrix.patterns.shape[0]
+    pattern_count = 3 ** len(matrix.words[0])
+    pool = get_pool()
+
+    jobs = []
+    for candidates in candidate_sets:
+        is_candidate, order = ranking_order(n, candidates)
+        blocks = max(1, min(WORKERS * 4, n * len(candidates) // POOL_THRESHOLD))
+        futures = [pool.submit(_score_task, matrix.path, rows, candidates, k, pattern_count)
+                   for rows in np.array_split(order, blocks)]
+        jobs.append((is_candidate, futures))
+    return [best_guesses([future.result() for future in futures], is_candidate, k) for is_candidate, futures in jobs]
+
+
+def suggest(language, feedback, k=5, budget=DEFAULT_BUDGET, length=COLS, allowed=None):
+    """
+    Suggests the next guesses for a game.
+
+    Parameters:
+    - language: Language name as a string.
+    - feedback: List of (guess, pattern code) pairs, as returned by engine.Game.feedback().
+    - k: Number of suggestions.
+    - budget: Latency budget in seconds for the pool part of the ranking.
+    - length: Word length of the game.
+    - allowed: Bitset of the words hard mode accepts as the next guess, as returned by
+      CandidateIndex.satisfying, or None if every word is. The opening book is not used with it.
+
+    Returns:
+    - Tuple (list of Suggestion best first, True if the ranking covered every allowed guess).
+    """
+    # the first two guesses rank against (nearly) the whole dictionary; the opening book has them
+    if allowed is None:
+        entries = openings.lookup(language, feedback, k, length)
+        if entries is not None:
+            return [Suggestion(*entry) for entry in entries], True
+
+    matrix = load_feedback_matrix(language, length)
+    rows = None
+    if allowed is not None:
+        n = len(matrix.words)
+        bits = np.frombuffer(allowed.to_bytes((n + 7) // 8, "little"), dtype=np.uint8)
+        rows = np.flatnonzero(np.unpackbits(bits, bitorder="little")[:n])
+    mask = candidate_mask(matrix.patterns, matrix.index, feedback)
+    candidates = np.flatnonzero(mask)
+
+    if len(candidates) == 0:
+        return [], True
+    # With one or two words left, guessing one of them is always best.
+    if len(candidates) <= 2:
+        return [Suggestion(matrix.words[i], float(len(candidates) - 1), 1.0, True) for i in candidates[:k]], True
+
+    ranked, complete = rank_guesses(matrix, candidates, k, budget, rows)
+    return [Suggestion(matrix.words[row], entropy, expected, bool(mask[row]))
+            for row, entropy, expected in ranked], complete
+
+
+def parse_feedback(arg):
+    guess, digits = arg.upper().split(":")
+    return guess, pattern_code([int(d) for d in digits])
+
+
+def main(argv):
+    language = argv[0] if argv else "English"
+    feedback = [parse_feedback(arg) for arg in argv[1:]]
+    length = len(feedback[0][0]) if feedback else COLS
+
+    load_feedback_matrix(language, length)
+    start = time.perf_counter()
+    suggestions, complete = suggest(language, feedback, k=10, budget=60, length=length)
+    elapsed = time.perf_counter() - start
+
+    for s in suggestions:
+        marker = "*" if s.is_candidate else " "
+        print(f"{marker} {s.word}  {s.entropy:.3f} bits  {s.expected_remaining:.1f} left")
+    print(f"{'complete' if complete else 'partial'} ranking in {elapsed * 1000:.0f}ms")
+    shutdown_pool()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,195 @@
+"""
+In-window messages ("toasts"). A top-level window per message with a grab and a nested event loop
+costs a window to build and blocks every other input until it is closed. Instead, a small pool of
+overlay frames is created on first use, placed over the board and only reconfigured for each
+message, and the game keeps taking input while they are up.
+
+Warnings hide themselves after a moment; other messages stay until their button is clicked or
+their slot is needed for a newer message. A question takes callbacks instead of returning the
+answer, and at most one is open at a time.
+"""
+import customtkinter as ctk
+
+POOL_SIZE = 3
+WARNING_MS = 2000
+TOAST_SIZE = (280, 136)
+TOAST_TOP = 60  # distance of the first toast from the top of the window
+TOAST_GAP = 6
+
+
+class Toast:
+    """
+    One reusable overlay: a title, a message and up to two buttons.
+    """
+
+    def __init__(self, pool):
+        """
+        Parameters:
+        - pool: The ToastPool the toast belongs to.
+        """
+        title_font, message_font, button_font = pool.fonts
+        width, height = TOAST_SIZE
+        self.frame = ctk.CTkFrame(pool.root, width=width, height=height, corner_radius=8, border_width=2)
+        self.frame.pack_propagate(False)
+        self.title = ctk.CTkLabel(self.frame, text="", font=title_font)
+        self.title.pack(pady=(12, 0))
+        self.message = ctk.CTkLabel(self.frame, text="", font=message_font, justify="center",
+                                    wraplength=width - 50, height=40)
+        self.message.pack(pady=(0, 6))
+        self.button_row = ctk.CTkFrame(self.frame, fg_color="transparent")
+        self.button_row.pack()
+        self.buttons = [ctk.CTkButton(self.button_row, text="", width=75, height=30, text_color="#FFFFFF",
+                                      border_width=2, font=button_font,
+                                      command=lambda i=i: pool.dismiss(self, i))
+                        for i in range(2)]
+        self.buttons[0].pack(side="left")
+        self.second_packed = False
+
+        self.key = None  # (title, message) of the message shown
+        self.look = None  # everything the widgets were last configured with
+        self.callbacks = ()
+        self.question = False
+        self.timer = None
+
+
+class ToastPool:
+    """
+    Shows messages in a fixed set of reusable toasts, stacked from the top of the window.
+    """
+
+    def __init__(self, root, title_font, message_font, button_font, size=POOL_SIZE):
+        """
+        Parameters:
+        - root: The window to show the toasts in.
+        - title_font, message_font, button_font: CTkFonts of the texts.
+        - size: Most toasts shown at once. A message beyond that replaces the oldest one.
+        """
+        self.root = root
+        self.fonts = (title_font, message_font, button_font)
+        self.size = size
+        self.toasts = []  # every toast created so far
+        self.visible = []  # toasts on screen, oldest first
+
+    def acquire(self, key, question):
+        """
+        Returns the toast to show a message in: the one already showing it, a hidden one, a new one
+        while the pool is not full, or the oldest on screen.
+        """
+        for toast in self.visible:
+            if toast.key == key and not question and not toast.question:
+                return toast
+            if question and toast.question:
+                # only one question at a time; the one it replaces is dropped unanswered
+                self.dismiss(toast)
+                break
+
+        for toast in self.toasts:
+            if toast not in self.visible:
+                return toast
+        if len(self.toasts) < self.size:
+            toast = Toast(self)
+            self.toasts.append(toast)
+            return toast
+        oldest = self.visible[0]
+        self.dismiss(oldest, len(oldest.callbacks) - 1)
+        return oldest
+
+    def show(self, title, message, colors, buttons, timeout_ms=None):
+        """
+        Shows a message without waiting for it to be dismissed.
+
+        Parameters:
+        - title: Title in bold.
+        - message: Message text.
+        - colors: Tuple (background, text, border) colors.
+        - buttons: One or two (text, fg_color, hover_color, callback) tuples; callback is called after
+          the toast hides when its button is clicked, and may be None. A message with two buttons is
+          a question: a newer question replaces it without calling any callback, while a message
+          pushing it out of a full pool calls the callback of its last button.
+        - timeout_ms: Hide the toast after this long, or None to keep it until a button is clicked.
+
+        Returns:
+        - The Toast.
+        """
+        key = (title, message)
+        question = len(buttons) > 1
+        toast = self.acquire(key, question)
+        if toast.timer is not None:
+            self.root.after_cancel(toast.timer)
+            toast.timer = None
+
+        look = (key, colors, tuple(button[:3] for button in buttons))
+        if toast.look != look:
+            background, text_color, border = colors
+            toast.frame.configure(fg_color=background, border_color=border)
+            toast.title.configure(text=title, text_color=text_color)
+            toast.message.configure(text=message, text_color=text_color)
+            for button, (text, fg, hover, _) in zip(toast.buttons, buttons):
+                button.configure(text=text, fg_color=fg, hover_color=hover, border_color=hover)
+            if question != toast.second_packed:
+                if question:
+                    toast.buttons[1].pack(side="left", padx=(20, 0))
+                else:
+                    toast.buttons[1].pack_forget()
+                toast.second_packed = question
+            toast.look = look
+
+        toast.key = key
+        toast.callbacks = tuple(callback for *_, callback in buttons)
+        toast.question = question
+        if toast not in self.visible:
+            self.visible.append(toast)
+            self.restack()
+        toast.frame.lift()
+        if timeout_ms is not None:
+            toast.timer = self.root.after(timeout_ms, self.dismiss, toast)
+        return toast
+
+    def dismiss(self, toast, button=None):
+        """
+        Hides a toast, then calls the callback of the button that closed it.
+
+        Parameters:
+        - toast: The Toast.
+        - button: Index of the button clicked, or None if it timed out.
+        """
+        if toast not in self.visible:
+            return
+        if toast.timer is not None:
+            self.root.after_cancel(toast.timer)
+            toast.timer = None
+        self.visible.remove(toast)
+        toast.frame.place_forget()
+        self.restack()
+
+        callback = toast.callbacks[button] if button is not None else None
+        toast.callbacks = ()
+        toast.question = False
+        if callback is not None:
+            callback()
+
+    def restack(self):
+        """
+        Places the toasts on screen below each other, oldest first.
+        """
+        for i, toast in enumerate(self.visible):
+            toast.frame.place(relx=0.5, y=TOAST_TOP + i * (TOAST_SIZE[1] + TOAST_GAP), anchor="n")
+
+    def handle_key(self, keysym):
+        """
+        Lets Escape decline the open question (its last button) or close the newest message. Return
+        is left to the board: typing goes on while a question is open, and an Enter meant for a guess
+        must not confirm quitting or abandoning the game.
+
+        Parameters:
+        - keysym: The Tk keysym of the key pressed.
+
+        Returns:
+        - True if the key was used.
+        """
+        question = next((toast for toast in self.visible if toast.question), None)
+        if keysym == "Escape" and self.visible:
+            toast = question or self.visible[-1]
+            self.dismiss(toast, len(toast.callbacks) - 1)
+            return True
+        return False